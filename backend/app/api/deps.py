@@ -4,6 +4,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from uuid import UUID
 
+from app.config import settings
 from app.db.session import get_db
 from app.core.security import decode_token
 from app.models.user import User
@@ -61,4 +62,16 @@ def get_current_active_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user"
         )
+    return current_user
+
+def get_current_admin_user(
+    current_user: User = Depends(get_current_active_user)
+) -> User:
+    """Ensure user is an administrator (listed in ADMIN_EMAILS)."""
+    admin_emails = {email.strip().lower() for email in settings.ADMIN_EMAILS.split(",") if email.strip()}
+    if current_user.email.lower() not in admin_emails:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Administrator access required"
+        )
     return current_user
\ No newline at end of file
@@ -0,0 +1,98 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import Dict, Any
+
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.admin import BulkReprocessRequest
+from app.services.bulk_reprocess import BulkReprocessor, ReprocessRunStore
+from app.api.deps import get_current_admin_user
+
+router = APIRouter()
+
+
+@router.post("/reprocess", response_model=Dict[str, Any], status_code=status.HTTP_202_ACCEPTED)
+async def start_bulk_reprocess(
+    request: BulkReprocessRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Reprocess every data source processed with an older pipeline version.
+    
+    - **pipeline_version**: Only sources processed by this pipeline version
+    - **user_id**, **source_type**, **status**: Only matching sources
+    - **processed_before**: Only sources last processed before this time
+    - **force**: Also reprocess sources already up to date
+    - **limit**: At most this many sources, oldest processed first
+    - **dry_run**: Only count the selected sources
+    
+    The run is processed by a separate `python -m app.cli.reprocess` process
+    (bounded, low-priority worker pool), not by the API. Poll
+    GET /admin/reprocess/{run_id} for progress.
+    """
+    filters = request.model_dump(exclude={'dry_run'})
+    
+    if request.dry_run:
+        return {"dry_run": True, "total": len(BulkReprocessor.select_sources(db, **filters))}
+    
+    reprocessor = BulkReprocessor()
+    run = reprocessor.create_run(db, **filters)
+    
+    if run['total'] > 0:
+        reprocessor.store.update(run['run_id'], pid=BulkReprocessor.launch(run['run_id']))
+    else:
+        reprocessor.store.update(run['run_id'], status="completed")
+    
+    return reprocessor.store.get(run['run_id'])
+
+
+@router.get("/reprocess/{run_id}", response_model=Dict[str, Any])
+async def get_bulk_reprocess(
+    run_id: str,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Get the progress of a bulk reprocessing run.
+    
+    Response includes the status ('queued', 'running', 'interrupted',
+    'completed'), counts of completed, skipped, failed and pending sources,
+    and the errors of the first failed ones.
+    """
+    run = ReprocessRunStore().get(run_id)
+    if run is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reprocess run not found or expired"
+        )
+    return run
+
+
+@router.post("/reprocess/{run_id}/resume", response_model=Dict[str, Any], status_code=status.HTTP_202_ACCEPTED)
+async def resume_bulk_reprocess(
+    run_id: str,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Continue an interrupted bulk reprocessing run with its pending sources.
+    
+    A run whose process was killed outright stays 'running'; resume it
+    with `python -m app.cli.reprocess resume RUN_ID` instead.
+    """
+    store = ReprocessRunStore()
+    run = store.get(run_id)
+    if run is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reprocess run not found or expired"
+        )
+    if run['status'] == 'running':
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Reprocess run is already running"
+        )
+    if run['pending'] == 0:
+        return run
+    
+    store.update(run_id, status="queued", pid=BulkReprocessor.launch(run_id))
+    return store.get(run_id)
@@ -10,8 +10,9 @@ import os
 
 from app.db.session import get_db
 from app.models.user import User
-from app.schemas.data_source import DataSource, DataSourceCreate, DataSourceUpdate
+from app.schemas.data_source import DataSource, DataSourceCreate, DataSourceUpdate, PipelineJob
 from app.services.data_service import DataSourceService
+from app.services.pipeline_jobs import pipeline_jobs
 from app.api.deps import get_current_active_user
 
 from app.utils.database_connector import DatabaseConnector
@@ -24,8 +25,7 @@ from app.schemas.data_source import (
 
 router = APIRouter()
 
-@router.post("/upload", response_model=DataSource, status_code=status.HTTP_201_CREATED)
-
+@router.post("/upload", response_model=PipelineJob, status_code=status.HTTP_202_ACCEPTED)
 async def upload_file(
     file: UploadFile = File(...),
     name: Optional[str] = Form(None),
@@ -40,17 +40,71 @@ async def upload_file(
     **Supported formats:**
     - CSV (.csv)
     - Excel (.xlsx, .xls)
-    - JSON (.json)
+    - JSON (.json), JSON Lines (.jsonl, .ndjson)
     - Parquet (.parquet)
     - TSV (.tsv, .txt)
+    - Compressed CSV/TSV/JSON (.gz, .zst, or .zip with a single file)
     
     - **file**: File to upload (max 100MB)
     - **name**: Optional custom name for the data source
     - **sheet_name**: For Excel files, specify which sheet to load (default: first sheet)
     
-    Returns the created data source with metadata.
+    The file is saved and queued for pipeline processing. Returns 202 with a
+    job; poll **GET /data-sources/jobs/{job_id}** for progress and the final
+    data source. The data source has status 'processing' until the job ends.
+    """
+    return await DataSourceService.submit_upload(db, current_user, file, name, sheet_name)
+
+
+@router.post("/upload/sheets", response_model=List[PipelineJob], status_code=status.HTTP_202_ACCEPTED)
+async def upload_excel_sheets(
+    file: UploadFile = File(...),
+    name: Optional[str] = Form(None),
+    sheet_names: Optional[str] = Form(None, description="Comma-separated sheet names (default: all sheets)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    rate_limit_info: dict = Depends(upload_rate_limit_dependency)
+):
+    """
+    Upload an Excel workbook and import several sheets as separate data sources.
+    
+    - **file**: Excel file (.xlsx or .xls)
+    - **name**: Optional base name; each data source is named "{name} - {sheet}"
+    - **sheet_names**: Comma-separated sheets to import (default: all sheets)
+    
+    The sheets are processed in parallel. Returns 202 with one job per
+    sheet; poll **GET /data-sources/jobs/{job_id}** for each.
+    """
+    requested = [sheet.strip() for sheet in sheet_names.split(',') if sheet.strip()] if sheet_names else None
+    return await DataSourceService.submit_excel_sheets(db, current_user, file, name, requested)
+
+
+@router.get("/jobs/{job_id}", response_model=PipelineJob)
+async def get_pipeline_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get the status of a background pipeline job.
+    
+    - **job_id**: Job ID returned by the upload endpoint
+    
+    Returns the current layer and progress. Once the job has completed,
+    the processed data source is included.
     """
-    return await DataSourceService.upload_file(db, current_user, file, name, sheet_name)
+    job = pipeline_jobs.get(job_id)
+    
+    if not job or job['user_id'] != str(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    if job['status'] == 'completed':
+        job['data_source'] = DataSourceService.get_data_source(db, current_user, UUID(job['data_source_id']))
+    
+    return job
 
 
 @router.post("/excel/sheets")
@@ -109,6 +163,23 @@ async def get_data_sources(
     return DataSourceService.get_data_sources(db, current_user, skip, limit)
 
 
+@router.get("/pipeline/performance")
+async def get_pipeline_performance(
+    pipeline_version: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get pipeline performance aggregated across the user's data sources.
+    
+    - **pipeline_version**: Only include sources processed by this pipeline version
+    
+    Response includes per-layer wall time mean/p50/p95/max, mean CPU time,
+    median rows/sec and how often each layer was the slowest.
+    """
+    return DataSourceService.get_pipeline_performance(db, current_user, pipeline_version)
+
+
 @router.get("/{data_source_id}", response_model=DataSource)
 async def get_data_source(
     data_source_id: UUID,
@@ -382,6 +453,7 @@ async def get_quality_report(
     - overall_level: excellent, good, fair, poor, critical
     - columns: Per-column quality metrics
     - dataset_stats: Overall dataset statistics
+    - performance: Per-layer wall/CPU time, row counts and throughput
     """
     data_source = DataSourceService.get_data_source(db, current_user, data_source_id)
     
@@ -400,7 +472,10 @@ async def get_quality_report(
         "overall_level": data_source.quality_level,
         "columns": quality_report['columns'],
         "dataset_stats": quality_report['dataset_stats'],
+        "approximate": quality_report.get('approximate', []),
+        "sampling": data_source.processing_report.get('sampling'),
         "processing_duration": data_source.processing_duration_seconds,
+        "performance": data_source.processing_report.get('performance'),
         "last_processed": data_source.last_processed_at.isoformat() if data_source.last_processed_at else None
     }
 
@@ -422,6 +497,7 @@ async def get_cleaning_report(
     - type_conversions: Type detection and conversion success rates
     - data_cleaning: Missing values imputed, outliers handled
     - summary: Overall statistics
+    - performance: Per-layer wall/CPU time, row counts and throughput
     """
     data_source = DataSourceService.get_data_source(db, current_user, data_source_id)
     
@@ -442,7 +518,8 @@ async def get_cleaning_report(
                 'original_dtype': info['original_dtype'],
                 'final_dtype': info['final_dtype'],
                 'success_rate': info['conversion_success_rate'],
-                'sample_values': info['sample_values']
+                'sample_values': info['sample_values'],
+                'date_format': info.get('date_format')
             }
             for col, info in report['layers']['layer4']['type_info'].items()
         },
@@ -458,8 +535,12 @@ async def get_cleaning_report(
         "storage": {
             'original_size_bytes': report['layers']['layer1']['file_size'],
             'cleaned_size_bytes': report['layers']['layer7']['storage']['parquet_size_bytes'],
-            'compression_ratio_percent': report['layers']['layer7']['storage'].get('compression_ratio_percent', 0)
-        }
+            'compression_ratio_percent': report['layers']['layer7']['storage'].get('compression_ratio_percent', 0),
+            'compression': report['layers']['layer7']['storage'].get('compression'),
+            'row_groups': report['layers']['layer7']['storage'].get('row_groups'),
+            'read_seconds': report['layers']['layer7']['storage'].get('read_seconds')
+        },
+        "performance": report.get('performance')
     }
     
     return cleaning_report
@@ -481,6 +562,9 @@ async def reprocess_data_source(
     - User wants to refresh quality metrics
     - Original processing failed
     
+    With pipeline checkpoints enabled, only the layers whose version or
+    settings changed since the last run are re-run.
+    
     Returns updated quality score and processing status.
     """
     data_source = DataSourceService.get_data_source(db, current_user, data_source_id)
@@ -490,6 +574,11 @@ async def reprocess_data_source(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No file path available for reprocessing. Database connections cannot be reprocessed."
         )
+    if data_source.status == 'processing':
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Data source is already being processed"
+        )
     
     try:
         logger.info(f" Reprocessing data source: {data_source_id}")
@@ -503,40 +592,14 @@ async def reprocess_data_source(
             file_path=data_source.file_path,
             source_type=data_source.type,
             source_id=str(data_source.id),
-            sheet_name=0
+            sheet_name=DataSourceService.get_sheet_name(data_source)
         )
         
         if pipeline_report['success']:
             # Update database record with new results
-            data_source.processing_report = pipeline_report
-            data_source.quality_score = pipeline_report['final_stats']['quality_score']
-            data_source.quality_level = pipeline_report['final_stats']['quality_level']
-            data_source.row_count = pipeline_report['final_stats']['rows']
-            data_source.processing_duration_seconds = pipeline_report['duration_seconds']
-            data_source.last_processed_at = datetime.utcnow()
+            DataSourceService.apply_pipeline_report(data_source, pipeline_report)
             data_source.status = 'connected'
             
-            # Update paths
-            layer7 = pipeline_report['layers']['layer7']
-            data_source.cleaned_path = layer7['storage']['parquet_path']
-            data_source.preview_path = layer7['storage']['preview_path']
-            
-            # Update mappings
-            data_source.column_mapping = pipeline_report['layers']['layer3']['column_mapping']
-            data_source.column_stats = layer7['column_stats']
-            
-            # Update columns_info
-            columns_info = []
-            layer4 = pipeline_report['layers']['layer4']
-            for col, info in layer4['type_info'].items():
-                columns_info.append({
-                    'name': col,
-                    'type': info['detected_type'],
-                    'original_dtype': info['original_dtype'],
-                    'final_dtype': info['final_dtype']
-                })
-            data_source.columns_info = columns_info
-            
             db.commit()
             db.refresh(data_source)
             
@@ -548,7 +611,8 @@ async def reprocess_data_source(
                 "quality_score": data_source.quality_score,
                 "quality_level": data_source.quality_level,
                 "duration_seconds": data_source.processing_duration_seconds,
-                "rows": data_source.row_count
+                "rows": data_source.row_count,
+                "resumed_after_layer": pipeline_report.get('checkpoints', {}).get('resumed_after_layer', 0)
             }
         else:
             # Pipeline failed
@@ -0,0 +1,117 @@
+"""
+Bulk reprocessing
+Re-runs the pipeline on data sources processed with an older pipeline version
+
+Sources are processed in a bounded pool of low-priority worker processes
+with source reads throttled (BULK_REPROCESS_* settings). Ctrl+C or
+SIGTERM stops starting sources; the ones in flight finish, and `resume`
+continues with the rest. Sources already up to date are skipped.
+
+Usage, from the backend directory:
+    python -m app.cli.reprocess run --dry-run
+    python -m app.cli.reprocess run
+    python -m app.cli.reprocess run --pipeline-version 1.2.0 --type csv --workers 4
+    python -m app.cli.reprocess resume RUN_ID
+    python -m app.cli.reprocess status RUN_ID
+"""
+import argparse
+import json
+import signal
+import sys
+from datetime import datetime
+
+from app.core.logging_config import setup_logging
+from app.db.session import SessionLocal
+from app.services.bulk_reprocess import BulkReprocessor, ReprocessRunStore
+
+
+def _stop_on_signals(reprocessor: BulkReprocessor) -> None:
+    """First SIGINT/SIGTERM stops the run gracefully, a second one interrupts at once."""
+    def handle(signum, frame):
+        print(f"\nStopping after the sources in flight ({signal.Signals(signum).name} again to abort)")
+        reprocessor.stop()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    
+    signal.signal(signal.SIGINT, handle)
+    signal.signal(signal.SIGTERM, handle)
+
+
+def _print_run(run: dict) -> None:
+    print(
+        f"Run {run['run_id']}: {run['status']}, {run['total']} sources, "
+        f"{run['completed']} completed, {run['skipped']} skipped, {run['failed']} failed, {run['pending']} pending"
+    )
+    for source_id, error in run['failures'].items():
+        print(f"  failed {source_id}: {error}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    run_parser = commands.add_parser('run', help='Select data sources and reprocess them')
+    run_parser.add_argument('--pipeline-version', help='Only sources processed by this pipeline version')
+    run_parser.add_argument('--user-id', help='Only sources of this user')
+    run_parser.add_argument('--type', dest='source_type', help='Only sources of this type, e.g. csv')
+    run_parser.add_argument('--status', help='Only sources with this status, e.g. error')
+    run_parser.add_argument('--processed-before', type=datetime.fromisoformat, metavar='ISO_DATE',
+                            help='Only sources last processed before this time')
+    run_parser.add_argument('--force', action='store_true', help='Include sources already up to date')
+    run_parser.add_argument('--limit', type=int, help='At most this many sources, oldest processed first')
+    run_parser.add_argument('--dry-run', action='store_true', help='Only count the selected sources')
+    
+    resume_parser = commands.add_parser('resume', help='Continue an interrupted or queued run')
+    resume_parser.add_argument('run_id')
+    
+    for command_parser in (run_parser, resume_parser):
+        command_parser.add_argument('--workers', type=int, help='Worker processes')
+        command_parser.add_argument('--max-read-mb', type=float, help='Source megabytes started per second (0 = unthrottled)')
+    
+    status_parser = commands.add_parser('status', help='Show the progress of a run')
+    status_parser.add_argument('run_id')
+    status_parser.add_argument('--json', action='store_true', help='Print the run as JSON')
+    
+    args = parser.parse_args()
+    
+    if args.command == 'status':
+        run = ReprocessRunStore().get(args.run_id)
+        if run is None:
+            print(f"Run {args.run_id} not found (unknown or expired)")
+            return 1
+        if args.json:
+            print(json.dumps(run, indent=2))
+        else:
+            _print_run(run)
+        return 0
+    
+    setup_logging()
+    reprocessor = BulkReprocessor(workers=args.workers, max_read_mb_per_second=args.max_read_mb)
+    
+    if args.command == 'run':
+        filters = {key: getattr(args, key) for key in BulkReprocessor.FILTER_KEYS}
+        db = SessionLocal()
+        try:
+            if args.dry_run:
+                sources = BulkReprocessor.select_sources(db, **filters)
+                print(f"{len(sources)} data sources would be reprocessed")
+                return 0
+            run_id = reprocessor.create_run(db, **filters)['run_id']
+        finally:
+            db.close()
+        print(f"Run {run_id} created; resume it with: python -m app.cli.reprocess resume {run_id}")
+    else:
+        run_id = args.run_id
+    
+    _stop_on_signals(reprocessor)
+    run = reprocessor.run(run_id)
+    if run is None:
+        print(f"Run {run_id} not found (unknown or expired)")
+        return 1
+    
+    _print_run(run)
+    return 0 if run['status'] == 'completed' else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -67,9 +67,10 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = "/app/storage/uploads"
     
     # File Upload Settings
-    MAX_FILE_SIZE_MB: int = 100
-    ALLOWED_FILE_EXTENSIONS: str = ".csv,.xlsx,.xls,.json,.parquet,.tsv,.txt"
+    MAX_FILE_SIZE_MB: int = 100                 # Also applies to the decompressed size of .gz/.zst/.zip uploads
+    ALLOWED_FILE_EXTENSIONS: str = ".csv,.xlsx,.xls,.json,.jsonl,.ndjson,.parquet,.tsv,.txt,.gz,.zst,.zip"
     UPLOAD_DIR: str = "/app/storage/uploads"
+    UPLOAD_CHUNK_SIZE_KB: int = 1024        # Uploads are streamed to disk in chunks of this size
     
     # OpenAI Settings
     OPENAI_API_KEY: str
@@ -106,6 +107,37 @@ class Settings(BaseSettings):
     PREVIEW_ROW_LIMIT: int = 1000
     MIN_QUALITY_SCORE: float = 60.0
     WARN_QUALITY_SCORE: float = 80.0
+    PIPELINE_STREAMING_INGESTION: bool = False  # Out-of-core CSV/TSV ingestion (Arrow record batches); bounds memory up to Layer 4 only, Layers 5-7 hold the whole typed frame
+    PIPELINE_CHUNK_ROWS: int = 100000           # Rows per chunk through Layers 2-4 when streaming (types are detected on rows sampled from every chunk)
+    CSV_PARSER_ENGINE: str = "pandas"           # 'pandas' (C engine) or 'pyarrow' (multithreaded)
+    JSON_FLATTEN_MAX_DEPTH: int = 3             # Nested JSON objects flattened into 'a.b' columns up to this depth
+    PIPELINE_COLUMN_WORKERS: int = 0            # Processes per run for column-parallel Layers 4-6 (0/1 = in-process)
+    PIPELINE_PARALLEL_MIN_COLUMNS: int = 32     # Narrower files always run Layers 4-6 in-process
+    PIPELINE_SKETCH_MIN_ROWS: int = 0           # Approximate column stats (HyperLogLog, t-digest) from this many rows (0 = exact)
+    PIPELINE_SKETCH_ERROR: float = 0.01         # Target relative error of approximate distinct counts and medians
+    PIPELINE_SAMPLE_ROWS: int = 0               # Detect types, estimate imputation stats and score quality on this many sampled rows (0 = every row)
+    PIPELINE_ARROW_DTYPES: bool = False         # Keep string columns Arrow-backed (string[pyarrow]) through all layers
+    PIPELINE_CHECKPOINTS: bool = False          # Opt-in: keep Arrow checkpoints of Layers 1-5 so reprocessing resumes at the first changed layer (about 3x the input size on disk per source, ~30% slower first upload)
+    PIPELINE_CHECKPOINT_MAX_BYTES: int = 5 * 1024**3        # Total checkpoint size before least recently used ones are evicted (0 = unlimited)
+    PIPELINE_CHECKPOINT_MIN_FREE_BYTES: int = 2 * 1024**3   # Free disk space kept by evicting checkpoints
+    PARQUET_COMPRESSION: str = "snappy"         # Codec of stored Parquet: 'snappy', 'zstd' (smaller, slower to write), 'lz4', 'gzip', 'none'
+    PARQUET_COMPRESSION_LEVEL: int = 0          # zstd/gzip level (0 = codec default)
+    PARQUET_ROW_GROUP_ROWS: int = 131072        # Rows per row group (smaller groups let filtered reads skip more)
+    PARQUET_DOWNCAST: bool = True               # Store numbers in the narrowest dtype holding every value exactly (reads widen them back)
+    PARQUET_MEASURE_READ: bool = False          # Report the cold read time of each stored file (fsyncs, evicts and rereads it; for benchmarks)
+    
+    # Background Pipeline Jobs
+    PIPELINE_MAX_WORKERS: int = 2               # Processes running uploads concurrently
+    PIPELINE_JOB_TTL_SECONDS: int = 86400       # How long job status is kept in Redis
+    PIPELINE_STALE_AFTER_SECONDS: int = 3600    # Sources still 'processing' this long, without a heartbeat, are marked 'error' on startup
+    PIPELINE_HEARTBEAT_SECONDS: int = 60        # Processing sources refresh a Redis heartbeat this often (it lapses after 3 misses)
+    
+    # Bulk Reprocessing (python -m app.cli.reprocess, /admin/reprocess)
+    ADMIN_EMAILS: str = ""                              # Comma-separated emails of users allowed to use /admin endpoints
+    BULK_REPROCESS_WORKERS: int = 2                     # Processes reprocessing sources concurrently
+    BULK_REPROCESS_MAX_READ_MB_PER_SECOND: float = 50.0 # Source file megabytes started per second (0 = unthrottled)
+    BULK_REPROCESS_NICE: int = 10                       # Niceness of worker processes (disk I/O priority follows it)
+    BULK_REPROCESS_RUN_TTL_SECONDS: int = 7 * 86400     # How long run state is kept in Redis (resume window)
     
     class Config:
         env_file = ".env"
@@ -9,6 +9,7 @@ import logging
 from fastapi.responses import JSONResponse
 from app.config import settings
 from app.api.v1.router import api_router
+from app.services.pipeline_jobs import pipeline_jobs
 
 class RateLimitHeadersMiddleware(BaseHTTPMiddleware):
     """Middleware to add rate limit headers to responses."""
@@ -80,10 +81,17 @@ async def startup_event():
     logger.info(f"📝 Environment: {settings.ENVIRONMENT}")
     logger.info(f"📚 API Docs: http://localhost:{settings.PORT}/docs")
     logger.info("=" * 60)
+    
+    # Jobs of a previous process that stopped mid-upload
+    try:
+        pipeline_jobs.recover_stale()
+    except Exception as e:
+        logger.error(f"Failed to recover stale pipeline jobs: {str(e)}")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger = logging.getLogger(__name__)
+    pipeline_jobs.shutdown()
     logger.info("=" * 60)
     logger.info(f"👋 {settings.APP_NAME} shutting down...")
     logger.info("=" * 60)
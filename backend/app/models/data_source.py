@@ -18,6 +18,7 @@ class DataSource(Base):
     connection_info = Column(JSONB, nullable=True)  # For API/Database connections
     row_count = Column(Integer, nullable=True)
     file_size = Column(BigInteger, nullable=True)  # In bytes
+    content_hash = Column(String(64), nullable=True, index=True)  # SHA-256 of uploaded bytes
     columns_info = Column(JSONB, nullable=True)  # Column names and types
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+from uuid import UUID
+
+class BulkReprocessRequest(BaseModel):
+    pipeline_version: Optional[str] = None
+    user_id: Optional[UUID] = None
+    source_type: Optional[str] = None
+    status: Optional[str] = Field(None, pattern="^(connected|syncing|error|disconnected)$")
+    processed_before: Optional[datetime] = None
+    force: bool = False
+    limit: Optional[int] = Field(None, ge=1)
+    dry_run: bool = False
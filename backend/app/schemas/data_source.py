@@ -26,6 +26,7 @@ class DataSource(DataSourceBase):
     file_path: Optional[str] = None
     row_count: Optional[int] = None
     file_size: Optional[int] = None
+    content_hash: Optional[str] = None
     columns_info: Optional[List[ColumnInfo]] = None
     created_at: datetime
     updated_at: datetime
@@ -45,6 +46,19 @@ class DataSource(DataSourceBase):
     class Config:
         from_attributes = True
 
+class PipelineJob(BaseModel):
+    """Status of a background pipeline job."""
+    job_id: str
+    data_source_id: UUID
+    status: str = Field(..., description="queued, processing, completed or failed")
+    current_layer: Optional[str] = None
+    layers_completed: int = 0
+    progress: float = Field(0, description="Percent of pipeline layers completed")
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    data_source: Optional[DataSource] = None
+
 class DataSourcePublic(BaseModel):
     id: UUID
     name: str
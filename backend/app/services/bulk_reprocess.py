@@ -0,0 +1,555 @@
+"""
+Bulk reprocessing.
+
+Re-runs the 7-layer pipeline on every data source processed with an
+older pipeline version (or matching a filter), outside the API nodes:
+a run is processed by `python -m app.cli.reprocess` in a bounded pool of
+low-priority worker processes, with the source files it reads throttled
+to a byte rate. Run state lives in Redis, so an interrupted run resumes
+with the sources it had not finished, and any process can report it.
+"""
+import json
+import logging
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Union
+
+import redis
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.session import SessionLocal
+from app.models.data_source import DataSource
+from app.services.data_pipeline import DataPipeline, __version__ as PIPELINE_VERSION
+from app.services.data_service import DataSourceService
+from app.services.pipeline_jobs import PipelineJobStore, build_pipeline
+
+logger = logging.getLogger(__name__)
+
+# Directory `python -m app.cli.reprocess` runs from
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+class ReprocessRunStore:
+    """
+    Redis-backed store for bulk reprocessing runs.
+    
+    A run is a JSON document plus a set of the source ids still pending,
+    sets of those completed and skipped, and a hash of the failed ones
+    (id -> error). A source moves out of the pending set only once its
+    outcome is stored, so a resumed run picks up exactly the rest.
+    """
+    
+    KEY_PREFIX = "reprocess_run"
+    
+    def __init__(self):
+        """Initialize Redis connection for run state."""
+        self.redis_client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    
+    def _key(self, run_id: str, part: Optional[str] = None) -> str:
+        key = f"{self.KEY_PREFIX}:{run_id}"
+        return f"{key}:{part}" if part else key
+    
+    def _keys(self, run_id: str) -> List[str]:
+        return [self._key(run_id)] + [self._key(run_id, part) for part in ('pending', 'completed', 'skipped', 'failed')]
+    
+    def create(self, source_ids: List[str], filters: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a queued run over the given data sources."""
+        now = datetime.utcnow().isoformat()
+        run = {
+            "run_id": str(uuid.uuid4()),
+            "status": "queued",
+            "filters": filters,
+            "pipeline_version": PIPELINE_VERSION,
+            "total": len(source_ids),
+            "pid": None,
+            "created_at": now,
+            "started_at": None,
+            "finished_at": None,
+            "updated_at": now
+        }
+        
+        pipe = self.redis_client.pipeline()
+        pipe.set(self._key(run["run_id"]), json.dumps(run))
+        for start in range(0, len(source_ids), 1000):
+            pipe.sadd(self._key(run["run_id"], 'pending'), *source_ids[start:start + 1000])
+        self._expire(pipe, run["run_id"])
+        pipe.execute()
+        
+        return run
+    
+    def update(self, run_id: str, **fields) -> Optional[Dict[str, Any]]:
+        """Merge fields into an existing run."""
+        raw = self.redis_client.get(self._key(run_id))
+        if raw is None:
+            return None
+        
+        run = json.loads(raw)
+        run.update(fields)
+        run["updated_at"] = datetime.utcnow().isoformat()
+        
+        pipe = self.redis_client.pipeline()
+        pipe.set(self._key(run_id), json.dumps(run))
+        self._expire(pipe, run_id)
+        pipe.execute()
+        return run
+    
+    def get(self, run_id: str, max_failures: int = 100) -> Optional[Dict[str, Any]]:
+        """Get a run with its progress counts and first failures, or None if unknown or expired."""
+        raw = self.redis_client.get(self._key(run_id))
+        if raw is None:
+            return None
+        
+        run = json.loads(raw)
+        pipe = self.redis_client.pipeline()
+        for part in ('pending', 'completed', 'skipped'):
+            pipe.scard(self._key(run_id, part))
+        pipe.hlen(self._key(run_id, 'failed'))
+        pipe.hscan(self._key(run_id, 'failed'), count=max_failures)
+        pending, completed, skipped, failed, (_, failures) = pipe.execute()
+        
+        run.update({
+            "pending": pending,
+            "completed": completed,
+            "skipped": skipped,
+            "failed": failed,
+            "progress": round((run["total"] - pending) / run["total"] * 100, 1) if run["total"] else 100.0,
+            "failures": dict(list(failures.items())[:max_failures])
+        })
+        return run
+    
+    def pending(self, run_id: str) -> List[str]:
+        """Source ids of a run without an outcome yet."""
+        return sorted(self.redis_client.smembers(self._key(run_id, 'pending')))
+    
+    def record(self, run_id: str, source_id: str, outcome: str, error: Optional[str] = None) -> None:
+        """
+        Store the outcome of one source and take it off the pending set.
+        
+        Args:
+            run_id: Run
+            source_id: Data source
+            outcome: 'completed', 'skipped' or 'failed'
+            error: Failure message (or skip reason) kept for failed sources
+        """
+        pipe = self.redis_client.pipeline()
+        if outcome == 'failed':
+            pipe.hset(self._key(run_id, 'failed'), source_id, error or 'Unknown error')
+        else:
+            pipe.sadd(self._key(run_id, outcome), source_id)
+        pipe.srem(self._key(run_id, 'pending'), source_id)
+        self._expire(pipe, run_id)
+        pipe.execute()
+    
+    def _expire(self, pipe, run_id: str) -> None:
+        for key in self._keys(run_id):
+            pipe.expire(key, settings.BULK_REPROCESS_RUN_TTL_SECONDS)
+
+
+class ReadThrottle:
+    """
+    Paces the start of source reads to an average byte rate.
+    
+    Each source reserves len(file) / rate seconds of the read budget;
+    starting one waits until the budget reserved by earlier ones has
+    elapsed. Bursts of small files pass at once, large files space out
+    the ones after them.
+    """
+    
+    def __init__(self, bytes_per_second: float):
+        self.bytes_per_second = bytes_per_second
+        self._next_start = time.monotonic()
+    
+    def wait(self, size: int) -> None:
+        """Block until a read of `size` bytes fits in the budget."""
+        if self.bytes_per_second <= 0:
+            return
+        
+        now = time.monotonic()
+        start = max(self._next_start, now)
+        self._next_start = start + size / self.bytes_per_second
+        
+        if start > now:
+            time.sleep(start - now)
+
+
+# Per-process state for pool workers
+_worker_pipeline: Optional[DataPipeline] = None
+
+
+def _init_worker(niceness: int) -> None:
+    """Lower the worker's CPU priority; its I/O priority follows (best-effort class)."""
+    if niceness > 0 and hasattr(os, 'nice'):
+        os.nice(niceness)
+
+
+def reprocess_source(
+    file_path: str,
+    source_type: str,
+    source_id: str,
+    sheet_name: Union[int, str] = 0
+) -> Dict[str, Any]:
+    """
+    Run the pipeline for one data source. Executed inside a pool worker process.
+    
+    Returns:
+        Pipeline processing report
+    """
+    global _worker_pipeline
+    
+    if _worker_pipeline is None:
+        _worker_pipeline = build_pipeline()
+    
+    return _worker_pipeline.process(
+        file_path=file_path,
+        source_type=source_type,
+        source_id=source_id,
+        sheet_name=sheet_name
+    )
+
+
+class BulkReprocessor:
+    """Selects data sources to reprocess and works through runs in a bounded process pool."""
+    
+    FILTER_KEYS = ('pipeline_version', 'user_id', 'source_type', 'status', 'processed_before', 'force', 'limit')
+    
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_read_mb_per_second: Optional[float] = None,
+        niceness: Optional[int] = None
+    ):
+        """
+        Args:
+            workers: Worker processes (default BULK_REPROCESS_WORKERS)
+            max_read_mb_per_second: Source megabytes started per second, 0 = unthrottled
+                (default BULK_REPROCESS_MAX_READ_MB_PER_SECOND)
+            niceness: Niceness added to workers (default BULK_REPROCESS_NICE)
+        """
+        self.workers = max(1, workers or settings.BULK_REPROCESS_WORKERS)
+        self.max_read_mb_per_second = (
+            settings.BULK_REPROCESS_MAX_READ_MB_PER_SECOND if max_read_mb_per_second is None
+            else max_read_mb_per_second
+        )
+        self.niceness = settings.BULK_REPROCESS_NICE if niceness is None else niceness
+        self.store = ReprocessRunStore()
+        self.job_store = PipelineJobStore()
+        self._stopping = False
+        # Status of each in-flight source before the run marked it 'processing'
+        self._previous_status: Dict[str, str] = {}
+    
+    @staticmethod
+    def select_sources(
+        db: Session,
+        pipeline_version: Optional[str] = None,
+        user_id: Optional[str] = None,
+        source_type: Optional[str] = None,
+        status: Optional[str] = None,
+        processed_before: Optional[datetime] = None,
+        force: bool = False,
+        limit: Optional[int] = None
+    ) -> List[DataSource]:
+        """
+        Data sources to reprocess.
+        
+        By default every file-backed source whose stored report is from
+        another pipeline version than the running one, or has no version.
+        Sources currently processing are never selected.
+        
+        Args:
+            db: Database session
+            pipeline_version: Only sources processed by this pipeline version
+            user_id: Only sources of this user
+            source_type: Only sources of this type ('csv', 'excel', ...)
+            status: Only sources with this status ('connected', 'error')
+            processed_before: Only sources last processed before this time (or never)
+            force: Also select sources already processed by the running version
+            limit: At most this many sources, oldest processed first
+        
+        Returns:
+            List of data sources
+        """
+        version = DataSource.processing_report['pipeline_version'].astext
+        query = db.query(DataSource).filter(
+            DataSource.file_path.isnot(None),
+            DataSource.status != 'processing'
+        )
+        
+        if pipeline_version is not None:
+            query = query.filter(version == pipeline_version)
+        elif not force:
+            query = query.filter(or_(version.is_(None), version != PIPELINE_VERSION))
+        
+        if user_id is not None:
+            query = query.filter(DataSource.user_id == uuid.UUID(str(user_id)))
+        if source_type is not None:
+            query = query.filter(DataSource.type == source_type)
+        if status is not None:
+            query = query.filter(DataSource.status == status)
+        if processed_before is not None:
+            query = query.filter(or_(
+                DataSource.last_processed_at.is_(None),
+                DataSource.last_processed_at < processed_before
+            ))
+        
+        query = query.order_by(DataSource.last_processed_at.asc().nullsfirst(), DataSource.created_at.asc())
+        if limit:
+            query = query.limit(limit)
+        
+        return query.all()
+    
+    @staticmethod
+    def is_up_to_date(data_source: DataSource) -> bool:
+        """Whether the source's stored results come from a successful run of the running pipeline version."""
+        report = data_source.processing_report or {}
+        return (
+            report.get('success') is True
+            and report.get('pipeline_version') == PIPELINE_VERSION
+            and bool(data_source.cleaned_path)
+            and os.path.exists(data_source.cleaned_path)
+        )
+    
+    def create_run(self, db: Session, **filters) -> Dict[str, Any]:
+        """
+        Select the data sources matching the filters and record a queued run over them.
+        
+        Args:
+            db: Database session
+            **filters: Arguments of select_sources
+        
+        Returns:
+            The created run
+        """
+        sources = self.select_sources(db, **filters)
+        stored_filters = {
+            key: value.isoformat() if isinstance(value, datetime) else str(value) if isinstance(value, uuid.UUID) else value
+            for key, value in filters.items() if key in self.FILTER_KEYS
+        }
+        
+        run = self.store.create([str(source.id) for source in sources], stored_filters)
+        logger.info(f"Created reprocess run {run['run_id']} over {run['total']} data sources")
+        return run
+    
+    @staticmethod
+    def launch(run_id: str) -> int:
+        """
+        Process a run in a detached `python -m app.cli.reprocess resume` process.
+        
+        The process runs in its own session, so it outlives the API worker
+        that started it and does not share its CPU or memory.
+        
+        Returns:
+            Process id
+        """
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'app.cli.reprocess', 'resume', run_id],
+            cwd=str(BACKEND_DIR),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        logger.info(f"Launched reprocess run {run_id} in process {process.pid}")
+        return process.pid
+    
+    def stop(self) -> None:
+        """Stop starting sources; those in flight finish and the rest stay pending."""
+        self._stopping = True
+    
+    def run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Reprocess the pending sources of a run until done or stopped.
+        
+        At most `workers` sources are in flight. Each source is re-checked
+        before it starts: deleted sources, sources without their file and
+        (unless the run was forced) sources already up to date are skipped.
+        A started source is 'processing' until it finishes, with a Redis
+        heartbeat so startup recovery leaves it alone. A successful run
+        replaces the source's results; a failed one keeps the previous
+        results and status and records the error.
+        
+        Returns:
+            Final run state, or None if the run is unknown or expired
+        """
+        run = self.store.get(run_id)
+        if run is None:
+            return None
+        
+        force = bool(run['filters'].get('force'))
+        pending = iter(self.store.pending(run_id))
+        throttle = ReadThrottle(self.max_read_mb_per_second * 2**20)
+        in_flight: Dict[Future, str] = {}
+        exhausted = False
+        
+        self.store.update(
+            run_id,
+            status="running",
+            pid=os.getpid(),
+            workers=self.workers,
+            started_at=run['started_at'] or datetime.utcnow().isoformat()
+        )
+        logger.info(f"Reprocess run {run_id}: {run['pending']} of {run['total']} data sources pending")
+        
+        db = SessionLocal()
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.niceness,)
+            ) as pool:
+                while True:
+                    while not self._stopping and not exhausted and len(in_flight) < self.workers:
+                        source_id = next(pending, None)
+                        if source_id is None:
+                            exhausted = True
+                            break
+                        
+                        future = self._submit(pool, db, run_id, source_id, force, throttle)
+                        if future is not None:
+                            in_flight[future] = source_id
+                    
+                    if not in_flight:
+                        break
+                    
+                    done, _ = wait(
+                        in_flight,
+                        timeout=settings.PIPELINE_HEARTBEAT_SECONDS,
+                        return_when=FIRST_COMPLETED
+                    )
+                    for future in done:
+                        self._store_result(db, run_id, in_flight.pop(future), future)
+                    self._heartbeat(in_flight.values())
+        finally:
+            # Sources whose result was never stored go back to their previous status
+            for source_id in list(self._previous_status):
+                self._restore_status(db, source_id)
+            db.close()
+        
+        final_status = "completed" if exhausted and not self._stopping else "interrupted"
+        self.store.update(run_id, status=final_status, pid=None, finished_at=datetime.utcnow().isoformat())
+        
+        run = self.store.get(run_id)
+        logger.info(
+            f"Reprocess run {run_id} {final_status}: {run['completed']} completed, "
+            f"{run['skipped']} skipped, {run['failed']} failed, {run['pending']} pending"
+        )
+        return run
+    
+    def _submit(
+        self,
+        pool: ProcessPoolExecutor,
+        db: Session,
+        run_id: str,
+        source_id: str,
+        force: bool,
+        throttle: ReadThrottle
+    ) -> Optional[Future]:
+        """
+        Start one source, or record why it was not started.
+        
+        The source is checked and marked 'processing' in one transaction,
+        under a row lock, so a user's reprocess or delete cannot start on it
+        while the run processes it.
+        """
+        data_source = (
+            db.query(DataSource)
+            .filter(DataSource.id == uuid.UUID(source_id))
+            .with_for_update()
+            .first()
+        )
+        
+        if data_source is None:
+            outcome, error = 'skipped', None
+        elif not data_source.file_path or not os.path.exists(data_source.file_path):
+            outcome, error = 'failed', "Source file is missing"
+        elif data_source.status == 'processing' or (not force and self.is_up_to_date(data_source)):
+            outcome, error = 'skipped', None
+        else:
+            outcome, error = None, None
+        
+        if outcome is not None:
+            db.rollback()
+            self.store.record(run_id, source_id, outcome, error)
+            return None
+        
+        file_path = data_source.file_path
+        source_type = data_source.type
+        sheet_name = DataSourceService.get_sheet_name(data_source)
+        
+        self._previous_status[source_id] = data_source.status
+        data_source.status = 'processing'
+        db.commit()
+        self._heartbeat([source_id])
+        
+        try:
+            throttle.wait(os.path.getsize(file_path))
+            return pool.submit(reprocess_source, file_path, source_type, source_id, sheet_name)
+        except Exception:
+            self._restore_status(db, source_id)
+            raise
+    
+    def _store_result(self, db: Session, run_id: str, source_id: str, future: Future) -> None:
+        """Copy a finished source's report onto it and record the outcome."""
+        try:
+            report = future.result()
+        except Exception as e:
+            logger.error(f"Reprocessing data source {source_id} crashed: {str(e)}", exc_info=True)
+            report = {'success': False, 'error': str(e)}
+        
+        if not report['success']:
+            logger.warning(f"Reprocessing data source {source_id} failed: {report.get('error')}")
+            self._restore_status(db, source_id)
+            self.store.record(run_id, source_id, 'failed', report.get('error'))
+            return
+        
+        try:
+            data_source = db.query(DataSource).filter(DataSource.id == uuid.UUID(source_id)).first()
+            if data_source is None:
+                self._previous_status.pop(source_id, None)
+                self.store.record(run_id, source_id, 'skipped')
+                return
+            
+            DataSourceService.apply_pipeline_report(data_source, report)
+            data_source.status = 'connected'
+            db.commit()
+            self._previous_status.pop(source_id, None)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to store result of data source {source_id}: {str(e)}", exc_info=True)
+            self._restore_status(db, source_id)
+            self.store.record(run_id, source_id, 'failed', str(e))
+            return
+        
+        self.store.record(run_id, source_id, 'completed')
+    
+    def _restore_status(self, db: Session, source_id: str) -> None:
+        """Give a source back the status it had before the run marked it 'processing'."""
+        previous_status = self._previous_status.pop(source_id, None)
+        if previous_status is None:
+            return
+        
+        try:
+            data_source = db.query(DataSource).filter(DataSource.id == uuid.UUID(source_id)).first()
+            if data_source is not None and data_source.status == 'processing':
+                data_source.status = previous_status
+                db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to restore the status of data source {source_id}: {str(e)}", exc_info=True)
+    
+    def _heartbeat(self, source_ids: Iterable[str]) -> None:
+        """Send heartbeats for in-flight sources (see PipelineJobManager.recover_stale)."""
+        for source_id in source_ids:
+            try:
+                self.job_store.heartbeat(source_id)
+            except redis.RedisError as e:
+                logger.warning(f"Heartbeat for data source {source_id} failed: {str(e)}")
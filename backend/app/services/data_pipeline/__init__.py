@@ -2,6 +2,9 @@
 Data Pipeline Package
 7-Layer data processing pipeline for InsightIQ
 """
+# Recorded in every processing report; bump when layer output changes
+__version__ = '1.5.0'
+
 from .pipeline_orchestrator import DataPipeline
 from .layer1_ingestion import IngestionLayer
 from .layer2_validation import StructuralValidationLayer
@@ -10,6 +13,10 @@ from .layer4_typing import TypeDetectionLayer
 from .layer5_cleaning import DataCleaningLayer
 from .layer6_quality import DataQualityLayer
 from .layer7_storage import StorageLayer
+from .profiling import LayerProfiler
+from .parallel import ColumnExecutor
+from .column_profile import ColumnProfiler
+from .checkpoints import CheckpointStore
 
 __all__ = [
     'DataPipeline',
@@ -19,7 +26,9 @@ __all__ = [
     'TypeDetectionLayer',
     'DataCleaningLayer',
     'DataQualityLayer',
-    'StorageLayer'
+    'StorageLayer',
+    'LayerProfiler',
+    'ColumnExecutor',
+    'ColumnProfiler',
+    'CheckpointStore'
 ]
-
-__version__ = '1.0.0'
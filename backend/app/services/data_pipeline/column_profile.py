@@ -0,0 +1,282 @@
+"""
+Column Profiling
+Single-pass column statistics shared by Layers 5-7 and DataValidator
+"""
+import re
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .parallel import ColumnExecutor
+from .sampling import estimate_distinct, sample_positions
+from .sketches import ColumnSketch
+
+# Format checks of the detected types that have one
+PATTERNS = {
+    'email': r'^[\w\.-]+@[\w\.-]+\.\w+$',
+    'url': r'^https?://'
+}
+
+# Value types a boolean column may hold
+BOOL_TYPES = (bool, np.bool_)
+
+# Rows fed to a column sketch at a time, which bounds its working memory
+SKETCH_CHUNK_ROWS = 100_000
+
+# Counts of the non-null values, scaled up from a row sample in sample mode
+SCALED_COUNTS = ['finite_count', 'pattern_matches', 'bool_count']
+
+
+class ColumnProfiler:
+    """
+    Computes every per-column statistic the pipeline needs, once
+    
+    Each column's null mask is taken once and all statistics are derived
+    from its non-null values: counts, distinct values, the numeric summary
+    (min, max, mean, median, finite values) and, depending on the detected
+    type, format matches or boolean values. Callers read the profile
+    instead of recomputing statistics per layer.
+    
+    In sketch mode, large frames are profiled in bounded chunks with
+    mergeable sketches (see sketches.py): distinct counts and medians are
+    approximate and listed under the profile's 'approximate' key, the
+    other statistics stay exact.
+    
+    In sample mode, frames longer than sample_rows are profiled on a row
+    sample in time independent of their length: counts are scaled up to
+    the frame, distinct counts estimated (see sampling.py), and every
+    statistic but the row count is listed as approximate. Sample mode
+    takes precedence over sketch mode.
+    """
+    
+    def __init__(
+        self,
+        executor: Optional[ColumnExecutor] = None,
+        sketch_min_rows: int = 0,
+        sketch_error: float = 0.01,
+        sample_rows: int = 0
+    ):
+        """
+        Initialize profiler
+        
+        Args:
+            executor: Optional process pool for profiling wide frames column-parallel
+            sketch_min_rows: Profile frames of at least this many rows with
+                             sketches (0: always exact)
+            sketch_error: Target relative error of sketched distinct counts
+                          and median ranks
+            sample_rows: Profile longer frames on this many sampled rows
+                         (0: always every row)
+        """
+        self.executor = executor
+        self.sketch_min_rows = sketch_min_rows
+        self.sketch_error = sketch_error
+        self.sample_rows = sample_rows
+    
+    def profile(self, df: pd.DataFrame, type_info: Optional[Dict] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Profile every column of a DataFrame
+        
+        Args:
+            df: DataFrame to profile
+            type_info: Optional type information from Layer 4, to add the
+                       format and boolean checks of each detected type
+        
+        Returns:
+            Dict of column name -> column profile
+        """
+        type_info = type_info or {}
+        positions = sample_positions(len(df), self.sample_rows)
+        if positions is not None:
+            column_args = {col: (type_info.get(col, {}).get('detected_type'), None, len(df)) for col in df.columns}
+            df = df.take(positions)
+        else:
+            sketch = 0 < self.sketch_min_rows <= len(df)
+            sketch_error = self.sketch_error if sketch else None
+            column_args = {col: (type_info.get(col, {}).get('detected_type'), sketch_error) for col in df.columns}
+        
+        if self.executor is not None and self.executor.should_parallelize(*df.shape):
+            results = self.executor.map_columns(df, ColumnProfiler, '_profile_task', column_args)
+        else:
+            results = {col: self._profile_task(df[col], *args) for col, args in column_args.items()}
+        
+        return {col: stats for col, (_, stats) in results.items()}
+    
+    def profile_chunks(self, chunks: Iterable[pd.DataFrame], type_info: Optional[Dict] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Profile data arriving in chunks with sketches
+        
+        Only one chunk is held at a time; the per-column sketches are
+        merged as chunks arrive.
+        
+        Args:
+            chunks: DataFrames with the same columns
+            type_info: Optional type information from Layer 4
+        
+        Returns:
+            Dict of column name -> column profile (approximate where listed)
+        """
+        type_info = type_info or {}
+        sketches: Dict[str, ColumnSketch] = {}
+        
+        for chunk in chunks:
+            for col in chunk.columns:
+                sketch = sketches.setdefault(col, ColumnSketch(self.sketch_error))
+                self._update_sketch(sketch, chunk[col], type_info.get(col, {}).get('detected_type'))
+        
+        return {col: sketch.to_profile() for col, sketch in sketches.items()}
+    
+    def _profile_task(
+        self,
+        series: pd.Series,
+        detected_type: Optional[str],
+        sketch_error: Optional[float] = None,
+        population: Optional[int] = None
+    ) -> Tuple[None, Dict[str, Any]]:
+        """
+        Profile one column, exactly, with a sketch or from a row sample of
+        a column of population rows (the unit of work of a pool worker)
+        """
+        if population is not None:
+            return None, self._scale_sample_profile(self.profile_column(series, detected_type), series, population)
+        
+        if sketch_error is None:
+            return None, self.profile_column(series, detected_type)
+        
+        sketch = ColumnSketch(sketch_error)
+        for start in range(0, max(len(series), 1), SKETCH_CHUNK_ROWS):
+            self._update_sketch(sketch, series.iloc[start:start + SKETCH_CHUNK_ROWS], detected_type)
+        return None, sketch.to_profile()
+    
+    def _update_sketch(self, sketch: ColumnSketch, series: pd.Series, detected_type: Optional[str]) -> None:
+        """Feed a chunk of a column to its sketch"""
+        non_null = sketch.update(series)
+        sketch.add_counts(self._type_checks(non_null, detected_type))
+    
+    def profile_column(self, series: pd.Series, detected_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Profile a single column
+        
+        Args:
+            series: Column to profile
+            detected_type: Optional detected type from Layer 4
+        
+        Returns:
+            Dict with dtype, rows, null_count, non_null_count and
+            unique_count; numeric columns add min, max, mean, median and
+            finite_count; email/url columns add pattern_matches and
+            boolean columns bool_count
+        """
+        mask = series.isna().to_numpy()
+        null_count = int(mask.sum())
+        non_null = series[~mask] if null_count else series
+        
+        stats = {
+            'dtype': str(series.dtype),
+            'rows': len(series),
+            'null_count': null_count,
+            'non_null_count': len(non_null),
+            'unique_count': int(non_null.nunique(dropna=False))
+        }
+        
+        if pd.api.types.is_numeric_dtype(series):
+            stats.update(self._numeric_stats(series, non_null, mask))
+        
+        stats.update(self._type_checks(non_null, detected_type))
+        
+        return stats
+    
+    def _scale_sample_profile(self, stats: Dict[str, Any], sample: pd.Series, population: int) -> Dict[str, Any]:
+        """Estimate the profile of a whole column from the profile of its row sample"""
+        sample_non_null = stats['non_null_count']
+        null_count = min(round(stats['null_count'] * population / stats['rows']), population)
+        non_null_count = population - null_count
+        
+        stats.update({
+            'rows': population,
+            'null_count': null_count,
+            'non_null_count': non_null_count,
+            'unique_count': estimate_distinct(sample.dropna(), non_null_count)
+        })
+        
+        for key in SCALED_COUNTS:
+            if key in stats:
+                stats[key] = round(stats[key] * non_null_count / sample_non_null) if sample_non_null else 0
+        
+        stats['approximate'] = [key for key in stats if key not in ('dtype', 'rows')]
+        return stats
+    
+    def _type_checks(self, non_null: pd.Series, detected_type: Optional[str]) -> Dict[str, int]:
+        """Format matches of email/url columns, boolean values of boolean columns"""
+        if detected_type in PATTERNS:
+            return {'pattern_matches': self._pattern_matches(non_null, PATTERNS[detected_type])}
+        elif detected_type == 'boolean':
+            return {'bool_count': self._bool_count(non_null)}
+        return {}
+    
+    def _numeric_stats(self, series: pd.Series, non_null: pd.Series, mask: np.ndarray) -> Dict[str, Any]:
+        """
+        Min, max, mean, median and finite count of a numeric column
+        
+        The values match pandas' own reductions: float means are summed
+        over the column with nulls as zeros, as pandas does. An all-null
+        nullable (extension) column gets no summary, since pandas returns
+        NA for it; an all-null NumPy column gets NaN.
+        """
+        if len(non_null) == 0:
+            if isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+                return {}
+            return {'min': np.nan, 'max': np.nan, 'mean': np.nan, 'median': np.nan, 'finite_count': 0}
+        
+        # Nullable (masked) dtypes hold their non-null values in a NumPy dtype
+        values = non_null.to_numpy(dtype=getattr(series.dtype, 'numpy_dtype', None))
+        if values.dtype == object:
+            return {}
+        
+        if values.dtype.kind == 'f':
+            column = series.to_numpy()
+            total = np.where(mask, 0, column).sum() if mask.any() else column.sum()
+        else:
+            total = values.sum(dtype=np.int64 if values.dtype.kind == 'b' else np.float64)
+        
+        return {
+            'min': float(values.min()),
+            'max': float(values.max()),
+            'mean': float(total / len(values)),
+            'median': float(np.median(values)),
+            'finite_count': int(np.isfinite(values).sum())
+        }
+    
+    def _pattern_matches(self, non_null: pd.Series, pattern: str) -> int:
+        """
+        Count values matching a format pattern (re.match semantics)
+        
+        Arrow's RE2 matches ASCII values without newlines exactly as re
+        does; the other values (Unicode \\w, '$' before a trailing newline)
+        are checked with re.
+        """
+        if len(non_null) == 0:
+            return 0
+        
+        if isinstance(non_null.dtype, pd.StringDtype):
+            # Arrow dtypes mode: the values already are an Arrow string array
+            strings = pa.array(non_null.array, type=pa.string())
+        else:
+            strings = pa.array(non_null.astype(str).to_numpy(dtype=object), type=pa.string())
+        matches = pc.match_substring_regex(strings, pattern).to_numpy(zero_copy_only=False)
+        
+        plain = pc.and_(pc.string_is_ascii(strings), pc.invert(pc.match_substring(strings, '\n')))
+        for i in np.flatnonzero(~plain.to_numpy(zero_copy_only=False)):
+            matches[i] = re.match(pattern, strings[i].as_py()) is not None
+        
+        return int(matches.sum())
+    
+    def _bool_count(self, non_null: pd.Series) -> int:
+        """Count values that are actually booleans"""
+        if non_null.dtype == bool or isinstance(non_null.dtype, pd.BooleanDtype):
+            return len(non_null)
+        
+        return int(non_null.map(type).isin(BOOL_TYPES).sum())
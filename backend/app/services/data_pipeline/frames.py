@@ -0,0 +1,32 @@
+"""
+Frame Assembly
+Rebuild a DataFrame from per-column results in one step
+"""
+from typing import Dict
+
+import pandas as pd
+
+
+def replace_columns(df: pd.DataFrame, columns: Dict[str, pd.Series]) -> pd.DataFrame:
+    """
+    Frame with some columns replaced, assembled once
+    
+    Assigning df[col] in a loop adds a block to the frame per column;
+    on frames with thousands of columns the block manager fragments,
+    pandas warns (PerformanceWarning) and every consolidation copies the
+    whole frame. Building the frame once from all of its columns keeps
+    one block per dtype (a single copy of the data). The input frame is
+    left unchanged.
+    
+    Args:
+        df: DataFrame whose columns, order and index are kept
+        columns: Column name -> replacement series, aligned with df's index
+    
+    Returns:
+        New DataFrame
+    """
+    if not columns:
+        return df
+    
+    data = {col: columns[col] if col in columns else df[col] for col in df.columns}
+    return pd.DataFrame(data, index=df.index, columns=df.columns)
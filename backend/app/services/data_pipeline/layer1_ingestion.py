@@ -4,10 +4,21 @@ Safely intake data and preserve original
 """
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import chardet
+import codecs
+import csv
 import hashlib
+import io
+import json
+import os
+import uuid
+import zipfile
+import openpyxl
 from pathlib import Path
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Optional, Union, Iterator, List, Callable
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,19 +27,80 @@ logger = logging.getLogger(__name__)
 class IngestionLayer:
     """Layer 1: Data Ingestion with encoding detection"""
     
-    def __init__(self, storage_path: Path):
+    # Bump when the layer's output changes, to invalidate its checkpoints
+    VERSION = 1
+    
+    # Source types that support out-of-core (streaming) ingestion
+    STREAMING_TYPES = ('csv', 'tsv')
+    
+    # Bytes of input decoded per Arrow record batch when streaming
+    STREAM_BLOCK_SIZE = 16 * 1024 * 1024
+    
+    # CSV/TSV parser engines: pandas C engine (single-threaded) or pyarrow.csv (multithreaded)
+    CSV_ENGINES = ('pandas', 'pyarrow')
+    
+    # JSON records converted per Arrow record batch
+    JSON_BATCH_ROWS = 10_000
+    
+    # Characters of JSON text decoded per read
+    JSON_READ_CHARS = 1024 * 1024
+    
+    # Nested objects are flattened into dotted columns up to this depth
+    JSON_MAX_DEPTH = 3
+    
+    # Compressed inputs by file suffix (zip archives must hold a single file)
+    COMPRESSIONS = {'.gz': 'gzip', '.zst': 'zstd', '.zip': 'zip'}
+    
+    # JSON files with one record per line, however many lines there are
+    JSON_LINES_SUFFIXES = ('.jsonl', '.ndjson')
+    
+    # Arrow integers -> pandas nullable integers (with nulls they would become float64)
+    ARROW_INTEGER_DTYPES = {
+        pa.int8(): pd.Int8Dtype(),
+        pa.int16(): pd.Int16Dtype(),
+        pa.int32(): pd.Int32Dtype(),
+        pa.int64(): pd.Int64Dtype(),
+        pa.uint8(): pd.UInt8Dtype(),
+        pa.uint16(): pd.UInt16Dtype(),
+        pa.uint32(): pd.UInt32Dtype(),
+        pa.uint64(): pd.UInt64Dtype()
+    }
+    
+    # String columns in Arrow dtypes mode: Arrow buffers instead of one Python object per value
+    ARROW_STRING_DTYPE = pd.StringDtype('pyarrow')
+    
+    def __init__(
+        self,
+        storage_path: Path,
+        csv_engine: str = 'pandas',
+        json_max_depth: int = JSON_MAX_DEPTH,
+        arrow_dtypes: bool = False
+    ):
+        if csv_engine not in self.CSV_ENGINES:
+            raise ValueError(f"Unsupported CSV engine: {csv_engine}")
+        
         self.storage_path = storage_path
+        self.csv_engine = csv_engine
+        self.json_max_depth = json_max_depth
+        self.arrow_dtypes = arrow_dtypes
         self.detected_encoding = None
         self.detected_delimiter = None
     
-    def process(self, file_path: str, source_type: str, sheet_name: int = 0) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    def process(
+        self,
+        file_path: str,
+        source_type: str,
+        sheet_name: Union[int, str] = 0,
+        fingerprint: Optional[str] = None
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """
         Ingest data from various sources
         
         Args:
             file_path: Path to the file or connection string
             source_type: 'csv', 'excel', 'json', 'parquet', 'tsv'
-            sheet_name: Excel sheet index (default: 0)
+            sheet_name: Excel sheet index or name (default: 0)
+            fingerprint: Precomputed fingerprint() of the file (not hashed again)
         
         Returns:
             Tuple of (DataFrame, metadata dict)
@@ -44,17 +116,32 @@ class IngestionLayer:
             elif source_type == 'json':
                 df = self._read_json(file_path)
             elif source_type == 'parquet':
-                df = pd.read_parquet(file_path)
+                df = self._read_parquet(file_path)
             elif source_type == 'tsv':
                 df = self._read_tsv(file_path)
             else:
                 raise ValueError(f"Unsupported source type: {source_type}")
             
-            # Generate fingerprint
-            data_hash = self._generate_fingerprint(df)
+            if self.arrow_dtypes:
+                df = self.to_arrow_strings(df)
+            
+            # Fingerprint the file bytes
+            data_hash = fingerprint or self.fingerprint(file_path, source_type, sheet_name)
+            
+            # Store raw copy (an uploaded Parquet file is kept as its own raw copy)
+            if source_type == 'parquet':
+                raw_path = self._link_raw(file_path, data_hash)
+            else:
+                raw_path = self._store_raw(df, data_hash)
             
-            # Store raw copy
-            raw_path = self._store_raw(df, data_hash)
+            # Columns from typed sources keep their type (Layer 4 skips detection)
+            if source_type == 'parquet':
+                typed_columns = [
+                    str(col) for col in df.columns
+                    if df[col].dtype != object and not isinstance(df[col].dtype, pd.StringDtype)
+                ]
+            else:
+                typed_columns = []
             
             # Extract metadata
             file_size = Path(file_path).stat().st_size if Path(file_path).exists() else None
@@ -69,8 +156,11 @@ class IngestionLayer:
                 'fingerprint': data_hash,
                 'raw_path': str(raw_path),
                 'columns': list(df.columns),
+                'dtypes': {str(col): str(dtype) for col, dtype in df.dtypes.items()},
                 'layer': 'ingestion',
-                'sheet_name': sheet_name if source_type == 'excel' else None
+                'sheet_name': sheet_name if source_type == 'excel' else None,
+                'compression': self.detect_compression(file_path),
+                'typed_columns': typed_columns
             }
             
             logger.info(f"Layer 1 complete: {len(df)} rows, {len(df.columns)} columns")
@@ -82,72 +172,566 @@ class IngestionLayer:
     
     def _read_csv(self, file_path: str) -> pd.DataFrame:
         """Read CSV with encoding detection"""
-        # Detect encoding
-        with open(file_path, 'rb') as f:
-            raw_data = f.read(10000)  # Read first 10KB
-            result = chardet.detect(raw_data)
-            self.detected_encoding = result['encoding'] or 'utf-8'
+        self._detect_csv_format(file_path)
         
-        # Detect delimiter
-        with open(file_path, 'r', encoding=self.detected_encoding, errors='ignore') as f:
-            first_line = f.readline()
-            self.detected_delimiter = self._detect_delimiter(first_line)
+        if self.csv_engine == 'pyarrow':
+            df = self._read_delimited_arrow(file_path)
+            if df is not None:
+                return df
         
         # Read CSV
-        df = pd.read_csv(
-            file_path,
-            encoding=self.detected_encoding,
-            delimiter=self.detected_delimiter,
-            low_memory=False,
-            skip_blank_lines=False,  # We'll handle this in Layer 2
-            encoding_errors='ignore'
-        )
+        with self.open_input(file_path) as f:
+            df = pd.read_csv(
+                f,
+                encoding=self.detected_encoding,
+                delimiter=self.detected_delimiter,
+                low_memory=False,
+                skip_blank_lines=False,  # We'll handle this in Layer 2
+                encoding_errors='ignore'
+            )
         
         return df
     
+    def _detect_encoding(self, file_path: str) -> str:
+        """Detect file encoding from the first 10KB"""
+        with self.open_input(file_path) as f:
+            raw_data = f.read(10000)
+            result = chardet.detect(raw_data)
+        
+        return result['encoding'] or 'utf-8'
+    
+    def _detect_csv_format(self, file_path: str) -> None:
+        """Detect encoding and delimiter of a CSV file"""
+        self.detected_encoding = self._detect_encoding(file_path)
+        
+        with io.TextIOWrapper(self.open_input(file_path), encoding=self.detected_encoding, errors='ignore') as f:
+            first_line = f.readline()
+            self.detected_delimiter = self._detect_delimiter(first_line)
+    
     def _detect_delimiter(self, line: str) -> str:
         """Detect CSV delimiter"""
         delimiters = [',', ';', '\t', '|', ':']
         counts = {d: line.count(d) for d in delimiters}
         return max(counts, key=counts.get)
     
-    def _read_excel(self, file_path: str, sheet_name: int = 0) -> pd.DataFrame:
-        """Read Excel file"""
-        df = pd.read_excel(
-            file_path,
-            sheet_name=sheet_name,
-            engine='openpyxl'
-        )
-        return df
+    def _read_excel(self, file_path: str, sheet_name: Union[int, str] = 0) -> pd.DataFrame:
+        """
+        Read one Excel sheet
+        
+        .xlsx rows are streamed as plain values from openpyxl in read-only
+        mode (no cell objects, no text re-parsing). Trailing empty cells
+        and rows are trimmed and header names de-duplicated as
+        pandas.read_excel does. Legacy .xls goes through pandas/xlrd.
+        """
+        if not zipfile.is_zipfile(file_path):
+            return pd.read_excel(file_path, sheet_name=sheet_name)
+        
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+        try:
+            if isinstance(sheet_name, int):
+                worksheet = workbook.worksheets[sheet_name]
+            else:
+                worksheet = workbook[sheet_name]
+            
+            # Stored dimensions are often wrong; read until the last row
+            worksheet.reset_dimensions()
+            
+            rows = []
+            width = 0
+            last_row_with_data = 0
+            for row in worksheet.iter_rows(values_only=True):
+                end = len(row)
+                while end and (row[end - 1] is None or row[end - 1] == ''):
+                    end -= 1
+                
+                rows.append(row[:end])
+                if end:
+                    last_row_with_data = len(rows)
+                    width = max(width, end)
+        finally:
+            workbook.close()
+        
+        rows = rows[:last_row_with_data]
+        if not rows:
+            return pd.DataFrame()
+        
+        header = list(rows[0]) + [None] * (width - len(rows[0]))
+        columns = self._dedupe_column_names(header)
+        data = [row + (None,) * (width - len(row)) for row in rows[1:]]
+        
+        return self._nulls_to_nan(pd.DataFrame(data, columns=columns))
     
     def _read_json(self, file_path: str) -> pd.DataFrame:
-        """Read JSON file"""
-        df = pd.read_json(file_path)
-        return df
+        """
+        Read JSON file
+        
+        Top-level arrays and JSON Lines are parsed incrementally into Arrow
+        batches (see read_json_arrow); a single top-level object is read
+        whole by pandas.
+        """
+        table = self.read_json_arrow(file_path, max_depth=self.json_max_depth)
+        if table is None:
+            with self.open_input(file_path) as f:
+                return pd.read_json(f)
+        
+        return self._nulls_to_nan(table.to_pandas(types_mapper=self._types_mapper()))
+    
+    def _read_parquet(self, file_path: str) -> pd.DataFrame:
+        """
+        Read a Parquet file row group by row group
+        
+        Row groups are decoded into one Arrow table without copying and
+        converted to pandas with Arrow buffers released as each column is
+        converted, so peak memory stays close to the size of the result.
+        Integer columns become pandas nullable integers.
+        """
+        parquet_file = pq.ParquetFile(file_path, memory_map=True)
+        
+        row_groups = [parquet_file.read_row_group(i) for i in range(parquet_file.num_row_groups)]
+        if row_groups:
+            table = pa.concat_tables(row_groups)
+        else:
+            table = parquet_file.schema_arrow.empty_table()
+        del row_groups
+        
+        return table.to_pandas(
+            types_mapper=self._types_mapper(integers=True),
+            split_blocks=True,
+            self_destruct=True
+        )
     
     def _read_tsv(self, file_path: str) -> pd.DataFrame:
         """Read TSV file"""
         self.detected_delimiter = '\t'
-        df = pd.read_csv(
-            file_path,
-            delimiter='\t',
-            low_memory=False,
-            encoding_errors='ignore'
+        
+        if self.csv_engine == 'pyarrow':
+            self.detected_encoding = self._detect_encoding(file_path)
+            df = self._read_delimited_arrow(file_path)
+            if df is not None:
+                return df
+        
+        with self.open_input(file_path) as f:
+            df = pd.read_csv(
+                f,
+                delimiter='\t',
+                low_memory=False,
+                encoding_errors='ignore'
+            )
+        return df
+    
+    def _read_delimited_arrow(self, file_path: str) -> Optional[pd.DataFrame]:
+        """Read with the Arrow engine; None means fall back to pandas"""
+        try:
+            return self.read_csv_arrow(
+                file_path,
+                self.detected_encoding,
+                self.detected_delimiter,
+                types_mapper=self._types_mapper()
+            )
+        except (pa.ArrowInvalid, UnicodeDecodeError) as e:
+            # pandas tolerates undecodable bytes (encoding_errors='ignore') and ragged rows
+            logger.warning(f"Arrow CSV parser failed, falling back to pandas: {str(e)}")
+            return None
+    
+    @staticmethod
+    def read_csv_arrow(
+        source: Union[str, bytes],
+        encoding: Optional[str] = None,
+        delimiter: Optional[str] = None,
+        types_mapper: Optional[Callable[[pa.DataType], Any]] = None
+    ) -> pd.DataFrame:
+        """
+        Parse a delimited file with the multithreaded pyarrow.csv reader
+        
+        Every column is parsed as string in parallel, then converted to
+        int64, float64 or bool when all values allow it, so the resulting
+        dtypes and column names match pandas.read_csv. (Arrow's own type
+        inference only looks at the first block and fails on later values
+        such as a 'Total' footer.) Rows with the wrong number of fields are
+        skipped.
+        
+        Args:
+            source: Path to the file or its raw bytes
+            encoding: Text encoding (default: utf-8)
+            delimiter: Field delimiter (default: ',')
+            types_mapper: Optional Arrow -> pandas dtype mapping for to_pandas()
+        
+        Returns:
+            Parsed DataFrame
+        """
+        encoding = IngestionLayer._arrow_encoding(encoding)
+        delimiter = delimiter or ','
+        column_names = IngestionLayer._read_header(source, encoding, delimiter)
+        
+        skipped_rows = []
+        
+        def skip_invalid_row(row) -> str:
+            skipped_rows.append(row.number)
+            return 'skip'
+        
+        table = pacsv.read_csv(
+            IngestionLayer._arrow_source(source),
+            read_options=pacsv.ReadOptions(
+                encoding=encoding,
+                column_names=column_names,
+                skip_rows=1,
+                use_threads=True
+            ),
+            parse_options=pacsv.ParseOptions(
+                delimiter=delimiter,
+                invalid_row_handler=skip_invalid_row
+            ),
+            convert_options=pacsv.ConvertOptions(
+                column_types={name: pa.string() for name in column_names},
+                strings_can_be_null=True
+            )
         )
+        
+        if skipped_rows:
+            logger.warning(f"Arrow CSV parser skipped {len(skipped_rows)} malformed rows")
+        
+        columns = [IngestionLayer._infer_arrow_type(column) for column in table.columns]
+        df = pa.Table.from_arrays(columns, names=column_names).to_pandas(types_mapper=types_mapper)
+        return IngestionLayer._nulls_to_nan(df)
+    
+    @staticmethod
+    def _infer_arrow_type(column: pa.ChunkedArray) -> pa.ChunkedArray:
+        """Cast a string column to the first of int64/float64/bool that fits every value"""
+        for target_type in (pa.int64(), pa.float64(), pa.bool_()):
+            try:
+                return column.cast(target_type)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                continue
+        
+        return column
+    
+    def _types_mapper(self, integers: bool = False) -> Optional[Callable[[pa.DataType], Any]]:
+        """
+        to_pandas() dtype mapping of this reader
+        
+        Args:
+            integers: Map Arrow integers to pandas nullable integers
+        
+        Returns:
+            Mapper, or None for pandas' default conversion
+        """
+        mapping = dict(self.ARROW_INTEGER_DTYPES) if integers else {}
+        if self.arrow_dtypes:
+            mapping[pa.string()] = self.ARROW_STRING_DTYPE
+            mapping[pa.large_string()] = self.ARROW_STRING_DTYPE
+        
+        return mapping.get if mapping else None
+    
+    @classmethod
+    def to_arrow_strings(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert object columns holding only strings to Arrow-backed strings
+        
+        Columns mixing strings with numbers, booleans or other objects stay
+        object, so no value changes.
+        """
+        for col in df.columns[df.dtypes == object]:
+            if pd.api.types.infer_dtype(df[col], skipna=True) == 'string':
+                df[col] = df[col].astype(cls.ARROW_STRING_DTYPE)
+        
         return df
     
-    def _generate_fingerprint(self, df: pd.DataFrame) -> str:
-        """Generate SHA-256 hash of data"""
-        # Create hash from shape + sample of data
-        data_string = f"{df.shape}_{df.columns.tolist()}"
+    @staticmethod
+    def _nulls_to_nan(df: pd.DataFrame) -> pd.DataFrame:
+        """Arrow string nulls arrive as None; use NaN like read_csv does"""
+        for col in df.columns[df.dtypes == object]:
+            df[col] = df[col].where(df[col].notna(), np.nan)
+        
+        return df
+    
+    @staticmethod
+    def _arrow_encoding(encoding: Optional[str]) -> str:
+        """
+        Encoding name for pyarrow.csv
+        
+        ASCII and UTF-8 use Arrow's native decoder; anything else goes
+        through a Python codec (slower, single-threaded).
+        """
+        if not encoding:
+            return 'utf8'
+        
+        name = codecs.lookup(encoding).name
+        return 'utf8' if name in ('ascii', 'utf-8') else encoding
+    
+    @staticmethod
+    def _arrow_source(source: Union[str, bytes]):
+        """Fresh readable input for pyarrow.csv (bytes are wrapped in a buffer reader)"""
+        if isinstance(source, (bytes, bytearray)):
+            return pa.BufferReader(source)
+        if IngestionLayer.detect_compression(source):
+            return IngestionLayer.open_input(source)
+        return str(source)
+    
+    @staticmethod
+    def detect_compression(file_path: Union[str, Path]) -> Optional[str]:
+        """Compression implied by the file suffix ('gzip', 'zstd', 'zip'), or None"""
+        return IngestionLayer.COMPRESSIONS.get(Path(file_path).suffix.lower())
+    
+    @staticmethod
+    def open_input(source: Union[str, bytes], compression: Optional[str] = None):
+        """
+        Readable binary stream over the content of a file or bytes
+        
+        gzip and zstd are decompressed by Arrow as the stream is read, and
+        zip archives are read from their single member, so compressed
+        uploads are never expanded on disk or in memory. Paths use the
+        compression implied by their suffix unless one is given.
+        """
+        is_bytes = isinstance(source, (bytes, bytearray))
+        if compression is None and not is_bytes:
+            compression = IngestionLayer.detect_compression(source)
+        
+        if compression == 'zip':
+            archive = zipfile.ZipFile(io.BytesIO(source) if is_bytes else source)
+            return archive.open(IngestionLayer.zip_member(archive))
+        
+        if compression:
+            return pa.input_stream(pa.py_buffer(source) if is_bytes else str(source), compression=compression)
+        
+        return io.BytesIO(source) if is_bytes else open(source, 'rb')
+    
+    @staticmethod
+    def zip_member(archive: zipfile.ZipFile) -> zipfile.ZipInfo:
+        """The single data file of a zip archive (directories and macOS metadata are ignored)"""
+        members = [
+            info for info in archive.infolist()
+            if not info.is_dir() and not info.filename.startswith('__MACOSX/')
+        ]
         
-        # Add sample from first and last rows
-        if len(df) > 0:
-            data_string += f"_{df.head(5).to_json()}"
-        if len(df) > 5:
-            data_string += f"_{df.tail(5).to_json()}"
+        if len(members) != 1:
+            raise ValueError(f"Zip archive must contain exactly one file, found {len(members)}")
         
-        return hashlib.sha256(data_string.encode()).hexdigest()
+        return members[0]
+    
+    @staticmethod
+    def read_json_arrow(
+        source: Union[str, bytes],
+        max_depth: int = JSON_MAX_DEPTH,
+        batch_rows: int = JSON_BATCH_ROWS,
+        json_lines: Optional[bool] = None
+    ) -> Optional[pa.Table]:
+        """
+        Incrementally parse a JSON array of records or JSON Lines into Arrow
+        
+        Records are decoded one at a time from a bounded text buffer,
+        flattened (nested objects become 'parent.child' columns up to
+        max_depth; deeper objects and lists are kept as JSON strings) and
+        converted to an Arrow record batch every batch_rows records, so the
+        Python objects of the whole file never exist at once. Columns whose
+        type differs between batches are widened to float64 or string.
+        
+        Args:
+            source: Path to the file or its raw bytes
+            max_depth: Maximum nesting depth flattened into columns
+            batch_rows: Records per Arrow record batch
+            json_lines: The source is JSON Lines, so a single line is one
+                        record (None: from the file suffix, see is_json_lines_file;
+                        otherwise recognised from the first line)
+        
+        Returns:
+            Arrow table, or None when the document is a single top-level
+            object (not a record stream); callers handle that layout.
+        """
+        if json_lines is None:
+            json_lines = IngestionLayer.is_json_lines_file(source)
+        
+        with io.TextIOWrapper(IngestionLayer.open_input(source), encoding='utf-8-sig') as text:
+            head = text.read(IngestionLayer.JSON_READ_CHARS).lstrip()
+            
+            if head.startswith('{'):
+                # JSON Lines are recognised from the first line, so read past it
+                parts = [head]
+                while '\n' not in parts[-1]:
+                    more = text.read(IngestionLayer.JSON_READ_CHARS)
+                    if not more:
+                        break
+                    parts.append(more)
+                
+                rest = parts[-1].partition('\n')[2]
+                while not rest.strip():
+                    rest = text.read(IngestionLayer.JSON_READ_CHARS)
+                    if not rest:
+                        break
+                    parts.append(rest)
+                head = ''.join(parts)
+            
+            if head.startswith('['):
+                values = IngestionLayer._iter_json_values(text, head[1:], in_array=True)
+            elif head.startswith('{') and (json_lines or IngestionLayer._is_json_lines(head)):
+                values = IngestionLayer._iter_json_values(text, head, in_array=False)
+            elif head.startswith('{'):
+                return None
+            else:
+                raise ValueError("JSON must be an object or array")
+            
+            batches = []
+            records = []
+            for value in values:
+                if not isinstance(value, dict):
+                    value = {'value': value}
+                records.append(IngestionLayer._flatten_json_record(value, max_depth))
+                
+                if len(records) >= batch_rows:
+                    batches.append(IngestionLayer._json_records_to_batch(records))
+                    records = []
+            
+            if records or not batches:
+                batches.append(IngestionLayer._json_records_to_batch(records))
+        
+        return IngestionLayer._combine_json_batches(batches)
+    
+    @staticmethod
+    def is_json_lines_file(source: Union[str, bytes, Path]) -> bool:
+        """Whether a path names a JSON Lines file (.jsonl/.ndjson, also inside .gz/.zst/.zip)"""
+        if isinstance(source, (bytes, bytearray)):
+            return False
+        
+        path = Path(source)
+        compression = IngestionLayer.detect_compression(path)
+        if compression == 'zip':
+            with zipfile.ZipFile(path) as archive:
+                name = IngestionLayer.zip_member(archive).filename
+        elif compression:
+            name = path.stem
+        else:
+            name = path.name
+        
+        return Path(name).suffix.lower() in IngestionLayer.JSON_LINES_SUFFIXES
+    
+    @staticmethod
+    def _is_json_lines(head: str) -> bool:
+        """True when the first line is a complete JSON value followed by more content"""
+        first_line, newline, rest = head.partition('\n')
+        if not newline or not rest.strip():
+            return False
+        
+        try:
+            json.loads(first_line)
+        except json.JSONDecodeError:
+            return False
+        
+        return True
+    
+    @staticmethod
+    def _iter_json_values(text: io.TextIOBase, buffer: str, in_array: bool) -> Iterator[Any]:
+        """
+        Decode consecutive JSON values from a text stream
+        
+        Yields the elements of a top-level array (in_array=True, `buffer`
+        starts after the opening bracket) or whitespace-separated values
+        (JSON Lines). Only the undecoded remainder is kept in the buffer;
+        it grows geometrically when a single value spans several reads.
+        """
+        decoder = json.JSONDecoder()
+        separators = ' \t\r\n,' if in_array else ' \t\r\n'
+        pos = 0
+        eof = False
+        
+        while True:
+            while pos < len(buffer) and buffer[pos] in separators:
+                pos += 1
+            
+            if pos == len(buffer) and not eof:
+                buffer = text.read(IngestionLayer.JSON_READ_CHARS)
+                pos = 0
+                eof = not buffer
+                continue
+            
+            if pos == len(buffer):
+                if in_array:
+                    raise ValueError("Unexpected end of JSON array")
+                return
+            
+            if in_array and buffer[pos] == ']':
+                return
+            
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                # A number (or literal) at the end of the buffer may continue in the next read
+                complete = end < len(buffer) or eof
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                complete = False
+            
+            if not complete:
+                more = text.read(max(IngestionLayer.JSON_READ_CHARS, len(buffer) - pos))
+                eof = not more
+                buffer = buffer[pos:] + more
+                pos = 0
+                continue
+            
+            yield value
+            pos = end
+    
+    @staticmethod
+    def _flatten_json_record(record: Dict[str, Any], max_depth: int, prefix: str = '', depth: int = 1) -> Dict[str, Any]:
+        """Flatten nested objects into dotted keys; deeper objects and lists become JSON strings"""
+        flat = {}
+        for key, value in record.items():
+            name = f"{prefix}{key}"
+            
+            if isinstance(value, dict) and value and depth < max_depth:
+                flat.update(IngestionLayer._flatten_json_record(value, max_depth, f"{name}.", depth + 1))
+            elif isinstance(value, (dict, list)):
+                flat[name] = json.dumps(value, ensure_ascii=False)
+            else:
+                flat[name] = value
+        
+        return flat
+    
+    @staticmethod
+    def _json_records_to_batch(records: List[Dict[str, Any]]) -> pa.RecordBatch:
+        """Build one record batch; columns with mixed value types are stored as strings"""
+        names = list(dict.fromkeys(name for record in records for name in record))
+        
+        arrays = []
+        for name in names:
+            values = [record.get(name) for record in records]
+            try:
+                arrays.append(pa.array(values))
+            except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+                arrays.append(pa.array([None if v is None else str(v) for v in values], type=pa.string()))
+        
+        return pa.RecordBatch.from_arrays(arrays, names=names)
+    
+    @staticmethod
+    def _combine_json_batches(batches: List[pa.RecordBatch]) -> pa.Table:
+        """Concatenate batches with differing columns/types into one table"""
+        names = list(dict.fromkeys(name for batch in batches for name in batch.schema.names))
+        
+        schema = []
+        for name in names:
+            types = {batch.schema.field(name).type for batch in batches if name in batch.schema.names}
+            types.discard(pa.null())
+            
+            if not types:
+                target = pa.null()
+            elif len(types) == 1:
+                target = types.pop()
+            elif all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in types):
+                target = pa.float64()
+            else:
+                target = pa.string()
+            schema.append(pa.field(name, target))
+        schema = pa.schema(schema)
+        
+        aligned = []
+        for batch in batches:
+            columns = []
+            for field in schema:
+                if field.name in batch.schema.names:
+                    columns.append(batch.column(field.name).cast(field.type))
+                else:
+                    columns.append(pa.nulls(batch.num_rows, type=field.type))
+            aligned.append(pa.RecordBatch.from_arrays(columns, schema=schema))
+        
+        return pa.Table.from_batches(aligned, schema=schema)
     
     def _store_raw(self, df: pd.DataFrame, data_hash: str) -> Path:
         """Store raw copy as Parquet"""
@@ -155,7 +739,223 @@ class IngestionLayer:
         raw_dir.mkdir(parents=True, exist_ok=True)
         
         raw_path = raw_dir / f"{data_hash}_raw.parquet"
-        df.to_parquet(raw_path, index=False, engine='pyarrow')
+        if raw_path.exists():
+            # Content-addressed: identical input was already stored
+            logger.info(f"Raw data already stored at: {raw_path}")
+            return raw_path
+        
+        tmp_path = self._tmp_path(raw_path)
+        try:
+            df.to_parquet(tmp_path, index=False, engine='pyarrow')
+            tmp_path.replace(raw_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
         
         logger.info(f"Stored raw data at: {raw_path}")
         return raw_path
+    
+    @staticmethod
+    def _tmp_path(path: Path) -> Path:
+        """
+        Unique temporary file next to path, renamed over it once written
+        
+        Raw copies are content-addressed, so concurrent runs on the same
+        bytes (two uploads, an upload and a bulk reprocess) write the same
+        path; each needs its own temporary file for the rename to be atomic.
+        """
+        return path.with_name(f"{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    
+    def _link_raw(self, file_path: str, data_hash: str) -> Path:
+        """Keep an uploaded Parquet file as the raw copy (hard link, no rewrite)"""
+        raw_dir = self.storage_path / 'raw'
+        raw_dir.mkdir(parents=True, exist_ok=True)
+        
+        raw_path = raw_dir / f"{data_hash}_raw.parquet"
+        if raw_path.exists():
+            logger.info(f"Raw data already stored at: {raw_path}")
+            return raw_path
+        
+        try:
+            os.link(file_path, raw_path)
+        except FileExistsError:
+            pass
+        except OSError:
+            # Storage on another filesystem: the upload itself is the raw copy
+            logger.info(f"Using uploaded Parquet file as raw copy: {file_path}")
+            return Path(file_path)
+        
+        logger.info(f"Linked raw data at: {raw_path}")
+        return raw_path
+    
+    def process_stream(self, file_path: str, source_type: str, fingerprint: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Out-of-core ingestion for CSV/TSV files
+        
+        Reads the file as Arrow record batches and appends each batch to
+        the raw Parquet copy, so memory use is bounded by the batch size
+        rather than the file size. All columns are kept as strings; typing
+        happens in Layer 4. Use iter_raw_chunks() to read the data back.
+        
+        Args:
+            file_path: Path to the CSV/TSV file
+            source_type: 'csv' or 'tsv'
+            fingerprint: Precomputed fingerprint() of the file (not hashed again)
+        
+        Returns:
+            Metadata dict (same keys as process(), plus per-column null counts)
+        """
+        logger.info(f"Layer 1: Streaming {source_type} from {file_path}")
+        
+        if source_type not in self.STREAMING_TYPES:
+            raise ValueError(f"Streaming ingestion not supported for: {source_type}")
+        
+        try:
+            if source_type == 'csv':
+                self._detect_csv_format(file_path)
+            else:
+                self.detected_encoding = self._detect_encoding(file_path)
+                self.detected_delimiter = '\t'
+            
+            data_hash = fingerprint or self._hash_file(file_path)
+            column_names = self._read_header(file_path, self.detected_encoding, self.detected_delimiter)
+            
+            skipped_rows = []
+            
+            def skip_invalid_row(row) -> str:
+                # Rows with a wrong number of fields are dropped and counted
+                skipped_rows.append(row.number)
+                return 'skip'
+            
+            reader = pacsv.open_csv(
+                self._arrow_source(file_path),
+                read_options=pacsv.ReadOptions(
+                    encoding=self._arrow_encoding(self.detected_encoding),
+                    column_names=column_names,
+                    skip_rows=1,
+                    block_size=self.STREAM_BLOCK_SIZE
+                ),
+                parse_options=pacsv.ParseOptions(
+                    delimiter=self.detected_delimiter,
+                    invalid_row_handler=skip_invalid_row
+                ),
+                convert_options=pacsv.ConvertOptions(
+                    column_types={name: pa.string() for name in column_names},
+                    strings_can_be_null=True
+                )
+            )
+            
+            raw_dir = self.storage_path / 'raw'
+            raw_dir.mkdir(parents=True, exist_ok=True)
+            raw_path = raw_dir / f"{data_hash}_raw.parquet"
+            tmp_path = self._tmp_path(raw_path)
+            
+            row_count = 0
+            null_counts = [0] * len(column_names)
+            
+            try:
+                with pq.ParquetWriter(tmp_path, reader.schema, compression='snappy') as writer:
+                    for batch in reader:
+                        writer.write_batch(batch)
+                        row_count += batch.num_rows
+                        for i, column in enumerate(batch.columns):
+                            null_counts[i] += column.null_count
+                
+                tmp_path.replace(raw_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            logger.info(f"Stored raw data at: {raw_path}")
+            
+            metadata = {
+                'source_type': source_type,
+                'row_count': row_count,
+                'column_count': len(column_names),
+                'file_size': Path(file_path).stat().st_size,
+                'encoding': self.detected_encoding,
+                'delimiter': self.detected_delimiter,
+                'fingerprint': data_hash,
+                'raw_path': str(raw_path),
+                'columns': column_names,
+                'dtypes': {name: 'object' for name in column_names},
+                'null_counts': dict(zip(column_names, null_counts)),
+                'invalid_rows_skipped': len(skipped_rows),
+                'compression': self.detect_compression(file_path),
+                'streaming': True,
+                'layer': 'ingestion',
+                'sheet_name': None
+            }
+            
+            logger.info(f"Layer 1 complete: {row_count} rows, {len(column_names)} columns (streamed)")
+            return metadata
+            
+        except Exception as e:
+            logger.error(f"Layer 1 failed: {str(e)}", exc_info=True)
+            raise
+    
+    def iter_raw_chunks(self, raw_path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        """Read the raw Parquet copy back as DataFrames of at most chunk_rows rows"""
+        parquet_file = pq.ParquetFile(raw_path)
+        
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows):
+            yield self._nulls_to_nan(batch.to_pandas(types_mapper=self._types_mapper()))
+    
+    @staticmethod
+    def _read_header(source: Union[str, bytes], encoding: str, delimiter: str) -> List[str]:
+        """
+        Read column names from the header row
+        
+        Blank and duplicate names are renamed the way pandas does
+        ('Unnamed: 3', 'price.1') so all CSV readers agree.
+        """
+        with io.TextIOWrapper(IngestionLayer.open_input(source), encoding=encoding, errors='ignore', newline='') as text:
+            raw_names = next(csv.reader(text, delimiter=delimiter), [])
+        
+        return IngestionLayer._dedupe_column_names(raw_names)
+    
+    @staticmethod
+    def _dedupe_column_names(raw_names: List[Any]) -> List[Any]:
+        """Name blank headers 'Unnamed: i' and suffix duplicates ('a', 'a.1'), like pandas"""
+        names = []
+        seen = {}
+        for i, name in enumerate(raw_names):
+            if name is None or (isinstance(name, str) and not name.strip()):
+                name = f"Unnamed: {i}"
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            else:
+                seen[name] = 0
+            names.append(name)
+        
+        return names
+    
+    def fingerprint(self, file_path: str, source_type: str, sheet_name: Union[int, str] = 0) -> str:
+        """
+        Content fingerprint of an input file, as recorded in the metadata
+        
+        Args:
+            file_path: Path to the file
+            source_type: Type of source
+            sheet_name: Excel sheet index or name (ignored for other types)
+        
+        Returns:
+            SHA-256 hex digest
+        """
+        return self._hash_file(file_path, sheet_name if source_type == 'excel' else None)
+    
+    def _hash_file(self, file_path: str, sheet_name: Any = None, chunk_size: int = 1024 * 1024) -> str:
+        """
+        SHA-256 of the full file bytes, read in chunks
+        
+        The Excel sheet is mixed in so different sheets of one workbook
+        get different fingerprints.
+        """
+        hasher = hashlib.sha256()
+        
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                hasher.update(chunk)
+        
+        if sheet_name is not None:
+            hasher.update(f"sheet:{sheet_name}".encode())
+        
+        return hasher.hexdigest()
@@ -4,7 +4,7 @@ Fix structural issues in data
 """
 import pandas as pd
 import numpy as np
-from typing import Tuple, List, Dict, Any
+from typing import Tuple, List, Dict, Any, Iterator, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,6 +13,12 @@ logger = logging.getLogger(__name__)
 class StructuralValidationLayer:
     """Layer 2: Structural validation and cleanup"""
     
+    # Bump when the layer's output changes, to invalidate its checkpoints
+    VERSION = 2
+    
+    # Number of trailing rows checked for footers/summaries
+    FOOTER_CHECK_ROWS = 5
+    
     def process(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """
         Validate and fix structural issues
@@ -76,8 +82,116 @@ class StructuralValidationLayer:
         logger.info(f"Layer 2 complete: {len(issues)} issues fixed")
         return df, result
     
+    def iter_process(
+        self,
+        chunks: Iterator[pd.DataFrame],
+        result: Dict[str, Any],
+        empty_columns: Optional[List[str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Chunked variant of process() for streamed ingestion
+        
+        Multi-headers and inconsistent rows are checked on the first chunk;
+        the multi-header check only looks at the first row's values, so it
+        decides as process() does although chunks are all strings.
+        The last rows of each chunk are held back so footer detection runs
+        on the true end of the data. `result` receives the same report as
+        process() once the generator is exhausted.
+        
+        Args:
+            chunks: DataFrame chunks from Layer 1 (all-string columns)
+            result: Dict filled with the validation report
+            empty_columns: Columns known to be entirely empty (from Layer 1 null counts)
+        
+        Yields:
+            Validated DataFrame chunks
+        """
+        logger.info("Layer 2: Validating structure (chunked)")
+        
+        issues = []
+        stats = {'original_rows': 0, 'original_columns': 0}
+        empty_columns = set(empty_columns or [])
+        
+        columns = None
+        keep_positions = None
+        inconsistent = False
+        empty_rows = 0
+        final_rows = 0
+        tail = None
+        
+        for chunk in chunks:
+            stats['original_rows'] += len(chunk)
+            
+            if columns is None:
+                stats['original_columns'] = len(chunk.columns)
+                keep_positions = [i for i, col in enumerate(chunk.columns) if col not in empty_columns]
+                
+                if self._has_multi_headers(chunk):
+                    chunk = self._fix_multi_headers(chunk)
+                    issues.append("Multi-header rows detected and merged")
+                columns = list(chunk.columns)
+            else:
+                chunk.columns = columns
+            
+            chunk = chunk.iloc[:, keep_positions]
+            
+            empty_mask = chunk.isna().all(axis=1)
+            empty_rows += int(empty_mask.sum())
+            chunk = chunk[~empty_mask]
+            
+            if tail is None:
+                inconsistent = self._has_inconsistent_rows(chunk)
+            else:
+                chunk = pd.concat([tail, chunk])
+            
+            tail = chunk.iloc[-self.FOOTER_CHECK_ROWS:]
+            chunk = chunk.iloc[:-self.FOOTER_CHECK_ROWS]
+            
+            if len(chunk) > 0:
+                final_rows += len(chunk)
+                yield chunk.reset_index(drop=True)
+        
+        if empty_rows > 0:
+            issues.append(f"Removed {empty_rows} empty rows")
+        
+        if empty_columns:
+            issues.append(f"Removed {len(empty_columns)} empty columns")
+        
+        if tail is not None:
+            footer_rows = self._detect_footer_rows(tail)
+            if footer_rows:
+                tail = tail.iloc[:-len(footer_rows)]
+                issues.append(f"Removed {len(footer_rows)} footer/summary rows")
+            
+            if len(tail) > 0:
+                final_rows += len(tail)
+                yield tail.reset_index(drop=True)
+        
+        if inconsistent:
+            issues.append("Fixed inconsistent row lengths")
+        
+        stats['final_rows'] = final_rows
+        stats['final_columns'] = len(keep_positions) if keep_positions is not None else 0
+        stats['rows_removed'] = stats['original_rows'] - stats['final_rows']
+        stats['columns_removed'] = stats['original_columns'] - stats['final_columns']
+        
+        result.update({
+            'issues': issues,
+            'stats': stats,
+            'layer': 'validation'
+        })
+        
+        logger.info(f"Layer 2 complete: {len(issues)} issues fixed")
+    
     def _has_multi_headers(self, df: pd.DataFrame) -> bool:
-        """Detect if first row(s) are headers"""
+        """
+        Detect if the first row is a second header row
+        
+        A header row is mostly short strings that are not numbers. Numbers
+        count as data whether their column was read as numbers or as
+        strings (streamed chunks, or a column read as text because of a
+        'Total' footer), so batch and streamed ingestion decide alike.
+        """
         if len(df) == 0:
             return False
         
@@ -85,16 +199,26 @@ class StructuralValidationLayer:
         
         # Check if first row has mostly non-null values
         if first_row.notna().sum() / len(first_row) > 0.8:
-            # Check if values look like headers (short strings, no numbers)
-            try:
-                string_count = sum(1 for x in first_row if pd.notna(x) and isinstance(x, str) and len(str(x)) < 50)
-                if string_count / len(first_row) > 0.7:
-                    return True
-            except:
-                pass
+            header_count = sum(
+                1 for x in first_row
+                if isinstance(x, str) and len(x) < 50 and not self._is_number(x)
+            )
+            if header_count / len(first_row) > 0.7:
+                return True
         
         return False
     
+    @staticmethod
+    def _is_number(value: str) -> bool:
+        """Whether a string holds a plain number (as read_csv would parse it)"""
+        if '_' in value:
+            return False
+        try:
+            float(value)
+            return True
+        except ValueError:
+            return False
+    
     def _fix_multi_headers(self, df: pd.DataFrame) -> pd.DataFrame:
         """Merge multi-header rows into column names"""
         first_row = df.iloc[0]
@@ -117,8 +241,8 @@ class StructuralValidationLayer:
         footer_keywords = ['total', 'sum', 'average', 'summary', 'grand total', 'subtotal', 'count']
         footer_rows = []
         
-        # Check last 5 rows
-        check_rows = min(5, len(df))
+        # Check last rows
+        check_rows = min(self.FOOTER_CHECK_ROWS, len(df))
         for idx in range(max(0, len(df) - check_rows), len(df)):
             try:
                 row = df.iloc[idx]
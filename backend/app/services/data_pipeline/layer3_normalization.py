@@ -13,6 +13,9 @@ logger = logging.getLogger(__name__)
 class ColumnNormalizationLayer:
     """Layer 3: Column name normalization"""
     
+    # Bump when the layer's output changes, to invalidate its checkpoints
+    VERSION = 1
+    
     def process(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """
         Normalize column names
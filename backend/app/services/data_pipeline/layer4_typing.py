@@ -4,17 +4,32 @@ Smart type inference and conversion
 """
 import pandas as pd
 import numpy as np
-from typing import Tuple, Dict, Any, List
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import Tuple, Dict, Any, List, Optional, Iterable
 import re
 from datetime import datetime
 import logging
 
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+from .frames import replace_columns
+from .memoize import map_distinct
+from .parallel import ColumnExecutor
+from .sampling import sample_series
+
 logger = logging.getLogger(__name__)
 
 
 class TypeDetectionLayer:
     """Layer 4: Smart type detection and casting"""
     
+    # Bump when the layer's output changes, to invalidate its checkpoints
+    VERSION = 2
+    
     # Date formats to try
     DATE_FORMATS = [
         '%Y-%m-%d',           # 2024-01-15
@@ -29,76 +44,322 @@ class TypeDetectionLayer:
         '%d.%m.%Y',           # 15.01.2024
     ]
     
-    def process(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    # Boolean spellings (compared after strip + lower)
+    TRUE_VALUES = ['true', 't', 'yes', 'y', '1', 'on', 'enabled']
+    FALSE_VALUES = ['false', 'f', 'no', 'n', '0', 'off', 'disabled']
+    
+    # Removed from currency values, in this order
+    CURRENCY_TOKENS = ['$', '€', '£', 'USD', 'EUR', 'GBP', ',', ' ']
+    
+    # Characters str.strip() removes, for the Arrow kernels
+    WHITESPACE = '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000'
+    
+    # Plain decimal syntax, which Arrow parses exactly like float(); anything
+    # else ('nan', 'inf', '1_000', ...) goes through float() itself
+    DECIMAL_PATTERN = r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$'
+    
+    # Values of the detection sample the format checks (currency, percentage,
+    # email, url) look at, unless the column is sampled (see sample_rows)
+    FORMAT_CHECK_VALUES = 10
+    
+    def __init__(self, executor: Optional[ColumnExecutor] = None, sample_rows: int = 0):
+        """
+        Initialize layer
+        
+        Args:
+            executor: Optional process pool for typing wide frames column-parallel
+            sample_rows: Detect types of longer columns on this many sampled
+                         rows, with the format checks on the whole sample
+                         (0: the default 1,000-value detection sample)
+        """
+        self.executor = executor
+        self.sample_rows = sample_rows
+    
+    def process(
+        self,
+        df: pd.DataFrame,
+        typed_columns: Optional[Iterable[str]] = None
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """
         Detect and cast data types
         
         Args:
             df: DataFrame from Layer 3
+            typed_columns: Columns that arrived with a native type from a typed
+                           source (Parquet/Arrow); their type is kept as-is
         
         Returns:
             Tuple of (DataFrame with proper types, type info dict)
         """
         logger.info(f"Layer 4: Detecting types for {len(df.columns)} columns")
         
-        type_info = {}
+        original_dtypes = {col: str(df[col].dtype) for col in df.columns}
+        native_types = self.native_types(df, typed_columns or [])
+        
+        if self.executor is not None and self.executor.should_parallelize(*df.shape):
+            df, detected_types, date_formats, conversion_counts = self._type_columns_parallel(df, native_types)
+        else:
+            detected_types = self.detect_types(df, native_types)
+            date_formats = self.detect_date_formats(df, detected_types, native_types)
+            df, conversion_counts = self.cast_columns(df, detected_types, native_types, date_formats)
+        
+        result = {
+            'type_info': self.build_type_info(
+                df, detected_types, original_dtypes, conversion_counts, native_types, date_formats
+            ),
+            'layer': 'typing'
+        }
+        
+        if 0 < self.sample_rows < len(df):
+            result['sample_rows'] = self.sample_rows
+        
+        logger.info(f"Layer 4 complete: Types detected and cast ({len(native_types)} kept from source)")
+        return df, result
+    
+    def native_types(self, df: pd.DataFrame, typed_columns: Iterable[str]) -> Dict[str, str]:
+        """
+        Map already-typed columns to a detected type without probing values
+        
+        Only boolean, integer, float and datetime dtypes qualify; anything
+        else (object, category, timedelta) still goes through detection.
+        
+        Args:
+            df: DataFrame
+            typed_columns: Columns whose dtype came from a typed source
+        
+        Returns:
+            Dict of column name -> detected type
+        """
+        native_types = {}
+        
+        for col in typed_columns:
+            if col not in df.columns:
+                continue
+            
+            dtype = df[col].dtype
+            if pd.api.types.is_bool_dtype(dtype):
+                native_types[col] = 'boolean'
+            elif pd.api.types.is_integer_dtype(dtype):
+                native_types[col] = 'integer'
+            elif pd.api.types.is_float_dtype(dtype):
+                native_types[col] = 'float'
+            elif pd.api.types.is_datetime64_any_dtype(dtype):
+                native_types[col] = 'datetime'
+        
+        return native_types
+    
+    def detect_types(self, df: pd.DataFrame, native_types: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Detect the type of every column
+        
+        Args:
+            df: DataFrame (or a representative chunk of it)
+            native_types: Types already known from the source (see native_types())
+        
+        Returns:
+            Dict of column name -> detected type
+        """
+        native_types = native_types or {}
+        
+        return {
+            col: native_types[col] if col in native_types else self._detect_column_type(df[col], self.sample_rows)
+            for col in df.columns
+        }
+    
+    def detect_date_formats(
+        self,
+        df: pd.DataFrame,
+        detected_types: Dict[str, str],
+        native_types: Optional[Dict[str, str]] = None
+    ) -> Dict[str, str]:
+        """
+        Infer the dominant format of every date/datetime column
+        
+        Uses the same sample as type detection. Columns without a
+        dominant format are left out and parsed value by value.
+        
+        Args:
+            df: DataFrame (or a representative chunk of it)
+            detected_types: Output of detect_types()
+            native_types: Natively typed columns (never parsed)
+        
+        Returns:
+            Dict of column name -> strftime format
+        """
+        native_types = native_types or {}
+        date_formats = {}
+        
+        for col, detected_type in detected_types.items():
+            if detected_type in ['datetime', 'date'] and col not in native_types:
+                date_format = self._infer_date_format(self._detection_sample(df[col], self.sample_rows))
+                if date_format is not None:
+                    date_formats[col] = date_format
+        
+        return date_formats
+    
+    def cast_columns(
+        self,
+        df: pd.DataFrame,
+        detected_types: Dict[str, str],
+        native_types: Optional[Dict[str, str]] = None,
+        date_formats: Optional[Dict[str, str]] = None
+    ) -> Tuple[pd.DataFrame, Dict[str, Dict[str, int]]]:
+        """
+        Cast columns to previously detected types
+        
+        Can be called once on a full DataFrame or repeatedly on chunks;
+        the returned counts are additive across chunks. Natively typed
+        columns are not converted, except integers becoming nullable Int64
+        (UInt64 when unsigned values exceed the Int64 range).
+        
+        Returns:
+            Tuple of (cast DataFrame, per-column {'non_null_count', 'failed_count'})
+        """
+        native_types = native_types or {}
+        date_formats = date_formats or {}
+        cast = {}
+        conversion_counts = {}
         
         for col in df.columns:
             series = df[col]
-            
-            # Detect type
-            detected_type = self._detect_column_type(series)
-            
-            # Cast to appropriate type
-            df[col], conversion_info = self._cast_column(series, detected_type)
+            if col in native_types:
+                cast[col], conversion_info = self._keep_native_column(series, native_types[col])
+            else:
+                cast[col], conversion_info = self._cast_column(series, detected_types[col], date_formats.get(col))
+            conversion_counts[col] = {
+                'non_null_count': conversion_info['non_null_count'],
+                'failed_count': conversion_info['failed_count']
+            }
+        
+        return replace_columns(df, cast), conversion_counts
+    
+    def _type_columns_parallel(
+        self,
+        df: pd.DataFrame,
+        native_types: Dict[str, str]
+    ) -> Tuple[pd.DataFrame, Dict[str, str], Dict[str, str], Dict[str, Dict[str, int]]]:
+        """Detect and cast every column in the executor's process pool"""
+        results = self.executor.map_columns(
+            df,
+            TypeDetectionLayer,
+            '_type_column',
+            {col: (native_types.get(col), self.sample_rows) for col in df.columns}
+        )
+        
+        detected_types = {}
+        date_formats = {}
+        conversion_counts = {}
+        
+        for col, (_, info) in results.items():
+            detected_types[col] = info.pop('detected_type')
+            date_format = info.pop('date_format')
+            if date_format is not None:
+                date_formats[col] = date_format
+            conversion_counts[col] = info
+        
+        df = replace_columns(df, {col: series for col, (series, _) in results.items()})
+        return df, detected_types, date_formats, conversion_counts
+    
+    def _type_column(
+        self,
+        series: pd.Series,
+        native_type: Optional[str],
+        sample_rows: int = 0
+    ) -> Tuple[pd.Series, Dict[str, Any]]:
+        """Detect and cast one column (the unit of work of a pool worker)"""
+        date_format = None
+        
+        if native_type is not None:
+            detected_type = native_type
+            result, conversion_info = self._keep_native_column(series, native_type)
+        else:
+            detected_type = self._detect_column_type(series, sample_rows)
+            if detected_type in ['datetime', 'date']:
+                date_format = self._infer_date_format(self._detection_sample(series, sample_rows))
+            result, conversion_info = self._cast_column(series, detected_type, date_format)
+        
+        return result, {
+            'detected_type': detected_type,
+            'date_format': date_format,
+            'non_null_count': conversion_info['non_null_count'],
+            'failed_count': conversion_info['failed_count']
+        }
+    
+    def build_type_info(
+        self,
+        df: pd.DataFrame,
+        detected_types: Dict[str, str],
+        original_dtypes: Dict[str, str],
+        conversion_counts: Dict[str, Dict[str, int]],
+        native_types: Optional[Dict[str, str]] = None,
+        date_formats: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Assemble the per-column type report"""
+        native_types = native_types or {}
+        date_formats = date_formats or {}
+        type_info = {}
+        
+        for col in df.columns:
+            counts = conversion_counts[col]
             
             type_info[col] = {
-                'detected_type': detected_type,
-                'original_dtype': str(series.dtype),
+                'detected_type': detected_types[col],
+                'original_dtype': original_dtypes[col],
                 'final_dtype': str(df[col].dtype),
-                'conversion_success_rate': conversion_info['success_rate'],
-                'failed_conversions': conversion_info['failed_count'],
-                'sample_values': self._get_sample_values(df[col])
+                'conversion_success_rate': self._success_rate(counts['non_null_count'], counts['failed_count']),
+                'failed_conversions': counts['failed_count'],
+                'sample_values': self._get_sample_values(df[col]),
+                'type_from_source': col in native_types,
+                'date_format': date_formats.get(col)
             }
         
-        result = {
-            'type_info': type_info,
-            'layer': 'typing'
-        }
-        
-        logger.info(f"Layer 4 complete: Types detected and cast")
-        return df, result
+        return type_info
     
-    def _detect_column_type(self, series: pd.Series) -> str:
-        """Detect the most appropriate type for a column"""
+    def _detection_sample(self, series: pd.Series, sample_rows: int = 0) -> pd.Series:
+        """Non-null values used for detection (deterministic, max 1000 or sample_rows)"""
+        sampled = sample_series(series, sample_rows)
+        if sampled is not None:
+            # Sample mode: the non-null values of the sampled rows
+            return sampled.dropna()
+        
         # Remove null values for type detection
         non_null = series.dropna()
         
-        if len(non_null) == 0:
-            return 'string'
-        
         # Sample for performance (max 1000 values)
         sample_size = min(1000, len(non_null))
-        sample = non_null.sample(sample_size, random_state=42) if sample_size < len(non_null) else non_null
+        return non_null.sample(sample_size, random_state=42) if sample_size < len(non_null) else non_null
+    
+    def _detect_column_type(self, series: pd.Series, sample_rows: int = 0) -> str:
+        """Detect the most appropriate type for a column"""
+        sample = self._detection_sample(series, sample_rows)
+        
+        if len(sample) == 0:
+            return 'string'
+        
+        # Sampled columns check formats on the whole sample, not its first values
+        format_sample = sample if 0 < sample_rows < len(series) else sample.head(self.FORMAT_CHECK_VALUES)
         
         # Try type detection in order of specificity
         if self._is_boolean(sample):
             return 'boolean'
         elif self._is_integer(sample):
             return 'integer'
-        elif self._is_currency(sample):
+        elif self._is_currency(format_sample):
             return 'currency'
-        elif self._is_percentage(sample):
+        elif self._is_percentage(format_sample):
             return 'percentage'
         elif self._is_float(sample):
             return 'float'
-        elif self._is_datetime(sample):
+        
+        # Both date checks look at the same parse
+        parsed_dates = self._to_datetimes(sample)
+        if self._is_datetime(sample, parsed_dates):
             return 'datetime'
-        elif self._is_date(sample):
+        elif self._is_date(sample, parsed_dates):
             return 'date'
-        elif self._is_email(sample):
+        elif self._is_email(format_sample):
             return 'email'
-        elif self._is_url(sample):
+        elif self._is_url(format_sample):
             return 'url'
         else:
             return 'string'
@@ -106,15 +367,24 @@ class TypeDetectionLayer:
     def _is_boolean(self, series: pd.Series) -> bool:
         """Check if series contains boolean values"""
         try:
-            unique_values = set(str(v).strip().lower() for v in series.unique() if pd.notna(v))
-            
             boolean_values = {
                 'true', 'false', 't', 'f', 'yes', 'no', 'y', 'n',
                 '1', '0', 'on', 'off', 'enabled', 'disabled'
             }
             
-            # If all unique values are in boolean set
-            return len(unique_values) > 0 and len(unique_values) <= 5 and unique_values.issubset(boolean_values)
+            # All unique values must be in the boolean set (at most 5 of them);
+            # stop at the first one that is not, as most columns fail early
+            unique_values = set()
+            for v in series.unique():
+                if pd.notna(v):
+                    value = str(v).strip().lower()
+                    if value not in boolean_values:
+                        return False
+                    unique_values.add(value)
+                    if len(unique_values) > 5:
+                        return False
+            
+            return len(unique_values) > 0
         except:
             return False
     
@@ -160,7 +430,7 @@ class TypeDetectionLayer:
         """Check if series contains currency values"""
         try:
             # Check if values have currency symbols
-            sample_str = series.astype(str).head(min(10, len(series)))
+            sample_str = series.astype(str)
             has_currency = any(
                 any(symbol in str(val) for symbol in ['$', '€', '£', 'USD', 'EUR', 'GBP'])
                 for val in sample_str
@@ -171,8 +441,8 @@ class TypeDetectionLayer:
             
             # Try parsing as currency
             parsed_count = 0
-            check_count = min(10, len(series))
-            for val in series.head(check_count):
+            check_count = len(series)
+            for val in series:
                 if self._parse_currency(val) is not None:
                     parsed_count += 1
             
@@ -184,18 +454,26 @@ class TypeDetectionLayer:
         """Check if series contains percentage values"""
         try:
             # Check if values have % symbol
-            sample_str = series.astype(str).head(min(10, len(series)))
+            sample_str = series.astype(str)
             has_percent = sum(1 for val in sample_str if '%' in str(val))
             
             return has_percent >= len(sample_str) * 0.5  # At least 50% have %
         except:
             return False
     
-    def _is_datetime(self, series: pd.Series) -> bool:
-        """Check if series contains datetime values"""
+    def _to_datetimes(self, series: pd.Series) -> Optional[pd.Series]:
+        """Lenient datetime parse for the date checks (None if pandas cannot parse the series)"""
+        try:
+            return pd.to_datetime(series, errors='coerce')
+        except:
+            return None
+    
+    def _is_datetime(self, series: pd.Series, dt_series: Optional[pd.Series] = None) -> bool:
+        """Check if series contains datetime values (dt_series: its _to_datetimes parse)"""
         try:
             # Try pandas datetime conversion
-            dt_series = pd.to_datetime(series, errors='coerce')
+            if dt_series is None:
+                dt_series = pd.to_datetime(series, errors='coerce')
             
             # Check if >80% can be converted
             success_rate = (dt_series.notna().sum() / len(series))
@@ -215,11 +493,12 @@ class TypeDetectionLayer:
         except:
             return False
     
-    def _is_date(self, series: pd.Series) -> bool:
-        """Check if series contains date values (no time)"""
+    def _is_date(self, series: pd.Series, dt_series: Optional[pd.Series] = None) -> bool:
+        """Check if series contains date values (no time; dt_series: its _to_datetimes parse)"""
         try:
             # Try pandas datetime conversion
-            dt_series = pd.to_datetime(series, errors='coerce')
+            if dt_series is None:
+                dt_series = pd.to_datetime(series, errors='coerce')
             
             # Check if >80% can be converted
             success_rate = (dt_series.notna().sum() / len(series))
@@ -234,10 +513,9 @@ class TypeDetectionLayer:
         try:
             email_pattern = r'^[\w\.-]+@[\w\.-]+\.\w+$'
             
-            sample = series.head(min(10, len(series)))
-            matches = sum(1 for val in sample if pd.notna(val) and re.match(email_pattern, str(val)))
+            matches = sum(1 for val in series if pd.notna(val) and re.match(email_pattern, str(val)))
             
-            return matches >= len(sample) * 0.8  # At least 80%
+            return matches >= len(series) * 0.8  # At least 80%
         except:
             return False
     
@@ -246,50 +524,102 @@ class TypeDetectionLayer:
         try:
             url_pattern = r'^https?://'
             
-            sample = series.head(min(10, len(series)))
-            matches = sum(1 for val in sample if pd.notna(val) and re.match(url_pattern, str(val)))
+            matches = sum(1 for val in series if pd.notna(val) and re.match(url_pattern, str(val)))
             
-            return matches >= len(sample) * 0.8  # At least 80%
+            return matches >= len(series) * 0.8  # At least 80%
         except:
             return False
     
-    def _cast_column(self, series: pd.Series, detected_type: str) -> Tuple[pd.Series, Dict]:
-        """Cast column to detected type"""
+    def _cast_column(
+        self,
+        series: pd.Series,
+        detected_type: str,
+        date_format: Optional[str] = None
+    ) -> Tuple[pd.Series, Dict]:
+        """Cast column to detected type (date_format: dominant format of a date column)"""
         original_length = len(series)
         original_null_count = series.isna().sum()
         
+        # Low-cardinality string columns are parsed once per distinct value;
+        # boolean parsing is a set lookup, no dearer than factorizing
         if detected_type == 'boolean':
-            result = series.apply(self._parse_boolean)
+            result = self._convert_values(series, detected_type)
+        else:
+            result = map_distinct(
+                series,
+                lambda values: self._convert_values(values, detected_type, date_format)
+            )
+        
+        # Calculate conversion success rate
+        new_null_count = result.isna().sum()
+        failed_count = int(max(0, new_null_count - original_null_count))
+        non_null_original = int(original_length - original_null_count)
+        
+        conversion_info = {
+            'success_rate': self._success_rate(non_null_original, failed_count),
+            'failed_count': failed_count,
+            'non_null_count': non_null_original
+        }
+        
+        return result, conversion_info
+    
+    def _convert_values(
+        self,
+        series: pd.Series,
+        detected_type: str,
+        date_format: Optional[str] = None
+    ) -> pd.Series:
+        """Convert values to the detected type (elementwise, so it can run on distinct values)"""
+        if detected_type == 'boolean':
+            return self._parse_boolean_series(series)
         elif detected_type == 'integer':
-            result = pd.to_numeric(series, errors='coerce').astype('Int64')
-        elif detected_type == 'float':
             result = pd.to_numeric(series, errors='coerce')
+            try:
+                return result.astype('Int64')
+            except (TypeError, ValueError):
+                # Fractional values outside the detection sample - keep as float
+                return result
+        elif detected_type == 'float':
+            return pd.to_numeric(series, errors='coerce')
         elif detected_type == 'currency':
-            result = series.apply(self._parse_currency)
+            return self._parse_currency_series(series)
         elif detected_type == 'percentage':
-            result = series.apply(self._parse_percentage)
+            return self._parse_percentage_series(series)
         elif detected_type in ['datetime', 'date']:
-            result = series.apply(self._parse_date)
+            return self._parse_date_series(series, date_format)
+        elif isinstance(series.dtype, pd.StringDtype):
+            # Already strings (Arrow dtypes mode): only the text 'nan' becomes null, as below
+            return series.mask((series == 'nan').fillna(False))
         else:
-            result = series.astype(str).replace('nan', np.nan)
+            return series.astype(str).replace('nan', np.nan)
+    
+    def _keep_native_column(self, series: pd.Series, native_type: str) -> Tuple[pd.Series, Dict]:
+        """Keep a natively typed column; nothing can fail to convert"""
+        if native_type == 'integer' and series.dtype != 'Int64':
+            # Unsigned values above the Int64 range stay unsigned
+            if series.dtype.kind == 'u' and series.notna().any() and series.max() > np.iinfo(np.int64).max:
+                series = series.astype('UInt64')
+            else:
+                series = series.astype('Int64')
         
-        # Calculate conversion success rate
-        new_null_count = result.isna().sum()
-        failed_count = new_null_count - original_null_count
-        non_null_original = original_length - original_null_count
-        
-        if non_null_original > 0:
-            success_count = non_null_original - failed_count
-            success_rate = (success_count / non_null_original) * 100
-        else:
-            success_rate = 100
+        non_null_count = int(series.notna().sum())
         
         conversion_info = {
-            'success_rate': round(max(0, success_rate), 2),
-            'failed_count': int(max(0, failed_count))
+            'success_rate': 100.0,
+            'failed_count': 0,
+            'non_null_count': non_null_count
         }
         
-        return result, conversion_info
+        return series, conversion_info
+    
+    def _success_rate(self, non_null_count: int, failed_count: int) -> float:
+        """Percentage of non-null values that survived conversion"""
+        if non_null_count > 0:
+            success_rate = ((non_null_count - failed_count) / non_null_count) * 100
+        else:
+            success_rate = 100
+        
+        return round(max(0, success_rate), 2)
     
     def _parse_boolean(self, value: Any) -> Any:
         """Parse boolean value"""
@@ -299,11 +629,11 @@ class TypeDetectionLayer:
         str_val = str(value).strip().lower()
         
         # True values
-        if str_val in ['true', 't', 'yes', 'y', '1', 'on', 'enabled']:
+        if str_val in self.TRUE_VALUES:
             return True
         
         # False values
-        if str_val in ['false', 'f', 'no', 'n', '0', 'off', 'disabled']:
+        if str_val in self.FALSE_VALUES:
             return False
         
         return None
@@ -316,7 +646,7 @@ class TypeDetectionLayer:
         try:
             # Remove currency symbols and commas
             cleaned = str(value)
-            for symbol in ['$', '€', '£', 'USD', 'EUR', 'GBP', ',', ' ']:
+            for symbol in self.CURRENCY_TOKENS:
                 cleaned = cleaned.replace(symbol, '')
             
             cleaned = cleaned.strip()
@@ -349,6 +679,100 @@ class TypeDetectionLayer:
         except:
             return None
     
+    def _parse_boolean_series(self, series: pd.Series) -> pd.Series:
+        """Vectorized series.apply(self._parse_boolean)"""
+        if series.empty or isinstance(series.dtype, pd.CategoricalDtype):
+            # apply() keeps the dtype of empty input and parses categoricals once per category
+            return series.apply(self._parse_boolean)
+        
+        # Python's lower() only yields these ASCII tokens from ASCII input
+        tokens = pc.ascii_lower(pc.utf8_trim(self._as_strings(series), characters=self.WHITESPACE))
+        is_true = pc.is_in(tokens, value_set=pa.array(self.TRUE_VALUES)).to_numpy(zero_copy_only=False)
+        is_false = pc.is_in(tokens, value_set=pa.array(self.FALSE_VALUES)).to_numpy(zero_copy_only=False)
+        
+        values = np.full(len(series), None, dtype=object)
+        values[is_true] = True
+        values[is_false] = False
+        
+        result = pd.Series(values, index=series.index, name=series.name)
+        # apply() infers bool when no value is missing
+        return result.astype(bool) if (is_true | is_false).all() else result
+    
+    def _parse_currency_series(self, series: pd.Series) -> pd.Series:
+        """Vectorized series.apply(self._parse_currency)"""
+        if series.empty or isinstance(series.dtype, pd.CategoricalDtype):
+            # apply() keeps the dtype of empty input and parses categoricals once per category
+            return series.apply(self._parse_currency)
+        
+        cleaned = self._as_strings(series)
+        for symbol in self.CURRENCY_TOKENS:
+            cleaned = pc.replace_substring(cleaned, pattern=symbol, replacement='')
+        cleaned = pc.utf8_trim(cleaned, characters=self.WHITESPACE)
+        
+        values, parsed = self._strings_to_float(cleaned)
+        return self._float_result(series, values, parsed)
+    
+    def _parse_percentage_series(self, series: pd.Series) -> pd.Series:
+        """Vectorized series.apply(self._parse_percentage)"""
+        if series.empty or isinstance(series.dtype, pd.CategoricalDtype):
+            # apply() keeps the dtype of empty input and parses categoricals once per category
+            return series.apply(self._parse_percentage)
+        
+        strings = pc.utf8_trim(self._as_strings(series), characters=self.WHITESPACE)
+        has_percent = pc.match_substring(strings, '%')
+        
+        without_percent = pc.utf8_trim(pc.replace_substring(strings, pattern='%', replacement=''), characters=self.WHITESPACE)
+        values, parsed = self._strings_to_float(pc.if_else(has_percent, without_percent, strings))
+        
+        has_percent = has_percent.to_numpy(zero_copy_only=False).astype(bool)
+        # Values between 0 and 1 are already decimals; NaN compares False and is divided like the scalar path
+        with np.errstate(invalid='ignore'):
+            is_decimal = ~has_percent & (values >= 0) & (values <= 1)
+        values = np.where(is_decimal, values, values / 100.0)
+        
+        return self._float_result(series, values, parsed)
+    
+    def _as_strings(self, series: pd.Series) -> pa.Array:
+        """str() of every non-null value as an Arrow string array; nulls stay null"""
+        try:
+            return pa.array(series, type=pa.string(), from_pandas=True)
+        except (pa.ArrowException, TypeError, ValueError):
+            # Not all strings (numbers, booleans, mixed objects)
+            strings = series.astype(str).astype(object).where(series.notna(), None)
+            return pa.array(strings, type=pa.string(), from_pandas=True)
+    
+    def _strings_to_float(self, strings: pa.Array) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        float() of every string
+        
+        Returns:
+            Tuple of (float64 values with NaN where parsing failed or the
+            string was null, mask of values float() accepted)
+        """
+        is_decimal = pc.fill_null(pc.match_substring_regex(strings, self.DECIMAL_PATTERN), False)
+        values = pc.cast(pc.if_else(is_decimal, strings, pa.scalar(None, pa.string())), pa.float64())
+        values = values.to_numpy(zero_copy_only=False).astype(np.float64)
+        parsed = is_decimal.to_numpy(zero_copy_only=False).astype(bool)
+        
+        # Other spellings float() accepts, and the failures, are rare: parse them one by one
+        others = pc.and_(pc.invert(is_decimal), pc.is_valid(strings)).to_numpy(zero_copy_only=False)
+        for i in np.flatnonzero(others):
+            try:
+                values[i] = float(strings[i].as_py())
+                parsed[i] = True
+            except ValueError:
+                pass
+        
+        return values, parsed
+    
+    def _float_result(self, series: pd.Series, values: np.ndarray, parsed: np.ndarray) -> pd.Series:
+        """Wrap parsed floats in the dtype series.apply() would infer for the scalar parser"""
+        if not parsed.any():
+            # The scalar parser returned None for every value
+            return pd.Series([None] * len(series), index=series.index, name=series.name, dtype=object)
+        
+        return pd.Series(values, index=series.index, name=series.name)
+    
     def _parse_date(self, value: Any) -> Any:
         """Parse date/datetime with multiple formats"""
         if pd.isna(value):
@@ -367,6 +791,67 @@ class TypeDetectionLayer:
         except:
             return pd.NaT
     
+    def _infer_date_format(self, sample: pd.Series) -> Optional[str]:
+        """
+        Dominant format of a sample of date strings
+        
+        Each value counts for the first of DATE_FORMATS that parses it, as
+        in _parse_date(); values none of them parse count for the format
+        pandas guesses from the first such value. The format counted most
+        often wins.
+        
+        Returns:
+            strftime format, or None when no format parses any value
+        """
+        if len(sample) == 0 or not all(isinstance(v, str) for v in sample):
+            return None
+        
+        unmatched = pd.Series(True, index=sample.index)
+        counts = {}
+        
+        for fmt in self.DATE_FORMATS:
+            parsed = pd.to_datetime(sample, format=fmt, errors='coerce').notna()
+            counts[fmt] = int((parsed & unmatched).sum())
+            unmatched &= ~parsed
+        
+        if unmatched.any():
+            guessed = guess_datetime_format(sample[unmatched].iloc[0])
+            if guessed is not None and guessed not in counts:
+                try:
+                    parsed = pd.to_datetime(sample[unmatched], format=guessed, errors='coerce').notna()
+                    counts[guessed] = int(parsed.sum())
+                except ValueError:
+                    pass
+        
+        best = max(counts, key=counts.get)
+        return best if counts[best] > 0 else None
+    
+    def _parse_date_series(self, series: pd.Series, date_format: Optional[str]) -> pd.Series:
+        """
+        Parse a date column with one vectorized cast in its dominant format
+        
+        Only values that do not match the format go through _parse_date().
+        Without a format every value does.
+        """
+        if date_format is None or series.empty:
+            return series.apply(self._parse_date)
+        
+        try:
+            result = pd.to_datetime(series, format=date_format, errors='coerce')
+        except (TypeError, ValueError):
+            # Mixed values to_datetime() refuses even with errors='coerce'
+            return series.apply(self._parse_date)
+        
+        failed = result.isna() & series.notna()
+        if failed.any():
+            fallback = series[failed].apply(self._parse_date)
+            if fallback.dtype != result.dtype:
+                # e.g. time zone aware values; keep apply()'s dtype inference
+                return series.apply(self._parse_date)
+            result[failed] = fallback
+        
+        return result
+    
     def _get_sample_values(self, series: pd.Series, n: int = 5) -> List:
         """Get sample non-null values"""
         non_null = series.dropna()
@@ -4,19 +4,59 @@ Handle missing values, outliers, and duplicates
 """
 import pandas as pd
 import numpy as np
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, List, Optional
 import logging
 
+from .column_profile import ColumnProfiler
+from .layer4_typing import TypeDetectionLayer
+from .memoize import map_distinct
+from .parallel import ColumnExecutor
+from .sampling import sample_positions, sample_series
+
 logger = logging.getLogger(__name__)
 
 
 class DataCleaningLayer:
     """Layer 5: Data cleaning and imputation"""
     
+    # Bump when the layer's output changes, to invalidate its checkpoints
+    VERSION = 3
+    
+    # Detected types imputed from distribution statistics and clipped to the IQR fences
+    NUMERIC_TYPES = ['integer', 'float', 'currency']
+    
+    # Nullable integers are exact as float64 up to this magnitude, so they
+    # can be cleaned in the same float block as the float columns
+    MAX_EXACT_INTEGER = 2**53
+    
+    def __init__(self, executor: Optional[ColumnExecutor] = None, sample_rows: int = 0):
+        """
+        Initialize layer
+        
+        Args:
+            executor: Optional process pool for cleaning wide frames column-parallel
+            sample_rows: Estimate the imputation values and outlier bounds of
+                         longer columns from this many sampled rows (0: all rows)
+        """
+        self.executor = executor
+        self.sample_rows = sample_rows
+        self.profiler = ColumnProfiler()
+    
     def process(self, df: pd.DataFrame, type_info: Dict) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """
         Clean data and handle missing values
         
+        Columns are cleaned in order. Deduplicating on an ID-like column
+        changes the rows every later column is cleaned on, so the columns
+        are processed in segments that end at an ID-like column; columns
+        within a segment are independent of each other. Numeric columns
+        of a segment are cleaned together as one float block (see
+        _clean_numeric), the others column by column.
+        
+        Duplicate IDs are found by hashing each cleaned ID column once;
+        dropped rows only shrink the positions later segments read, and
+        the cleaned frame is assembled once at the end.
+        
         Args:
             df: DataFrame from Layer 4
             type_info: Type information from Layer 4
@@ -27,42 +67,33 @@ class DataCleaningLayer:
         logger.info(f"Layer 5: Cleaning {len(df.columns)} columns")
         
         cleaning_report = {}
+        sampled = 0 < self.sample_rows < len(df)
         
-        for col in df.columns:
-            col_type = type_info[col]['detected_type']
-            
-            # 1. Handle missing values
-            original_nulls = df[col].isna().sum()
-            df[col], imputation_method = self._handle_missing_values(df[col], col_type)
-            final_nulls = df[col].isna().sum()
-            imputed_count = original_nulls - final_nulls
-            
-            # 2. Handle outliers (for numeric columns)
-            if col_type in ['integer', 'float', 'currency']:
-                outliers_count, df[col] = self._handle_outliers(df[col])
+        # Positions of the rows still in the frame, and the cleaned columns
+        # of each segment with the positions they were cleaned on
+        rows = np.arange(len(df))
+        cleaned = []
+        
+        for segment in self._segments(list(df.columns)):
+            if len(rows) < len(df):
+                frame = df.iloc[rows, [df.columns.get_loc(col) for col in segment]]
             else:
-                outliers_count = 0
+                frame = df if len(segment) == len(df.columns) else df[segment]
             
-            # 3. Trim whitespace (for string columns)
-            if col_type == 'string':
-                df[col] = df[col].astype(str).str.strip()
-                df[col] = df[col].replace('nan', np.nan)
+            results = self._clean_segment(frame, {col: type_info[col]['detected_type'] for col in segment})
+            cleaned.append((rows, {col: series for col, (series, _) in results.items()}))
+            for col, (_, report) in results.items():
+                cleaning_report[col] = report
             
             # 4. Check for duplicates in ID-like columns
-            duplicates_removed = 0
-            if self._is_id_column(col):
-                before_count = len(df)
-                df = df.drop_duplicates(subset=[col], keep='first')
-                duplicates_removed = before_count - len(df)
-            
-            cleaning_report[col] = {
-                'original_nulls': int(original_nulls),
-                'imputed_nulls': int(imputed_count),
-                'final_nulls': int(final_nulls),
-                'imputation_method': imputation_method,
-                'outliers_handled': int(outliers_count),
-                'duplicates_removed': int(duplicates_removed)
-            }
+            id_col = segment[-1]
+            if self._is_id_column(id_col):
+                duplicated = results[id_col][0].duplicated(keep='first').to_numpy()
+                cleaning_report[id_col]['duplicates_removed'] = int(duplicated.sum())
+                if duplicated.any():
+                    rows = rows[~duplicated]
+        
+        df = self._assemble(df, rows, cleaned)
         
         result = {
             'cleaning_report': cleaning_report,
@@ -71,71 +102,371 @@ class DataCleaningLayer:
             'layer': 'cleaning'
         }
         
+        if sampled:
+            result['sample_rows'] = self.sample_rows
+        
         logger.info(f"Layer 5 complete: Imputed {result['total_imputed']} values, handled {result['total_outliers']} outliers")
         return df, result
     
-    def _handle_missing_values(self, series: pd.Series, col_type: str) -> Tuple[pd.Series, str]:
-        """Handle missing values based on column type"""
+    def _segments(self, columns: List[str]) -> List[List[str]]:
+        """Split columns after every ID-like column"""
+        segments = [[]]
+        
+        for col in columns:
+            segments[-1].append(col)
+            if self._is_id_column(col):
+                segments.append([])
+        
+        return [segment for segment in segments if segment]
+    
+    def _clean_segment(
+        self,
+        frame: pd.DataFrame,
+        col_types: Dict[str, str]
+    ) -> Dict[str, Tuple[pd.Series, Dict[str, Any]]]:
+        """Clean the columns of one segment; returns column -> (series, report) in column order"""
+        numeric = [
+            col for col, col_type in col_types.items()
+            if col_type in self.NUMERIC_TYPES and self._fits_float_block(frame[col])
+        ]
+        results = self._clean_numeric(frame[numeric]) if numeric else {}
+        
+        others = {col: (col_type, self.sample_rows) for col, col_type in col_types.items() if col not in results}
+        if self.executor is not None and self.executor.should_parallelize(len(frame), len(others)):
+            results.update(self.executor.map_columns(frame, DataCleaningLayer, '_clean_column', others))
+        else:
+            results.update({col: self._clean_column(frame[col], *args) for col, args in others.items()})
+        
+        return {col: results[col] for col in col_types}
+    
+    def _fits_float_block(self, series: pd.Series) -> bool:
+        """Whether a numeric column is float64, or a nullable integer that float64 holds exactly"""
+        if series.dtype == np.float64:
+            return True
+        if not isinstance(series.dtype, pd.Int64Dtype):
+            return False
+        
+        low, high = series.min(), series.max()
+        return pd.isna(low) or (-self.MAX_EXACT_INTEGER < low and high < self.MAX_EXACT_INTEGER)
+    
+    def _clean_numeric(self, frame: pd.DataFrame) -> Dict[str, Tuple[pd.Series, Dict[str, Any]]]:
+        """
+        Impute and clip numeric columns as one (columns x rows) float block
+        
+        Does what _clean_column does for each column, with the statistics
+        of all columns computed in batched calls and the imputation and
+        clipping applied to the whole block at once. Every column is read
+        on the same sampled rows, as sample positions only depend on the
+        row count.
+        
+        Args:
+            frame: float64 and Int64 columns (see _fits_float_block)
+        
+        Returns:
+            Dict of column name -> (cleaned series, report)
+        """
+        values = np.empty((len(frame.columns), len(frame)))
+        for i, col in enumerate(frame.columns):
+            values[i] = frame[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        
+        integer = np.array([isinstance(dtype, pd.Int64Dtype) for dtype in frame.dtypes], dtype=bool)
+        positions = sample_positions(len(frame), self.sample_rows)
+        
+        # 1. Handle missing values
+        missing = np.isnan(values)
+        original_nulls = missing.sum(axis=1)
+        sample = values if positions is None else values[:, positions]
+        fill, methods = self._numeric_fill_values(sample, original_nulls > 0, integer)
+        values = np.where(missing, fill[:, None], values)
+        final_nulls = np.isnan(values).sum(axis=1)
+        
+        # 2. Handle outliers, with quartiles of the imputed sampled rows
+        sample = values if positions is None else values[:, positions]
+        lower, upper = self._outlier_bounds(sample, integer)
+        outliers = ((values < lower[:, None]) | (values > upper[:, None])).sum(axis=1)
+        values = np.clip(values, lower[:, None], upper[:, None])
+        
+        results = {}
+        for i, col in enumerate(frame.columns):
+            imputed_count = int(original_nulls[i] - final_nulls[i])
+            
+            if imputed_count or outliers[i]:
+                column = values[i]
+                if integer[i]:
+                    nulls = np.isnan(column)
+                    column = pd.arrays.IntegerArray(np.where(nulls, 0, column).astype(np.int64), nulls)
+                series = pd.Series(column, index=frame.index, name=col)
+            else:
+                series = frame[col]
+            
+            report = {
+                'original_nulls': int(original_nulls[i]),
+                'imputed_nulls': imputed_count,
+                'final_nulls': int(final_nulls[i]),
+                'imputation_method': methods[i],
+                'outliers_handled': int(outliers[i]),
+                'duplicates_removed': 0
+            }
+            
+            if positions is not None:
+                report['approximate'] = (['imputation_method'] if imputed_count else []) + ['outliers_handled']
+            
+            results[col] = (series, report)
+        
+        return results
+    
+    def _numeric_fill_values(
+        self,
+        sample: np.ndarray,
+        needs_fill: np.ndarray,
+        integer: np.ndarray
+    ) -> Tuple[np.ndarray, List[str]]:
+        """
+        Imputation values of a float block, as _handle_numeric_missing picks them
+        
+        Few distinct values: the mode; otherwise the median of skewed
+        columns (|skew| > 1) and the mean of the others. Counts, distinct
+        values and medians come from one sort of the block; means are
+        summed like ColumnProfiler's. Integer columns take whole numbers.
+        
+        Args:
+            sample: (columns x rows) values, NaN for nulls
+            needs_fill: Columns with nulls to impute
+            integer: Columns of nullable integer dtype
+        
+        Returns:
+            Tuple of (fill value per column, NaN if none; method per column)
+        """
+        fill = np.full(len(sample), np.nan)
+        methods = ['none'] * len(sample)
+        
+        selected = np.flatnonzero(needs_fill)
+        if len(selected) == 0:
+            return fill, methods
+        
+        block = sample[selected]
+        present = ~np.isnan(block)
+        counts = present.sum(axis=1)
+        
+        ordered = np.sort(block, axis=1)
+        distinct = ((ordered[:, 1:] != ordered[:, :-1]) & ~np.isnan(ordered[:, 1:])).sum(axis=1) + (counts > 0)
+        
+        middle = np.maximum(counts - 1, 0)
+        rows = np.arange(len(block))
+        medians = (ordered[rows, middle // 2] + ordered[rows, (middle + 1) // 2]) / 2
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(present, block, 0).sum(axis=1) / counts
+        skewness = pd.DataFrame(block.T).skew().to_numpy()
+        
+        for j, i in enumerate(selected):
+            if counts[j] == 0:
+                continue
+            
+            if distinct[j] < 10:
+                # Few unique values → mode (the smallest of the most frequent)
+                unique, frequency = np.unique(block[j][present[j]], return_counts=True)
+                value, methods[i] = unique[np.argmax(frequency)], 'mode'
+            elif abs(skewness[j]) > 1:
+                # Skewed distribution → median
+                value, methods[i] = medians[j], 'median'
+            else:
+                # Normal distribution → mean
+                value, methods[i] = means[j], 'mean'
+            
+            fill[i] = round(value) if integer[i] and methods[i] != 'mode' else value
+        
+        return fill, methods
+    
+    def _outlier_bounds(self, sample: np.ndarray, integer: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        IQR fences of a float block, as _handle_outliers computes them
+        
+        Columns with fewer than 4 values get infinite fences. Integer
+        columns are clipped to the whole numbers within their fences.
+        
+        Returns:
+            Tuple of (lower, upper) fence per column
+        """
+        quartiles = pd.DataFrame(sample.T).quantile([0.25, 0.75]).to_numpy()
+        iqr = quartiles[1] - quartiles[0]
+        lower = quartiles[0] - 1.5 * iqr
+        upper = quartiles[1] + 1.5 * iqr
+        
+        lower[integer] = np.ceil(lower[integer])
+        upper[integer] = np.floor(upper[integer])
+        
+        few = (~np.isnan(sample)).sum(axis=1) < 4
+        lower[few] = -np.inf
+        upper[few] = np.inf
+        
+        return lower, upper
+    
+    def _assemble(
+        self,
+        df: pd.DataFrame,
+        rows: np.ndarray,
+        cleaned: List[Tuple[np.ndarray, Dict[str, pd.Series]]]
+    ) -> pd.DataFrame:
+        """Build the cleaned frame once, keeping the rows no later deduplication dropped"""
+        data = {}
+        
+        for segment_rows, columns in cleaned:
+            # Rows only ever get dropped, so the remaining ones are found in order
+            keep = np.searchsorted(segment_rows, rows) if len(segment_rows) > len(rows) else None
+            for col, series in columns.items():
+                data[col] = series.array if keep is None else series.array.take(keep)
+        
+        index = df.index if len(rows) == len(df) else df.index[rows]
+        return pd.DataFrame(data, index=index, columns=df.columns)
+    
+    def _clean_column(
+        self,
+        series: pd.Series,
+        col_type: str,
+        sample_rows: int = 0
+    ) -> Tuple[pd.Series, Dict[str, Any]]:
+        """
+        Impute, clip and trim one column (columns that do not fit the float
+        block of _clean_numeric; the unit of work of a pool worker)
+        
+        Columns longer than sample_rows take their imputation value and
+        outlier bounds from a row sample; imputing and clipping still
+        cover every row. The report lists the estimated entries under
+        'approximate'.
+        """
+        sample = sample_series(series, sample_rows)
+        approximate = []
+        
+        # 1. Handle missing values
+        original_nulls = series.isna().sum()
+        series, imputation_method = self._handle_missing_values(series, col_type, sample)
+        final_nulls = series.isna().sum()
+        imputed_count = original_nulls - final_nulls
+        if sample is not None and imputed_count:
+            approximate.append('imputation_method')
+        
+        # 2. Handle outliers (for numeric columns)
+        if col_type in ['integer', 'float', 'currency']:
+            # Quartiles are taken after imputation, from the same sampled rows
+            sample = sample_series(series, sample_rows)
+            outliers_count, series = self._handle_outliers(series, sample=sample)
+            if sample is not None:
+                approximate.append('outliers_handled')
+        else:
+            outliers_count = 0
+        
+        # 3. Trim whitespace (for string columns)
+        if col_type == 'string':
+            series = map_distinct(series, self._trim_strings)
+        
+        report = {
+            'original_nulls': int(original_nulls),
+            'imputed_nulls': int(imputed_count),
+            'final_nulls': int(final_nulls),
+            'imputation_method': imputation_method,
+            'outliers_handled': int(outliers_count),
+            'duplicates_removed': 0
+        }
+        
+        if approximate:
+            report['approximate'] = approximate
+        
+        return series, report
+    
+    def _trim_strings(self, series: pd.Series) -> pd.Series:
+        """Strip surrounding whitespace (elementwise, so it can run on distinct values)"""
+        if isinstance(series.dtype, pd.StringDtype):
+            # Arrow dtypes mode: strip in place, with the characters str.strip() removes
+            stripped = series.str.strip(TypeDetectionLayer.WHITESPACE)
+            return stripped.mask((stripped == 'nan').fillna(False))
+        
+        return series.astype(str).str.strip().replace('nan', np.nan)
+    
+    def _handle_missing_values(
+        self,
+        series: pd.Series,
+        col_type: str,
+        sample: Optional[pd.Series] = None
+    ) -> Tuple[pd.Series, str]:
+        """Handle missing values based on column type (statistics from sample if given)"""
         if series.isna().sum() == 0:
             return series, 'none'
         
+        if sample is None:
+            sample = series
+        
         if col_type in ['integer', 'float', 'currency']:
-            return self._handle_numeric_missing(series)
+            return self._handle_numeric_missing(series, sample)
         elif col_type == 'boolean':
-            return self._handle_boolean_missing(series)
+            return self._handle_boolean_missing(series, sample)
         elif col_type in ['date', 'datetime']:
             return self._handle_date_missing(series)
         else:  # string, email, url
-            return self._handle_categorical_missing(series)
+            return self._handle_categorical_missing(series, sample)
     
-    def _handle_numeric_missing(self, series: pd.Series) -> Tuple[pd.Series, str]:
+    def _handle_numeric_missing(self, series: pd.Series, sample: pd.Series) -> Tuple[pd.Series, str]:
         """Handle missing values in numeric columns"""
-        if len(series.dropna()) == 0:
+        stats = self.profiler.profile_column(sample)
+        if stats['non_null_count'] == 0:
             return series, 'none'
         
         # Strategy based on distribution
-        unique_count = series.nunique()
+        unique_count = stats['unique_count']
         
         if unique_count < 10:
             # Few unique values → mode
-            if not series.mode().empty:
-                series = series.fillna(series.mode()[0])
+            if not sample.mode().empty:
+                series = series.fillna(sample.mode()[0])
                 return series, 'mode'
             else:
                 return series, 'none'
         
         # Check skewness
         try:
-            skewness = series.skew()
+            skewness = sample.skew()
             if abs(skewness) > 1:
                 # Skewed distribution → median
-                series = series.fillna(series.median())
+                series = series.fillna(self._fill_value(series, stats['median']))
                 return series, 'median'
             else:
                 # Normal distribution → mean
-                series = series.fillna(series.mean())
+                series = series.fillna(self._fill_value(series, stats['mean']))
                 return series, 'mean'
         except:
             # Fallback to median
-            series = series.fillna(series.median())
+            series = series.fillna(self._fill_value(series, sample.median()))
             return series, 'median'
     
-    def _handle_boolean_missing(self, series: pd.Series) -> Tuple[pd.Series, str]:
+    def _fill_value(self, series: pd.Series, value: float) -> float:
+        """
+        Imputed value for a numeric column
+        
+        Integer columns (nullable Int64) take the mean or median rounded to
+        the nearest whole number (halves to even): fillna rejects fractional
+        values for them. Before rounding, a fractional mean sent them to the
+        median fallback, which failed again on a fractional median.
+        """
+        if pd.api.types.is_integer_dtype(series.dtype):
+            return round(value)
+        return value
+    
+    def _handle_boolean_missing(self, series: pd.Series, sample: pd.Series) -> Tuple[pd.Series, str]:
         """Handle missing values in boolean columns"""
         # Use most frequent value (mode)
-        if not series.mode().empty:
-            series = series.fillna(series.mode()[0])
+        if not sample.mode().empty:
+            series = series.fillna(sample.mode()[0])
             return series, 'mode'
         else:
             # If no mode, use False as default
             series = series.fillna(False)
             return series, 'default_false'
     
-    def _handle_categorical_missing(self, series: pd.Series) -> Tuple[pd.Series, str]:
+    def _handle_categorical_missing(self, series: pd.Series, sample: pd.Series) -> Tuple[pd.Series, str]:
         """Handle missing values in categorical/string columns"""
         # Use most frequent value
-        if not series.mode().empty:
-            series = series.fillna(series.mode()[0])
+        if not sample.mode().empty:
+            series = series.fillna(sample.mode()[0])
             return series, 'mode'
         else:
             series = series.fillna('Unknown')
@@ -152,19 +483,31 @@ class DataCleaningLayer:
         else:
             return series, 'none'
     
-    def _handle_outliers(self, series: pd.Series, method: str = 'iqr') -> Tuple[int, pd.Series]:
-        """Detect and handle outliers using IQR method"""
+    def _handle_outliers(
+        self,
+        series: pd.Series,
+        method: str = 'iqr',
+        sample: Optional[pd.Series] = None
+    ) -> Tuple[int, pd.Series]:
+        """Detect and handle outliers using IQR method (quartiles from sample if given)"""
         try:
-            if len(series.dropna()) < 4:
+            if sample is None:
+                sample = series
+            
+            if len(sample.dropna()) < 4:
                 return 0, series
             
-            Q1 = series.quantile(0.25)
-            Q3 = series.quantile(0.75)
+            Q1 = sample.quantile(0.25)
+            Q3 = sample.quantile(0.75)
             IQR = Q3 - Q1
             
             lower_bound = Q1 - 1.5 * IQR
             upper_bound = Q3 + 1.5 * IQR
             
+            # Integer columns hold whole numbers only
+            if pd.api.types.is_integer_dtype(series.dtype):
+                lower_bound, upper_bound = np.ceil(lower_bound), np.floor(upper_bound)
+            
             # Count outliers
             outliers_count = ((series < lower_bound) | (series > upper_bound)).sum()
             
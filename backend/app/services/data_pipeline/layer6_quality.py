@@ -4,17 +4,44 @@ Calculate quality metrics and flag issues
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
-import re
+from typing import Dict, Any, List, Optional
 import logging
 
+from .column_profile import ColumnProfiler
+from .parallel import ColumnExecutor
+
 logger = logging.getLogger(__name__)
 
 
 class DataQualityLayer:
     """Layer 6: Data quality assessment"""
     
-    def process(self, df: pd.DataFrame, type_info: Dict, cleaning_report: Dict) -> Dict[str, Any]:
+    # Quality metric derived from each column statistic, to flag metrics
+    # computed from approximate statistics (sketch or sample mode)
+    STAT_METRICS = {
+        'null_count': 'completeness',
+        'unique_count': 'uniqueness',
+        'pattern_matches': 'consistency',
+        'finite_count': 'validity',
+        'bool_count': 'validity'
+    }
+    
+    def __init__(self, executor: Optional[ColumnExecutor] = None):
+        """
+        Initialize layer
+        
+        Args:
+            executor: Optional process pool for scoring wide frames column-parallel
+        """
+        self.executor = executor
+    
+    def process(
+        self,
+        df: pd.DataFrame,
+        type_info: Dict,
+        cleaning_report: Dict,
+        profile: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
         """
         Assess data quality
         
@@ -22,12 +49,18 @@ class DataQualityLayer:
             df: DataFrame from Layer 5
             type_info: Type information from Layer 4
             cleaning_report: Cleaning report from Layer 5
+            profile: Column profile of df (computed here if not given)
         
         Returns:
             Quality report dict
         """
         logger.info(f"Layer 6: Assessing quality for {len(df.columns)} columns")
         
+        if profile is None:
+            profile = ColumnProfiler(self.executor).profile(df, type_info)
+        
+        missing_cells = sum(profile[col]['null_count'] for col in df.columns)
+        
         quality_report = {
             'overall_score': 0,
             'columns': {},
@@ -35,20 +68,16 @@ class DataQualityLayer:
                 'total_rows': len(df),
                 'total_columns': len(df.columns),
                 'total_cells': len(df) * len(df.columns),
-                'missing_cells': int(df.isna().sum().sum()),
-                'complete_cells': int(df.notna().sum().sum())
+                'missing_cells': missing_cells,
+                'complete_cells': len(df) * len(df.columns) - missing_cells
             }
         }
         
         column_scores = []
+        approximate_columns = 0
         
         for col in df.columns:
-            metrics = self._calculate_column_quality(
-                df[col],
-                type_info.get(col, {}),
-                cleaning_report.get(col, {})
-            )
-            
+            metrics = self._calculate_column_quality(profile[col], type_info.get(col, {}), cleaning_report.get(col, {}))
             quality_report['columns'][col] = {
                 'completeness': metrics['completeness'],
                 'uniqueness': metrics['uniqueness'],
@@ -59,6 +88,10 @@ class DataQualityLayer:
                 'issues': metrics['issues']
             }
             
+            if 'approximate' in metrics:
+                quality_report['columns'][col]['approximate'] = metrics['approximate']
+                approximate_columns += 1
+            
             column_scores.append(metrics['score'])
         
         # Overall dataset quality
@@ -72,6 +105,11 @@ class DataQualityLayer:
             completeness_pct = (quality_report['dataset_stats']['complete_cells'] / total_cells) * 100
             quality_report['dataset_stats']['completeness_percent'] = round(completeness_pct, 2)
         
+        if any('null_count' in profile[col].get('approximate', []) for col in df.columns):
+            quality_report['dataset_stats']['approximate'] = ['missing_cells', 'complete_cells', 'completeness_percent']
+        if approximate_columns:
+            quality_report['approximate'] = ['overall_score']
+        
         result = {
             'quality_report': quality_report,
             'layer': 'quality'
@@ -80,15 +118,15 @@ class DataQualityLayer:
         logger.info(f"Layer 6 complete: Overall quality score {quality_report['overall_score']}")
         return result
     
-    def _calculate_column_quality(self, series: pd.Series, type_info: Dict, cleaning_info: Dict) -> Dict:
-        """Calculate quality metrics for a single column"""
+    def _calculate_column_quality(self, stats: Dict[str, Any], type_info: Dict, cleaning_info: Dict) -> Dict:
+        """Calculate quality metrics for a single column from its profile"""
         metrics = {}
         issues = []
         
-        total_rows = len(series)
+        total_rows = stats['rows']
         
         # 1. Completeness (% non-null)
-        non_null_count = series.notna().sum()
+        non_null_count = stats['non_null_count']
         completeness = (non_null_count / total_rows * 100) if total_rows > 0 else 0
         metrics['completeness'] = round(completeness, 2)
         
@@ -99,7 +137,7 @@ class DataQualityLayer:
         
         # 2. Uniqueness (% unique values)
         if non_null_count > 0:
-            unique_count = series.nunique()
+            unique_count = stats['unique_count']
             uniqueness = (unique_count / non_null_count * 100)
             metrics['uniqueness'] = round(uniqueness, 2)
         else:
@@ -107,14 +145,14 @@ class DataQualityLayer:
         
         # 3. Consistency (pattern matching for specific types)
         detected_type = type_info.get('detected_type', 'string')
-        consistency = self._check_consistency(series, detected_type)
+        consistency = self._check_consistency(stats, detected_type)
         metrics['consistency'] = consistency
         
         if consistency < 80:
             issues.append(f"Low consistency: {consistency:.1f}%")
         
         # 4. Validity (type-specific checks)
-        validity = self._check_validity(series, detected_type)
+        validity = self._check_validity(stats, detected_type)
         metrics['validity'] = validity
         
         if validity < 90:
@@ -142,49 +180,48 @@ class DataQualityLayer:
         metrics['level'] = self._get_quality_level(score)
         metrics['issues'] = issues
         
+        # Metrics from sketched or sampled statistics (see ColumnProfiler)
+        approximate = []
+        for key in stats.get('approximate', []):
+            metric = self.STAT_METRICS.get(key)
+            if metric is not None and metric not in approximate:
+                approximate.append(metric)
+        if approximate:
+            metrics['approximate'] = approximate + ['quality_score']
+        
         return metrics
     
-    def _check_consistency(self, series: pd.Series, detected_type: str) -> float:
+    def _check_consistency(self, stats: Dict[str, Any], detected_type: str) -> float:
         """Check consistency based on data type"""
-        non_null = series.dropna()
+        non_null_count = stats['non_null_count']
         
-        if len(non_null) == 0:
+        if non_null_count == 0:
             return 100
         
-        if detected_type == 'email':
-            email_pattern = r'^[\w\.-]+@[\w\.-]+\.\w+$'
-            valid_count = sum(1 for val in non_null if re.match(email_pattern, str(val)))
-            return (valid_count / len(non_null) * 100)
-        
-        elif detected_type == 'url':
-            url_pattern = r'^https?://'
-            valid_count = sum(1 for val in non_null if re.match(url_pattern, str(val)))
-            return (valid_count / len(non_null) * 100)
+        if detected_type in ['email', 'url']:
+            # Values matching the type's format (see ColumnProfiler)
+            return (stats['pattern_matches'] / non_null_count * 100)
         
         else:
             # For other types, assume consistent if successfully typed
             return 100
     
-    def _check_validity(self, series: pd.Series, detected_type: str) -> float:
+    def _check_validity(self, stats: Dict[str, Any], detected_type: str) -> float:
         """Check validity based on data type"""
-        non_null = series.dropna()
+        non_null_count = stats['non_null_count']
         
-        if len(non_null) == 0:
+        if non_null_count == 0:
             return 100
         
         if detected_type in ['integer', 'float', 'currency']:
-            # Check for unrealistic values (e.g., negative ages, extreme outliers)
-            try:
-                # Count finite values (not inf, not nan)
-                valid_count = np.isfinite(non_null).sum()
-                return (valid_count / len(non_null) * 100)
-            except:
+            # Count finite values (not inf, not nan); non-numeric columns have no count
+            if 'finite_count' not in stats:
                 return 100
+            return (stats['finite_count'] / non_null_count * 100)
         
         elif detected_type == 'boolean':
             # Check if all values are actually boolean
-            valid_count = sum(1 for val in non_null if isinstance(val, (bool, np.bool_)))
-            return (valid_count / len(non_null) * 100)
+            return (stats['bool_count'] / non_null_count * 100)
         
         else:
             return 100
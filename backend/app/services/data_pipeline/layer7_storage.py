@@ -2,21 +2,73 @@
 Layer 7: Optimized Storage & Indexing
 Store cleaned data efficiently
 """
+import json
+import os
+import time
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import logging
 
+from .column_profile import ColumnProfiler
+
 logger = logging.getLogger(__name__)
 
+# Integer dtypes (NumPy, nullable) tried from narrowest to widest when downcasting
+SIGNED_INTS = [(np.int8, pd.Int8Dtype()), (np.int16, pd.Int16Dtype()), (np.int32, pd.Int32Dtype())]
+UNSIGNED_INTS = [(np.uint8, pd.UInt8Dtype()), (np.uint16, pd.UInt16Dtype()), (np.uint32, pd.UInt32Dtype())]
+
+# Parquet schema metadata key of the cleaned dtypes of downcast columns
+DOWNCAST_METADATA_KEY = b'insightiq.downcast'
+
 
 class StorageLayer:
     """Layer 7: Optimized storage and indexing"""
     
-    def __init__(self, storage_path: Path):
+    # Numeric column statistics kept in the storage report
+    NUMERIC_STATS = ['min', 'max', 'mean', 'median']
+    
+    # Columns with at most this share of distinct values are dictionary-encoded
+    DICTIONARY_MAX_UNIQUE_RATIO = 0.2
+    
+    def __init__(
+        self,
+        storage_path: Path,
+        compression: str = 'snappy',
+        compression_level: Optional[int] = None,
+        row_group_rows: int = 131_072,
+        downcast: bool = False,
+        measure_read: bool = False
+    ):
+        """
+        Initialize layer
+        
+        Args:
+            storage_path: Base path for storing processed data
+            compression: Parquet codec ('snappy', 'zstd', 'lz4', 'gzip' or 'none')
+            compression_level: Codec level for zstd/gzip (None: codec default)
+            row_group_rows: Rows per Parquet row group
+            downcast: Store numeric columns in the narrowest dtype that
+                      holds every value exactly (read() widens them back)
+            measure_read: Time a cold read of the written file
+        """
         self.storage_path = storage_path
+        self.compression = compression
+        self.compression_level = compression_level
+        self.row_group_rows = row_group_rows
+        self.downcast = downcast
+        self.measure_read = measure_read
     
-    def process(self, df: pd.DataFrame, source_id: str, metadata: Dict) -> Dict[str, Any]:
+    def process(
+        self,
+        df: pd.DataFrame,
+        source_id: str,
+        metadata: Dict,
+        profile: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
         """
         Store cleaned data efficiently
         
@@ -24,6 +76,7 @@ class StorageLayer:
             df: Cleaned DataFrame from Layer 5
             source_id: Unique identifier for this data source
             metadata: Combined metadata from all previous layers
+            profile: Column profile of df (computed here if not given)
         
         Returns:
             Storage metadata dict
@@ -36,49 +89,59 @@ class StorageLayer:
         clean_dir.mkdir(parents=True, exist_ok=True)
         preview_dir.mkdir(parents=True, exist_ok=True)
         
+        if profile is None:
+            profile = ColumnProfiler().profile(df)
+        
         # 2. Convert to Parquet (columnar format, compressed)
+        downcasts = self._downcast_dtypes(df, profile) if self.downcast else {}
+        if downcasts:
+            stored = df.copy(deep=False)
+            for col, dtype in downcasts.items():
+                stored[col] = df[col].astype(dtype)
+        else:
+            stored = df
+        
+        table = pa.Table.from_pandas(stored, preserve_index=False)
+        del stored
+        if downcasts:
+            # Readers widen downcast columns back to their cleaned dtypes
+            original = json.dumps({str(col): str(df[col].dtype) for col in downcasts})
+            table = table.replace_schema_metadata({**table.schema.metadata, DOWNCAST_METADATA_KEY: original})
+        dictionary_columns = self._dictionary_columns(df, profile)
+        statistics_columns = self._statistics_columns(df, dictionary_columns)
+        
         parquet_path = clean_dir / f"{source_id}_clean.parquet"
-        df.to_parquet(
-            parquet_path,
-            engine='pyarrow',
-            compression='snappy',
-            index=False
-        )
+        self._write(table, parquet_path, dictionary_columns, statistics_columns)
         
         # Get file size
         parquet_size = parquet_path.stat().st_size
+        row_groups = pq.ParquetFile(parquet_path).num_row_groups
         
         # 3. Create preview sample (first 1000 rows)
         preview_rows = min(1000, len(df))
         preview_path = preview_dir / f"{source_id}_preview.parquet"
-        df.head(preview_rows).to_parquet(
-            preview_path,
-            engine='pyarrow',
-            compression='snappy',
-            index=False
-        )
+        self._write(table.slice(0, preview_rows), preview_path, dictionary_columns, statistics_columns)
         
         preview_size = preview_path.stat().st_size
+        del table
         
         # 4. Store column statistics
         column_stats = {}
         for col in df.columns:
+            stats = profile[col]
             col_stats = {
-                'dtype': str(df[col].dtype),
-                'non_null_count': int(df[col].notna().sum()),
-                'null_count': int(df[col].isna().sum()),
-                'unique_count': int(df[col].nunique())
+                'dtype': stats['dtype'],
+                'non_null_count': stats['non_null_count'],
+                'null_count': stats['null_count'],
+                'unique_count': stats['unique_count']
             }
             
             # Add numeric statistics
-            if pd.api.types.is_numeric_dtype(df[col]):
-                try:
-                    col_stats['min'] = float(df[col].min())
-                    col_stats['max'] = float(df[col].max())
-                    col_stats['mean'] = float(df[col].mean())
-                    col_stats['median'] = float(df[col].median())
-                except:
-                    pass
+            col_stats.update({key: stats[key] for key in self.NUMERIC_STATS if key in stats})
+            
+            # Statistics estimated from sketches
+            if 'approximate' in stats:
+                col_stats['approximate'] = stats['approximate']
             
             column_stats[col] = col_stats
         
@@ -89,8 +152,18 @@ class StorageLayer:
                 'preview_path': str(preview_path),
                 'preview_size_bytes': preview_size,
                 'preview_rows': preview_rows,
-                'compression': 'snappy',
-                'format': 'parquet'
+                'compression': self.compression,
+                'compression_level': self.compression_level,
+                'format': 'parquet',
+                'row_group_rows': self.row_group_rows,
+                'row_groups': row_groups,
+                'page_index': True,
+                'dictionary_columns': dictionary_columns,
+                'statistics_columns': len(statistics_columns),
+                'downcast_columns': {
+                    col: {'from': str(df[col].dtype), 'to': str(pd.api.types.pandas_dtype(dtype))}
+                    for col, dtype in downcasts.items()
+                }
             },
             'column_stats': column_stats,
             'layer': 'storage'
@@ -101,5 +174,155 @@ class StorageLayer:
             compression_ratio = (1 - parquet_size / metadata['file_size']) * 100
             result['storage']['compression_ratio_percent'] = round(compression_ratio, 2)
         
+        if self.measure_read:
+            result['storage'].update(self._read_timing(parquet_path))
+        
         logger.info(f"Layer 7 complete: Stored {parquet_size:,} bytes (compression: {compression_ratio:.1f}%)")
         return result
+    
+    @staticmethod
+    def read(path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Read a stored Parquet file (clean or preview) into pandas
+        
+        Columns stored in a narrower dtype (see _downcast_dtypes) come back
+        in the dtype they were cleaned with, so arithmetic on them cannot
+        overflow (Int8 100 * 2) or lose float64 precision.
+        
+        Args:
+            path: Parquet file written by process()
+            columns: Only read these columns (None: all)
+        
+        Returns:
+            DataFrame with the cleaned dtypes
+        """
+        table = pq.read_table(path, columns=columns)
+        df = table.to_pandas()
+        
+        metadata = table.schema.metadata or {}
+        if DOWNCAST_METADATA_KEY in metadata:
+            for col, dtype in json.loads(metadata[DOWNCAST_METADATA_KEY]).items():
+                if col in df.columns:
+                    df[col] = df[col].astype(dtype)
+        
+        return df
+    
+    def _write(
+        self,
+        table: pa.Table,
+        path: Path,
+        dictionary_columns: List[str],
+        statistics_columns: List[str]
+    ) -> None:
+        """Write a Parquet file with the configured layout"""
+        compression = None if self.compression == 'none' else self.compression
+        pq.write_table(
+            table,
+            path,
+            compression=compression,
+            compression_level=self.compression_level if compression else None,
+            row_group_size=max(self.row_group_rows, 1),
+            use_dictionary=dictionary_columns,
+            write_statistics=statistics_columns,
+            write_page_index=True
+        )
+    
+    def _downcast_dtypes(self, df: pd.DataFrame, profile: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Narrowest dtype holding every value of each numeric column exactly
+        
+        Integer columns are narrowed by their profiled range (nullable ones
+        stay nullable), float64 columns become float32 only when every value
+        converts back unchanged. Booleans and dates are stored as they are.
+        A range estimated from a row sample (sample mode) can miss the
+        extremes, and a value outside the chosen dtype would wrap around,
+        so approximate bounds are replaced by the column's exact min/max.
+        
+        Returns:
+            Dict of column name -> new dtype, for the columns that change
+        """
+        downcasts = {}
+        for col in df.columns:
+            series = df[col]
+            dtype = series.dtype
+            stats = profile.get(col, {})
+            
+            if pd.api.types.is_bool_dtype(dtype) or not pd.api.types.is_numeric_dtype(dtype):
+                continue
+            
+            if pd.api.types.is_integer_dtype(dtype):
+                low, high = stats.get('min'), stats.get('max')
+                if {'min', 'max'} & set(stats.get('approximate', [])):
+                    low, high = series.min(), series.max()
+                if low is None or high is None or pd.isna(low) or pd.isna(high) or not (np.isfinite(low) and np.isfinite(high)):
+                    continue
+                
+                candidates = UNSIGNED_INTS if dtype.kind == 'u' else SIGNED_INTS
+                for numpy_dtype, nullable_dtype in candidates:
+                    if np.dtype(numpy_dtype).itemsize >= dtype.itemsize:
+                        break
+                    info = np.iinfo(numpy_dtype)
+                    if info.min <= low and high <= info.max:
+                        # Nullable integers keep their mask
+                        downcasts[col] = numpy_dtype if isinstance(dtype, np.dtype) else nullable_dtype
+                        break
+            
+            elif dtype == np.float64:
+                values = series.to_numpy()
+                narrowed = values.astype(np.float32)
+                if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+                    downcasts[col] = np.float32
+        
+        return downcasts
+    
+    def _dictionary_columns(self, df: pd.DataFrame, profile: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Low-cardinality (categorical) columns, worth a dictionary page"""
+        columns = []
+        for col in df.columns:
+            stats = profile.get(col, {})
+            non_null = stats.get('non_null_count', 0)
+            if non_null and stats.get('unique_count', non_null) <= self.DICTIONARY_MAX_UNIQUE_RATIO * non_null:
+                columns.append(str(col))
+        return columns
+    
+    def _statistics_columns(self, df: pd.DataFrame, dictionary_columns: List[str]) -> List[str]:
+        """
+        Columns whose min/max statistics can prune reads
+        
+        Free-text columns (high-cardinality strings) are left out: their
+        min/max rarely excludes a row group and bloats the footer.
+        """
+        columns = []
+        for col in df.columns:
+            dtype = df[col].dtype
+            textual = dtype == object or isinstance(dtype, pd.StringDtype)
+            if not textual or str(col) in dictionary_columns:
+                columns.append(str(col))
+        return columns
+    
+    @staticmethod
+    def _read_timing(path: Path) -> Dict[str, Any]:
+        """
+        Time reading a Parquet file into pandas, as queries do
+        
+        The file is flushed and dropped from the page cache first where
+        the OS allows it (posix_fadvise), so the read is cold.
+        
+        Returns:
+            Dict with read_seconds and read_cold
+        """
+        cold = False
+        if hasattr(os, 'posix_fadvise'):
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+                cold = True
+            except OSError as e:
+                logger.debug(f"Could not drop {path} from the page cache: {str(e)}")
+            finally:
+                os.close(fd)
+        
+        start = time.perf_counter()
+        StorageLayer.read(path)
+        return {'read_seconds': round(time.perf_counter() - start, 4), 'read_cold': cold}
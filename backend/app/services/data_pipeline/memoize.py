@@ -0,0 +1,97 @@
+"""
+Distinct-Value Memoization
+Runs elementwise column conversions once per distinct value
+"""
+import pandas as pd
+import numpy as np
+from typing import Callable, Optional, Tuple
+
+# Shorter columns are converted directly; factorizing would not pay off
+MIN_ROWS = 10_000
+
+# Columns with more distinct values than this share of rows are converted directly
+MAX_DISTINCT_RATIO = 0.5
+
+# Rows probed (evenly spaced) to skip factorizing near-unique columns
+PROBE_ROWS = 1000
+
+
+def map_distinct(
+    series: pd.Series,
+    convert: Callable[[pd.Series], pd.Series],
+    min_rows: int = MIN_ROWS,
+    max_distinct_ratio: float = MAX_DISTINCT_RATIO
+) -> pd.Series:
+    """
+    Convert a string column by converting its distinct values only
+    
+    The column is factorized, convert() runs on the distinct values (plus
+    its null value, if any) and the results are mapped back through the
+    codes, so the cost scales with cardinality instead of row count.
+    convert() must be elementwise: each output value may depend only on
+    its input value. The set of input values is unchanged, so the result
+    dtype is the same as convert(series) would produce.
+    
+    Short, high-cardinality and non-string columns are converted directly.
+    Arrow-backed string columns are factorized too; their distinct values
+    keep the column's dtype.
+    
+    Args:
+        series: Column to convert
+        convert: Elementwise conversion
+        min_rows: Convert shorter columns directly
+        max_distinct_ratio: Convert directly above this share of distinct values
+    
+    Returns:
+        Converted Series with the index and name of the input
+    """
+    distinct = _factorize(series, min_rows, max_distinct_ratio)
+    if distinct is None:
+        return convert(series)
+    
+    codes, values = distinct
+    result = convert(values).take(codes)
+    result.index = series.index
+    result.name = series.name
+    return result
+
+
+def _factorize(
+    series: pd.Series,
+    min_rows: int,
+    max_distinct_ratio: float
+) -> Optional[Tuple[np.ndarray, pd.Series]]:
+    """
+    Codes and distinct values of a string column
+    
+    Returns:
+        Tuple of (codes, distinct values with the column's null value
+        last), or None when the column should be converted directly
+    """
+    is_string_dtype = isinstance(series.dtype, pd.StringDtype)
+    if (series.dtype != object and not is_string_dtype) or len(series) < min_rows:
+        return None
+    
+    probe = series.iloc[::max(1, len(series) // PROBE_ROWS)].dropna()
+    if len(probe) > 0 and probe.nunique() > len(probe) * 0.9:
+        return None
+    
+    # Only plain strings: factorize would merge 1, 1.0 and True, whose str() differ
+    if not is_string_dtype and pd.api.types.infer_dtype(series, skipna=True) != 'string':
+        return None
+    
+    codes, uniques = pd.factorize(series)
+    if len(uniques) > len(series) * max_distinct_ratio:
+        return None
+    
+    values = list(uniques)
+    null_mask = codes == -1
+    if null_mask.any():
+        nulls = series.values[null_mask]
+        # None and NaN convert differently (str(None) is 'None'); keep the one null kind
+        if len(set(map(type, nulls))) > 1:
+            return None
+        values.append(nulls[0])
+        codes = np.where(null_mask, len(uniques), codes)
+    
+    return codes, pd.Series(values, dtype=series.dtype if is_string_dtype else object)
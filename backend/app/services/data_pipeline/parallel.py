@@ -0,0 +1,311 @@
+"""
+Column-Parallel Execution
+Runs the per-column work of Layers 4-6 in a process pool over Arrow shared memory
+"""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+# Arrow types an object column may round-trip through without changing its values
+OBJECT_SAFE_TYPES = (pa.string(), pa.large_string(), pa.int64(), pa.bool_(), pa.null())
+
+# Null markers an object column may hold; a column mixing them is pickled instead
+OBJECT_NULLS = {type(None): None, float: np.nan}
+
+# Layer instances of the current worker process, created on first use
+_worker_layers: Dict[type, Any] = {}
+
+
+class ColumnExecutor:
+    """
+    Process pool for per-column layer work
+    
+    The input columns are written once as an Arrow IPC stream into a shared
+    memory block that every worker maps without copying or pickling; result
+    columns come back the same way. Only the per-column reports (small
+    dicts) are pickled. Results are merged in column order, so the output
+    does not depend on which worker finishes first.
+    """
+    
+    def __init__(self, max_workers: int, min_columns: int = 32, tasks_per_worker: int = 4):
+        """
+        Initialize executor (the pool itself is created on first use)
+        
+        Args:
+            max_workers: Worker processes
+            min_columns: Narrower frames run in-process, where the pool
+                         overhead would outweigh the gain
+            tasks_per_worker: Column groups per worker, to even out
+                              columns of unequal cost
+        """
+        self.max_workers = max_workers
+        self.min_columns = min_columns
+        self.tasks_per_worker = tasks_per_worker
+        self._pool: Optional[ProcessPoolExecutor] = None
+    
+    def should_parallelize(self, rows: int, columns: int) -> bool:
+        """Whether a frame of this shape is worth sending to the pool"""
+        return self.max_workers > 1 and rows > 0 and columns >= self.min_columns
+    
+    def map_columns(
+        self,
+        df: pd.DataFrame,
+        layer_class: type,
+        method: str,
+        column_args: Dict[str, tuple]
+    ) -> Dict[str, Tuple[Optional[pd.Series], Any]]:
+        """
+        Run layer_class().method(series, *args) for each column in the pool
+        
+        The method must return (result series or None, info). Result
+        series keep the length of their input and are given df's index.
+        
+        Args:
+            df: DataFrame holding the columns
+            layer_class: Layer class (instantiated without arguments in the workers)
+            method: Name of the per-column method
+            column_args: Column name -> extra positional arguments, in the
+                         order results should be merged
+        
+        Returns:
+            Dict of column name -> (result series or None, info), in column_args order
+        """
+        columns = list(column_args)
+        block, specs, leftovers = _write_block({col: df[col] for col in columns})
+        
+        try:
+            futures = []
+            for group in self._split(columns):
+                tasks = [(col, leftovers.get(col), column_args[col]) for col in group]
+                futures.append(self._get_pool().submit(
+                    _run_column_task, block, specs, layer_class, method, tasks
+                ))
+            
+            results = {}
+            for future in futures:
+                out_block, out_specs, out_leftovers, infos = future.result()
+                series_by_col = _read_block(out_block, out_specs, unlink=True) if out_block else {}
+                series_by_col.update(out_leftovers)
+                
+                for col, info in infos.items():
+                    series = series_by_col.get(col)
+                    if series is not None:
+                        series.index = df.index
+                        series.name = col
+                    results[col] = (series, info)
+        finally:
+            if block is not None:
+                _unlink_block(block[0])
+        
+        return {col: results[col] for col in columns}
+    
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+    
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Create the pool on first use (spawned, since the caller may run threads)"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._pool
+    
+    def _split(self, columns: List[str]) -> List[List[str]]:
+        """Split columns into contiguous, near-equal groups"""
+        group_count = min(len(columns), self.max_workers * self.tasks_per_worker)
+        return [list(group) for group in np.array_split(np.array(columns, dtype=object), group_count)]
+
+
+def _run_column_task(
+    block: Optional[Tuple[str, int]],
+    specs: Dict[str, Any],
+    layer_class: type,
+    method: str,
+    tasks: List[Tuple[str, Optional[pd.Series], tuple]]
+) -> Tuple[Optional[Tuple[str, int]], Dict[str, Any], Dict[str, pd.Series], Dict[str, Any]]:
+    """
+    Worker: run a layer method on a group of columns
+    
+    Returns:
+        Tuple of (result block, result column specs, results that are
+        not Arrow-safe, per-column info)
+    """
+    layer = _worker_layers.get(layer_class)
+    if layer is None:
+        layer = _worker_layers[layer_class] = layer_class()
+    
+    shared_columns = [col for col, series, _ in tasks if series is None]
+    inputs = _read_block(block, specs, columns=shared_columns) if shared_columns else {}
+    
+    results = {}
+    infos = {}
+    for col, series, args in tasks:
+        series = inputs.pop(col) if series is None else series
+        result, infos[col] = getattr(layer, method)(series, *args)
+        if result is not None:
+            results[col] = result.reset_index(drop=True)
+    
+    out_block, out_specs, out_leftovers = _write_block(results)
+    return out_block, out_specs, out_leftovers, infos
+
+
+def _write_block(
+    columns: Dict[str, pd.Series]
+) -> Tuple[Optional[Tuple[str, int]], Dict[str, Any], Dict[str, pd.Series]]:
+    """
+    Write columns into a new shared memory block as one Arrow IPC stream
+    
+    Columns Arrow cannot hold without changing their values (mixed-type
+    object columns, for example) are returned separately to be pickled.
+    
+    Returns:
+        Tuple of ((block name, size) or None, (pandas dtype, null marker)
+        of each shared column, leftover columns)
+    """
+    arrays = {}
+    specs = {}
+    leftovers = {}
+    
+    for col, series in columns.items():
+        try:
+            array = pa.array(series, from_pandas=True)
+        except (pa.ArrowException, TypeError, ValueError, OverflowError):
+            leftovers[col] = series
+            continue
+        
+        null_value = None
+        if series.dtype == object:
+            null_types = set(map(type, series[series.isna()].values))
+            if array.type not in OBJECT_SAFE_TYPES or len(null_types) > 1 or not null_types <= set(OBJECT_NULLS):
+                leftovers[col] = series
+                continue
+            null_value = OBJECT_NULLS[null_types.pop()] if null_types else None
+        
+        arrays[col] = array
+        specs[col] = (series.dtype, null_value)
+    
+    if not arrays:
+        return None, specs, leftovers
+    
+    table = pa.Table.from_arrays(list(arrays.values()), names=list(arrays.keys()))
+    
+    sink = pa.MockOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    size = sink.size()
+    
+    if not _has_shared_memory(size):
+        # /dev/shm is small in many containers; writing past it would crash
+        logger.warning(f"Not enough shared memory for {size:,} bytes, pickling columns instead")
+        leftovers.update({col: columns[col] for col in arrays})
+        return None, {}, leftovers
+    
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        _write_ipc(shm.buf, table)
+    except Exception:
+        shm.close()
+        shm.unlink()
+        raise
+    
+    shm.close()
+    return (shm.name, size), specs, leftovers
+
+
+def _write_ipc(memory: memoryview, table: pa.Table) -> None:
+    """Write a table into memory; Arrow's references to it end with this call"""
+    with pa.ipc.new_stream(pa.FixedSizeBufferWriter(pa.py_buffer(memory)), table.schema) as writer:
+        writer.write_table(table)
+
+
+def _read_block(
+    block: Tuple[str, int],
+    specs: Dict[str, Any],
+    columns: Optional[List[str]] = None,
+    unlink: bool = False
+) -> Dict[str, pd.Series]:
+    """
+    Read columns back from a shared memory block as pandas Series
+    
+    The Series own their data, so the block can be released right away.
+    
+    Args:
+        block: (block name, size) from _write_block
+        specs: (pandas dtype, null marker) of each column, restored on the way out
+        columns: Columns to read (default: all)
+        unlink: Remove the block after reading
+    """
+    name, size = block
+    shm = shared_memory.SharedMemory(name=name)
+    
+    try:
+        table = pa.ipc.open_stream(pa.py_buffer(shm.buf[:size])).read_all()
+        if columns is not None:
+            table = table.select(columns)
+        
+        series_by_col = {col: _to_pandas(table.column(col), specs[col]) for col in table.column_names}
+        del table
+    finally:
+        shm.close()
+        if unlink:
+            shm.unlink()
+    
+    return series_by_col
+
+
+def _to_pandas(column: pa.ChunkedArray, spec: Tuple[Any, Any]) -> pd.Series:
+    """Convert an Arrow column back to a Series of its original pandas dtype"""
+    dtype, null_value = spec
+    
+    if dtype == object:
+        series = column.to_pandas(integer_object_nulls=True).astype(object)
+        # Arrow nulls come back as None
+        return series if null_value is None else series.where(series.notna(), null_value)
+    
+    if isinstance(dtype, pd.api.extensions.ExtensionDtype) and hasattr(dtype, '__from_arrow__'):
+        if isinstance(dtype, pd.ArrowDtype) or getattr(dtype, 'storage', None) == 'pyarrow':
+            # Arrow-backed dtypes wrap the Arrow buffers (copy() shares them); concatenating copies
+            column = pa.chunked_array([pa.concat_arrays(column.chunks)] if column.num_chunks else [], type=column.type)
+        series = pd.Series(dtype.__from_arrow__(column))
+    else:
+        series = column.to_pandas()
+        if series.dtype != dtype:
+            series = series.astype(dtype)
+    
+    # Detach from the shared buffer when Arrow converted without copying
+    return series.copy()
+
+
+def _unlink_block(name: str) -> None:
+    """Remove a shared memory block"""
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    
+    shm.close()
+    shm.unlink()
+
+
+def _has_shared_memory(size: int) -> bool:
+    """Whether /dev/shm can hold another block of this size"""
+    try:
+        stats = os.statvfs('/dev/shm')
+    except OSError:
+        # Platforms without /dev/shm back shared memory differently
+        return True
+    
+    return stats.f_bavail * stats.f_frsize > size
@@ -3,11 +3,16 @@ Pipeline Orchestrator
 Coordinates all 7 layers of data processing
 """
 import pandas as pd
+import pyarrow as pa
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Union, Callable, Tuple
+import hashlib
+import json
 import logging
+import math
 from datetime import datetime
 
+from . import __version__
 from .layer1_ingestion import IngestionLayer
 from .layer2_validation import StructuralValidationLayer
 from .layer3_normalization import ColumnNormalizationLayer
@@ -15,6 +20,10 @@ from .layer4_typing import TypeDetectionLayer
 from .layer5_cleaning import DataCleaningLayer
 from .layer6_quality import DataQualityLayer
 from .layer7_storage import StorageLayer
+from .checkpoints import CheckpointStore
+from .column_profile import ColumnProfiler
+from .parallel import ColumnExecutor
+from .profiling import LayerProfiler
 
 logger = logging.getLogger(__name__)
 
@@ -22,39 +31,120 @@ logger = logging.getLogger(__name__)
 class DataPipeline:
     """7-Layer Data Processing Pipeline"""
     
-    def __init__(self, storage_path: str):
+    # Layer names in execution order (match the 'layer' key of each layer report)
+    LAYER_NAMES = ['ingestion', 'validation', 'normalization', 'typing', 'cleaning', 'quality', 'storage']
+    
+    # Rows sampled across all chunks for type detection in streaming mode
+    STREAM_DETECTION_ROWS = 10_000
+    
+    def __init__(
+        self,
+        storage_path: str,
+        streaming: bool = False,
+        chunk_rows: int = 100_000,
+        csv_engine: str = 'pandas',
+        json_max_depth: int = IngestionLayer.JSON_MAX_DEPTH,
+        column_workers: int = 0,
+        parallel_min_columns: int = 32,
+        sketch_min_rows: int = 0,
+        sketch_error: float = 0.01,
+        checkpoints: bool = False,
+        checkpoint_max_bytes: int = 0,
+        checkpoint_min_free_bytes: int = 0,
+        arrow_dtypes: bool = False,
+        parquet_compression: str = 'snappy',
+        parquet_compression_level: Optional[int] = None,
+        parquet_row_group_rows: int = 131_072,
+        parquet_downcast: bool = False,
+        parquet_measure_read: bool = False,
+        sample_rows: int = 0
+    ):
         """
         Initialize pipeline
         
         Args:
             storage_path: Base path for storing processed data
+            streaming: Ingest CSV/TSV files out-of-core and run Layers 2-4 on chunks
+            chunk_rows: Maximum rows per chunk in streaming mode
+            csv_engine: Parser for CSV/TSV in batch mode ('pandas' or 'pyarrow')
+            json_max_depth: Nesting depth of JSON objects flattened into columns
+            column_workers: Processes for column-parallel Layers 4-6 (0 or 1: in-process)
+            parallel_min_columns: Narrower frames always run in-process
+            sketch_min_rows: Compute Layer 6-7 column statistics with mergeable
+                             sketches from this many rows (0: always exact)
+            sketch_error: Target relative error of sketched distinct counts and medians
+            checkpoints: Store the frame after each of Layers 1-5 and resume
+                         later runs on the same input from the last valid one
+            checkpoint_max_bytes: Total size of all checkpoints (0: unlimited)
+            checkpoint_min_free_bytes: Free disk space to keep; least recently
+                                       used checkpoints are evicted to keep it
+            arrow_dtypes: Keep string columns Arrow-backed (string[pyarrow])
+                          from ingestion to the Parquet write, instead of
+                          one Python object per value
+            parquet_compression: Codec of the stored Parquet files ('snappy',
+                                 'zstd', 'lz4', 'gzip' or 'none')
+            parquet_compression_level: Codec level for zstd/gzip (None: default)
+            parquet_row_group_rows: Rows per Parquet row group
+            parquet_downcast: Store numeric columns in their narrowest exact dtype
+            parquet_measure_read: Report the cold read time of the stored file
+            sample_rows: On longer frames, detect types, estimate imputation
+                         statistics and score quality on this many sampled
+                         rows; casting, cleaning and writing still cover
+                         every row (0: use every row)
         """
         self.storage_path = Path(storage_path)
+        self.streaming = streaming
+        self.chunk_rows = chunk_rows
+        self.executor = ColumnExecutor(column_workers, parallel_min_columns) if column_workers > 1 else None
         
         # Initialize layers
-        self.layer1 = IngestionLayer(self.storage_path)
+        self.layer1 = IngestionLayer(
+            self.storage_path,
+            csv_engine=csv_engine,
+            json_max_depth=json_max_depth,
+            arrow_dtypes=arrow_dtypes
+        )
         self.layer2 = StructuralValidationLayer()
         self.layer3 = ColumnNormalizationLayer()
-        self.layer4 = TypeDetectionLayer()
-        self.layer5 = DataCleaningLayer()
-        self.layer6 = DataQualityLayer()
-        self.layer7 = StorageLayer(self.storage_path)
+        self.layer4 = TypeDetectionLayer(self.executor, sample_rows)
+        self.layer5 = DataCleaningLayer(self.executor, sample_rows)
+        self.layer6 = DataQualityLayer(self.executor)
+        self.layer7 = StorageLayer(
+            self.storage_path,
+            compression=parquet_compression,
+            compression_level=parquet_compression_level,
+            row_group_rows=parquet_row_group_rows,
+            downcast=parquet_downcast,
+            measure_read=parquet_measure_read
+        )
+        self.column_profiler = ColumnProfiler(self.executor, sketch_min_rows, sketch_error, sample_rows)
+        self.checkpoints = (
+            CheckpointStore(self.storage_path, checkpoint_max_bytes, checkpoint_min_free_bytes)
+            if checkpoints else None
+        )
     
     def process(
         self,
         file_path: str,
         source_type: str,
         source_id: str,
-        sheet_name: int = 0
+        sheet_name: Union[int, str] = 0,
+        progress_callback: Optional[Callable[[int, str], None]] = None
     ) -> Dict[str, Any]:
         """
         Process data through all 7 layers
         
+        With checkpoints enabled, a run on an input that was processed
+        before starts after the last layer whose checkpoint is still valid
+        (see _checkpoint_keys); Layers 6-7 always run.
+        
         Args:
             file_path: Path to data file
             source_type: Type of source (csv, excel, json, parquet, tsv)
             source_id: Unique identifier for this data source
-            sheet_name: Excel sheet index (default: 0)
+            sheet_name: Excel sheet index or name (default: 0)
+            progress_callback: Optional callable invoked as (layer_number, layer_name)
+                               before each layer starts
         
         Returns:
             Complete processing report with all metadata
@@ -62,59 +152,142 @@ class DataPipeline:
         start_time = datetime.utcnow()
         logger.info(f"=== Starting pipeline for {source_type}: {file_path} ===")
         
+        profiler = LayerProfiler()
+        
         try:
             # Initialize report
             report = {
                 'source_id': source_id,
                 'source_type': source_type,
                 'file_path': file_path,
+                'pipeline_version': __version__,
                 'started_at': start_time.isoformat(),
                 'layers': {}
             }
             
-            # LAYER 1: Ingestion
-            logger.info("--- Layer 1: Ingestion ---")
-            df, metadata = self.layer1.process(file_path, source_type, sheet_name)
-            report['layers']['layer1'] = metadata
-            logger.info(f"Layer 1 output: {len(df)} rows, {len(df.columns)} columns")
-            
-            # LAYER 2: Structural Validation
-            logger.info("--- Layer 2: Structural Validation ---")
-            df, validation_report = self.layer2.process(df)
-            report['layers']['layer2'] = validation_report
-            logger.info(f"Layer 2 output: {len(df)} rows, {len(df.columns)} columns")
-            
-            # LAYER 3: Column Normalization
-            logger.info("--- Layer 3: Column Normalization ---")
-            df, normalization_report = self.layer3.process(df)
-            report['layers']['layer3'] = normalization_report
-            logger.info(f"Layer 3 output: {normalization_report['transformation_count']} columns normalized")
-            
-            # LAYER 4: Type Detection
-            logger.info("--- Layer 4: Type Detection ---")
-            df, typing_report = self.layer4.process(df)
-            report['layers']['layer4'] = typing_report
-            logger.info(f"Layer 4 output: Types detected for {len(df.columns)} columns")
+            streaming = self.streaming and source_type in IngestionLayer.STREAMING_TYPES
+            
+            # Resume after the last layer whose checkpoint is still valid
+            fingerprint = None
+            checkpoint_keys = None
+            resumed_layer = 0
+            if self.checkpoints is not None and Path(file_path).exists():
+                fingerprint = self.layer1.fingerprint(file_path, source_type, sheet_name)
+                checkpoint_keys = self._checkpoint_keys(fingerprint, source_type, sheet_name, streaming)
+                checkpoint = self.checkpoints.load_latest(fingerprint, checkpoint_keys)
+                if checkpoint is not None:
+                    resumed_layer, df, report['layers'] = checkpoint
+                report['checkpoints'] = {'resumed_after_layer': resumed_layer, 'saved_layers': []}
             
-            # LAYER 5: Data Cleaning
-            logger.info("--- Layer 5: Data Cleaning ---")
-            df, cleaning_report = self.layer5.process(df, typing_report['type_info'])
-            report['layers']['layer5'] = cleaning_report
-            logger.info(f"Layer 5 output: {cleaning_report['total_imputed']} values imputed")
+            if streaming and resumed_layer == 0:
+                df, metadata, typing_report = self._process_streaming(
+                    file_path, source_type, report, profiler, progress_callback, fingerprint
+                )
+                self._save_checkpoint(report, checkpoint_keys, 4, df)
+            else:
+                if resumed_layer < 1:
+                    # LAYER 1: Ingestion
+                    self._notify_progress(progress_callback, 1)
+                    logger.info("--- Layer 1: Ingestion ---")
+                    with profiler.measure(1, 'ingestion') as stats:
+                        df, metadata = self.layer1.process(file_path, source_type, sheet_name, fingerprint=fingerprint)
+                        stats.add_output(*df.shape)
+                    report['layers']['layer1'] = metadata
+                    logger.info(f"Layer 1 output: {len(df)} rows, {len(df.columns)} columns")
+                    self._save_checkpoint(report, checkpoint_keys, 1, df)
+                
+                if resumed_layer < 2:
+                    # LAYER 2: Structural Validation
+                    self._notify_progress(progress_callback, 2)
+                    logger.info("--- Layer 2: Structural Validation ---")
+                    with profiler.measure(2, 'validation') as stats:
+                        stats.add_input(*df.shape)
+                        df, validation_report = self.layer2.process(df)
+                        stats.add_output(*df.shape)
+                    report['layers']['layer2'] = validation_report
+                    logger.info(f"Layer 2 output: {len(df)} rows, {len(df.columns)} columns")
+                    self._save_checkpoint(report, checkpoint_keys, 2, df)
+                
+                if resumed_layer < 3:
+                    # LAYER 3: Column Normalization
+                    self._notify_progress(progress_callback, 3)
+                    logger.info("--- Layer 3: Column Normalization ---")
+                    with profiler.measure(3, 'normalization') as stats:
+                        stats.add_input(*df.shape)
+                        df, normalization_report = self.layer3.process(df)
+                        stats.add_output(*df.shape)
+                    report['layers']['layer3'] = normalization_report
+                    logger.info(f"Layer 3 output: {normalization_report['transformation_count']} columns normalized")
+                    self._save_checkpoint(report, checkpoint_keys, 3, df)
+                
+                if resumed_layer < 4:
+                    # LAYER 4: Type Detection
+                    self._notify_progress(progress_callback, 4)
+                    logger.info("--- Layer 4: Type Detection ---")
+                    column_mapping = report['layers']['layer3']['column_mapping']
+                    typed_columns = [
+                        column_mapping[col] for col in report['layers']['layer1'].get('typed_columns', [])
+                        if col in column_mapping
+                    ]
+                    with profiler.measure(4, 'typing') as stats:
+                        stats.add_input(*df.shape)
+                        df, typing_report = self.layer4.process(df, typed_columns=typed_columns)
+                        stats.add_output(*df.shape)
+                    report['layers']['layer4'] = typing_report
+                    logger.info(f"Layer 4 output: Types detected for {len(df.columns)} columns")
+                    self._save_checkpoint(report, checkpoint_keys, 4, df)
+                
+                metadata = report['layers']['layer1']
+                typing_report = report['layers']['layer4']
+            
+            if resumed_layer < 5:
+                # LAYER 5: Data Cleaning
+                self._notify_progress(progress_callback, 5)
+                logger.info("--- Layer 5: Data Cleaning ---")
+                with profiler.measure(5, 'cleaning') as stats:
+                    stats.add_input(*df.shape)
+                    df, cleaning_report = self.layer5.process(df, typing_report['type_info'])
+                    stats.add_output(*df.shape)
+                report['layers']['layer5'] = cleaning_report
+                logger.info(f"Layer 5 output: {cleaning_report['total_imputed']} values imputed")
+                self._save_checkpoint(report, checkpoint_keys, 5, df)
+            else:
+                cleaning_report = report['layers']['layer5']
             
             # LAYER 6: Quality Assessment
+            self._notify_progress(progress_callback, 6)
             logger.info("--- Layer 6: Quality Assessment ---")
-            quality_report = self.layer6.process(
-                df,
-                typing_report['type_info'],
-                cleaning_report['cleaning_report']
-            )
+            with profiler.measure(6, 'quality') as stats:
+                stats.add_input(*df.shape)
+                # Column statistics of the cleaned data, computed once for Layers 6 and 7
+                column_profile = self.column_profiler.profile(df, typing_report['type_info'])
+                quality_report = self.layer6.process(
+                    df,
+                    typing_report['type_info'],
+                    cleaning_report['cleaning_report'],
+                    profile=column_profile
+                )
+                stats.add_output(*df.shape)
             report['layers']['layer6'] = quality_report
             logger.info(f"Layer 6 output: Quality score {quality_report['quality_report']['overall_score']}")
             
+            # Layers that estimated from a row sample (their estimates are flagged 'approximate')
+            sampled_layers = [
+                layer_report['layer'] for layer_report in (typing_report, cleaning_report)
+                if 'sample_rows' in layer_report
+            ]
+            if 0 < self.column_profiler.sample_rows < len(df):
+                sampled_layers += ['quality', 'storage']
+            if sampled_layers:
+                report['sampling'] = {'sample_rows': self.column_profiler.sample_rows, 'layers': sampled_layers}
+            
             # LAYER 7: Optimized Storage
+            self._notify_progress(progress_callback, 7)
             logger.info("--- Layer 7: Optimized Storage ---")
-            storage_report = self.layer7.process(df, source_id, metadata)
+            with profiler.measure(7, 'storage') as stats:
+                stats.add_input(*df.shape)
+                storage_report = self.layer7.process(df, source_id, metadata, profile=column_profile)
+                stats.add_output(*df.shape)
             report['layers']['layer7'] = storage_report
             logger.info(f"Layer 7 output: Stored {storage_report['storage']['parquet_size_bytes']:,} bytes")
             
@@ -124,6 +297,7 @@ class DataPipeline:
             
             report['completed_at'] = end_time.isoformat()
             report['duration_seconds'] = round(duration, 2)
+            report['performance'] = profiler.report()
             report['success'] = True
             report['final_stats'] = {
                 'rows': len(df),
@@ -145,12 +319,226 @@ class DataPipeline:
             
             report['completed_at'] = end_time.isoformat()
             report['duration_seconds'] = round(duration, 2)
+            report['performance'] = profiler.report()
             report['success'] = False
             report['error'] = str(e)
             report['error_type'] = type(e).__name__
             
             return report
     
+    def _process_streaming(
+        self,
+        file_path: str,
+        source_type: str,
+        report: Dict[str, Any],
+        profiler: LayerProfiler,
+        progress_callback: Optional[Callable[[int, str], None]] = None,
+        fingerprint: Optional[str] = None
+    ) -> Tuple[pd.DataFrame, Dict[str, Any], Dict[str, Any]]:
+        """
+        Run Layers 1-4 out-of-core on a CSV/TSV file
+        
+        Layer 1 streams the file into the raw Parquet copy; Layers 2-4 then
+        run on bounded chunks read back from it, in two passes. The first
+        runs Layers 2-3 on every chunk and keeps a row sample spread over
+        all of them (STREAM_DETECTION_ROWS, or sample_rows if larger), on
+        which types and date formats are detected, so a column that only
+        turns dirty past the first chunk is typed as in batch mode. The
+        second pass validates and normalizes the chunks again (both are
+        deterministic) and casts them. Column mapping is decided on the
+        first chunk. Only the typed chunks are assembled, since Layers 5-7
+        need dataset-wide statistics: memory stays bounded by the chunk
+        size up to Layer 4, not beyond. Per-layer timings accumulate across
+        chunks and passes; rows are counted once.
+        
+        Returns:
+            Tuple of (typed DataFrame, Layer 1 metadata, Layer 4 report)
+        """
+        # LAYER 1: Ingestion
+        self._notify_progress(progress_callback, 1)
+        logger.info("--- Layer 1: Ingestion (streaming) ---")
+        with profiler.measure(1, 'ingestion') as stats:
+            metadata = self.layer1.process_stream(file_path, source_type, fingerprint=fingerprint)
+            stats.add_output(metadata['row_count'], metadata['column_count'])
+        report['layers']['layer1'] = metadata
+        logger.info(f"Layer 1 output: {metadata['row_count']} rows, {metadata['column_count']} columns")
+        
+        empty_columns = [
+            col for col, null_count in metadata['null_counts'].items()
+            if null_count == metadata['row_count']
+        ]
+        normalization_report = None
+        
+        def normalized_chunks(validation_report: Dict[str, Any], count_rows: bool):
+            """Raw chunks through Layers 2-3 (columns mapped as on the first chunk)"""
+            nonlocal normalization_report
+            
+            with profiler.measure(2, 'validation') as stats:
+                if count_rows:
+                    stats.add_input(metadata['row_count'], metadata['column_count'])
+                chunks = iter(self.layer2.iter_process(
+                    self.layer1.iter_raw_chunks(metadata['raw_path'], self.chunk_rows),
+                    validation_report,
+                    empty_columns
+                ))
+            
+            while True:
+                # Reading and validating the next chunk is Layer 2's work
+                with profiler.measure(2, 'validation') as stats:
+                    chunk = next(chunks, None)
+                    if chunk is not None and count_rows:
+                        stats.add_output(*chunk.shape)
+                if chunk is None:
+                    return
+                
+                with profiler.measure(3, 'normalization') as stats:
+                    if count_rows:
+                        stats.add_input(*chunk.shape)
+                    if normalization_report is None:
+                        self._notify_progress(progress_callback, 3)
+                        chunk, normalization_report = self.layer3.process(chunk)
+                    else:
+                        chunk = chunk.rename(columns=normalization_report['column_mapping'])
+                    if count_rows:
+                        stats.add_output(*chunk.shape)
+                
+                yield chunk
+        
+        # LAYERS 2-3, first pass: sample rows of every chunk for type detection
+        self._notify_progress(progress_callback, 2)
+        logger.info("--- Layers 2-4: Chunked validation, normalization, typing ---")
+        validation_report = {}
+        detection_rows = max(self.layer4.sample_rows, self.STREAM_DETECTION_ROWS)
+        share = min(1.0, detection_rows / max(metadata['row_count'], 1))
+        samples = []
+        
+        for chunk in normalized_chunks(validation_report, count_rows=True):
+            with profiler.measure(4, 'typing'):
+                rows = min(len(chunk), math.ceil(len(chunk) * share))
+                samples.append(chunk if rows == len(chunk) else chunk.sample(rows, random_state=42).sort_index())
+        
+        detected_types = None
+        date_formats = {}
+        original_dtypes = {}
+        conversion_counts = {}
+        typed_chunks = []
+        
+        if normalization_report is not None:
+            with profiler.measure(4, 'typing'):
+                self._notify_progress(progress_callback, 4)
+                sample = pd.concat(samples, ignore_index=True)
+                del samples
+                original_dtypes = {col: str(sample[col].dtype) for col in sample.columns}
+                detected_types = self.layer4.detect_types(sample)
+                date_formats = self.layer4.detect_date_formats(sample, detected_types)
+                del sample
+            
+            # LAYERS 2-4, second pass: cast every chunk to the detected types
+            for chunk in normalized_chunks({}, count_rows=False):
+                with profiler.measure(4, 'typing') as stats:
+                    stats.add_input(*chunk.shape)
+                    chunk, chunk_counts = self.layer4.cast_columns(chunk, detected_types, date_formats=date_formats)
+                    stats.add_output(*chunk.shape)
+                for col, counts in chunk_counts.items():
+                    totals = conversion_counts.setdefault(col, {'non_null_count': 0, 'failed_count': 0})
+                    totals['non_null_count'] += counts['non_null_count']
+                    totals['failed_count'] += counts['failed_count']
+                
+                typed_chunks.append(chunk)
+        
+        report['layers']['layer2'] = validation_report
+        logger.info(f"Layer 2 output: {validation_report['stats']['final_rows']} rows")
+        
+        if normalization_report is None:
+            # No data rows survived validation
+            df, normalization_report = self.layer3.process(pd.DataFrame())
+            df, typing_report = self.layer4.process(df)
+        else:
+            df = pd.concat(typed_chunks, ignore_index=True)
+            typing_report = {
+                'type_info': self.layer4.build_type_info(
+                    df, detected_types, original_dtypes, conversion_counts, date_formats=date_formats
+                ),
+                'layer': 'typing'
+            }
+            if 0 < self.layer4.sample_rows < len(df):
+                typing_report['sample_rows'] = self.layer4.sample_rows
+        
+        report['layers']['layer3'] = normalization_report
+        report['layers']['layer4'] = typing_report
+        logger.info(f"Layer 4 output: {len(df)} rows, types detected for {len(df.columns)} columns")
+        
+        return df, metadata, typing_report
+    
+    def _checkpoint_keys(
+        self,
+        fingerprint: str,
+        source_type: str,
+        sheet_name: Union[int, str],
+        streaming: bool
+    ) -> List[str]:
+        """
+        Checkpoint key of each of Layers 1-5
+        
+        Each key hashes the input fingerprint with the version and the
+        output-relevant settings of its layer and of every layer before it,
+        so changing one layer invalidates its checkpoint and all later ones.
+        Layer 1 also depends on the parser libraries.
+        
+        Returns:
+            List of 5 hex digests, in layer order
+        """
+        layer_configs = [
+            {
+                'version': self.layer1.VERSION,
+                'source_type': source_type,
+                'sheet_name': sheet_name if source_type == 'excel' else None,
+                'csv_engine': self.layer1.csv_engine,
+                'json_max_depth': self.layer1.json_max_depth,
+                'arrow_dtypes': self.layer1.arrow_dtypes,
+                'streaming_chunk_rows': self.chunk_rows if streaming else None,
+                'pandas': pd.__version__,
+                'pyarrow': pa.__version__
+            },
+            {'version': self.layer2.VERSION},
+            {'version': self.layer3.VERSION},
+            {'version': self.layer4.VERSION, 'sample_rows': self.layer4.sample_rows},
+            {'version': self.layer5.VERSION, 'sample_rows': self.layer5.sample_rows}
+        ]
+        
+        hasher = hashlib.sha256(fingerprint.encode())
+        keys = []
+        for config in layer_configs:
+            hasher.update(json.dumps(config, sort_keys=True, default=str).encode())
+            keys.append(hasher.hexdigest())
+        
+        return keys
+    
+    def _save_checkpoint(
+        self,
+        report: Dict[str, Any],
+        checkpoint_keys: Optional[List[str]],
+        layer_number: int,
+        df: pd.DataFrame
+    ) -> None:
+        """Store the output of a layer, when checkpoints are enabled"""
+        if checkpoint_keys is None:
+            return
+        
+        fingerprint = report['layers']['layer1']['fingerprint']
+        if self.checkpoints.save(fingerprint, layer_number, checkpoint_keys[layer_number - 1], df, report['layers']):
+            report['checkpoints']['saved_layers'].append(layer_number)
+    
+    def _notify_progress(self, progress_callback: Optional[Callable[[int, str], None]], layer_number: int) -> None:
+        """Report the layer about to run; progress reporting must never fail the pipeline"""
+        if progress_callback is None:
+            return
+        
+        try:
+            progress_callback(layer_number, self.LAYER_NAMES[layer_number - 1])
+        except Exception as e:
+            logger.warning(f"Progress callback failed: {str(e)}")
+    
     def get_processed_data(self, source_id: str) -> pd.DataFrame:
         """
         Load processed data from storage
@@ -166,7 +554,7 @@ class DataPipeline:
         if not parquet_path.exists():
             raise FileNotFoundError(f"Processed data not found for source {source_id}")
         
-        return pd.read_parquet(parquet_path)
+        return StorageLayer.read(parquet_path)
     
     def get_preview_data(self, source_id: str) -> pd.DataFrame:
         """
@@ -183,4 +571,4 @@ class DataPipeline:
         if not preview_path.exists():
             raise FileNotFoundError(f"Preview data not found for source {source_id}")
         
-        return pd.read_parquet(preview_path)
+        return StorageLayer.read(preview_path)
@@ -0,0 +1,202 @@
+"""
+Pipeline Profiling
+Per-layer wall time, CPU time, throughput and peak memory
+"""
+import time
+import numpy as np
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+
+# Linux process status: peak resident set size, resettable via clear_refs
+PROC_STATUS = '/proc/self/status'
+PROC_CLEAR_REFS = '/proc/self/clear_refs'
+
+
+class LayerStats:
+    """Timing and row/column counts of one layer"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.rows_in = 0
+        self.columns_in = 0
+        self.rows_out = 0
+        self.columns_out = 0
+        self.peak_rss_bytes: Optional[int] = None
+    
+    def add_input(self, rows: int, columns: int) -> None:
+        """Count rows entering the layer (additive across chunks)"""
+        self.rows_in += rows
+        self.columns_in = columns
+    
+    def add_output(self, rows: int, columns: int) -> None:
+        """Count rows leaving the layer (additive across chunks)"""
+        self.rows_out += rows
+        self.columns_out = columns
+    
+    def add_peak_rss(self, peak_rss_bytes: Optional[int]) -> None:
+        """Record the process peak RSS of one measured block (max across chunks)"""
+        if peak_rss_bytes is not None:
+            self.peak_rss_bytes = max(self.peak_rss_bytes or 0, peak_rss_bytes)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable stats"""
+        # Ingestion has no input frame, so throughput falls back to rows produced
+        rows = max(self.rows_in, self.rows_out)
+        
+        return {
+            'layer': self.name,
+            'wall_seconds': round(self.wall_seconds, 4),
+            'cpu_seconds': round(self.cpu_seconds, 4),
+            'rows_in': self.rows_in,
+            'columns_in': self.columns_in,
+            'rows_out': self.rows_out,
+            'columns_out': self.columns_out,
+            'rows_per_second': round(rows / self.wall_seconds) if self.wall_seconds > 0 else None,
+            'peak_rss_bytes': self.peak_rss_bytes
+        }
+
+
+class LayerProfiler:
+    """Collects per-layer stats for one pipeline run"""
+    
+    def __init__(self):
+        self.layers: Dict[str, LayerStats] = {}
+    
+    @contextmanager
+    def measure(self, layer_number: int, name: str) -> Iterator[LayerStats]:
+        """
+        Time a block of work belonging to one layer
+        
+        Wall time uses a monotonic clock; CPU time is process-wide, so it
+        includes Arrow/numpy worker threads and can exceed wall time.
+        Measuring the same layer again (e.g. once per chunk) adds up.
+        
+        Peak memory is the highest resident set size of this process while
+        the block ran (Linux only, None elsewhere). It covers NumPy and
+        Arrow allocations alike, but not column-parallel worker processes.
+        
+        Args:
+            layer_number: 1-7
+            name: Layer name
+        
+        Yields:
+            LayerStats of the layer, for recording input/output shapes
+        """
+        stats = self.layers.setdefault(f"layer{layer_number}", LayerStats(name))
+        
+        tracking_memory = _reset_peak_rss()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield stats
+        finally:
+            stats.wall_seconds += time.perf_counter() - wall_start
+            stats.cpu_seconds += time.process_time() - cpu_start
+            if tracking_memory:
+                stats.add_peak_rss(_peak_rss())
+    
+    def report(self) -> Dict[str, Any]:
+        """
+        Performance section of the processing report
+        
+        Returns:
+            Dict with per-layer stats, totals, the slowest layer and the
+            highest peak memory of any layer
+        """
+        layers = {key: stats.to_dict() for key, stats in self.layers.items()}
+        slowest = max(self.layers, key=lambda key: self.layers[key].wall_seconds) if self.layers else None
+        peaks = [stats.peak_rss_bytes for stats in self.layers.values() if stats.peak_rss_bytes is not None]
+        
+        return {
+            'layers': layers,
+            'total_wall_seconds': round(sum(stats.wall_seconds for stats in self.layers.values()), 4),
+            'total_cpu_seconds': round(sum(stats.cpu_seconds for stats in self.layers.values()), 4),
+            'slowest_layer': slowest,
+            'peak_rss_bytes': max(peaks) if peaks else None
+        }
+    
+    @staticmethod
+    def aggregate(performances: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Aggregate the performance sections of many processing reports
+        
+        Args:
+            performances: report['performance'] dicts (missing ones are skipped)
+        
+        Returns:
+            Dict with per-layer wall time percentiles, mean CPU time, median
+            throughput, peak memory, and how often each layer was the slowest
+        """
+        performances = [p for p in performances if p and p.get('layers')]
+        
+        per_layer: Dict[str, Dict[str, list]] = {}
+        slowest_counts: Dict[str, int] = {}
+        
+        for performance in performances:
+            for key, stats in performance['layers'].items():
+                values = per_layer.setdefault(
+                    key,
+                    {'name': stats['layer'], 'wall': [], 'cpu': [], 'rows_per_second': [], 'peak_rss': []}
+                )
+                values['wall'].append(stats['wall_seconds'])
+                values['cpu'].append(stats['cpu_seconds'])
+                if stats.get('rows_per_second') is not None:
+                    values['rows_per_second'].append(stats['rows_per_second'])
+                if stats.get('peak_rss_bytes') is not None:
+                    values['peak_rss'].append(stats['peak_rss_bytes'])
+            
+            slowest = performance.get('slowest_layer')
+            if slowest:
+                slowest_counts[slowest] = slowest_counts.get(slowest, 0) + 1
+        
+        layers = {}
+        for key in sorted(per_layer, key=lambda k: int(k.replace('layer', ''))):
+            values = per_layer[key]
+            wall = np.array(values['wall'])
+            layers[key] = {
+                'layer': values['name'],
+                'runs': len(wall),
+                'wall_seconds_mean': round(float(wall.mean()), 4),
+                'wall_seconds_p50': round(float(np.percentile(wall, 50)), 4),
+                'wall_seconds_p95': round(float(np.percentile(wall, 95)), 4),
+                'wall_seconds_max': round(float(wall.max()), 4),
+                'cpu_seconds_mean': round(float(np.mean(values['cpu'])), 4),
+                'rows_per_second_p50': round(float(np.median(values['rows_per_second']))) if values['rows_per_second'] else None,
+                'peak_rss_bytes_p50': int(np.median(values['peak_rss'])) if values['peak_rss'] else None,
+                'peak_rss_bytes_max': int(max(values['peak_rss'])) if values['peak_rss'] else None,
+                'slowest_count': slowest_counts.get(key, 0)
+            }
+        
+        total_wall = [p.get('total_wall_seconds', 0) for p in performances]
+        
+        return {
+            'sources': len(performances),
+            'total_wall_seconds_mean': round(float(np.mean(total_wall)), 4) if total_wall else None,
+            'total_wall_seconds_p95': round(float(np.percentile(total_wall, 95)), 4) if total_wall else None,
+            'layers': layers,
+            'slowest_layer': max(slowest_counts, key=slowest_counts.get) if slowest_counts else None
+        }
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the process peak RSS to the current RSS; False where unsupported"""
+    try:
+        with open(PROC_CLEAR_REFS, 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss() -> Optional[int]:
+    """Peak RSS of this process in bytes since the last reset"""
+    try:
+        with open(PROC_STATUS) as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
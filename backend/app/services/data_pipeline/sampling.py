@@ -0,0 +1,68 @@
+"""
+Row Sampling
+Uniform row samples and estimators for sample mode on very large data
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Seed of every sample, so runs on the same data pick the same rows
+SAMPLE_SEED = 42
+
+
+def sample_positions(rows: int, sample_rows: int) -> Optional[np.ndarray]:
+    """
+    Sorted positions of a uniform sample of rows, without replacement
+    
+    The sample has the distribution of a reservoir sample over the rows;
+    as frames are in memory by the time they are sampled, the positions
+    are drawn directly.
+    
+    Args:
+        rows: Number of rows
+        sample_rows: Sample size (0: no sampling)
+    
+    Returns:
+        Array of positions, or None when the rows fit in the sample
+    """
+    if sample_rows <= 0 or rows <= sample_rows:
+        return None
+    
+    rng = np.random.default_rng(SAMPLE_SEED)
+    return np.sort(rng.choice(rows, sample_rows, replace=False))
+
+
+def sample_series(series: pd.Series, sample_rows: int) -> Optional[pd.Series]:
+    """Sampled rows of a column, or None when it fits in the sample"""
+    positions = sample_positions(len(series), sample_rows)
+    return series.take(positions) if positions is not None else None
+
+
+def estimate_distinct(sample: pd.Series, population: int) -> int:
+    """
+    Estimate the distinct values of a column from a sample of its non-null values
+    
+    Uses the Duj1 estimator of Haas and Stokes (1998), as PostgreSQL's
+    ANALYZE does: n * d / (n - f1 + f1 * n / N) for a sample of n values
+    with d distinct ones, f1 of them seen once, from N values. A sample
+    of all-distinct values estimates an all-distinct column, a sample
+    without singletons its own distinct count.
+    
+    Args:
+        sample: Sampled non-null values
+        population: Estimated non-null values of the whole column
+    
+    Returns:
+        Estimated distinct count, between the sample's and the population
+    """
+    if len(sample) == 0:
+        return 0
+    
+    counts = sample.value_counts(dropna=False).to_numpy()
+    n = len(sample)
+    distinct = len(counts)
+    singletons = int(np.count_nonzero(counts == 1))
+    estimate = n * distinct / (n - singletons + singletons * n / max(population, n))
+    
+    return int(min(max(round(estimate), distinct), max(population, distinct)))
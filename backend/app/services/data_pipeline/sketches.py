@@ -0,0 +1,260 @@
+"""
+Column Sketches
+Mergeable approximate statistics for very large or chunked data
+"""
+import math
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Register counts used by HyperLogLog (2**4 to 2**18 registers)
+HLL_MIN_PRECISION = 4
+HLL_MAX_PRECISION = 18
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter over 64-bit value hashes
+    
+    The relative standard error is about 1.04 / sqrt(2 ** precision).
+    Counters of equal precision merge by taking the register maxima.
+    """
+    
+    def __init__(self, precision: int):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+    
+    @classmethod
+    def for_error(cls, error: float) -> 'HyperLogLog':
+        """Counter with the fewest registers reaching a relative standard error"""
+        precision = math.ceil(2 * math.log2(1.04 / error))
+        return cls(min(max(precision, HLL_MIN_PRECISION), HLL_MAX_PRECISION))
+    
+    def update(self, hashes: np.ndarray) -> None:
+        """Add values by their uint64 hashes"""
+        if len(hashes) == 0:
+            return
+        
+        tail_bits = 64 - self.precision
+        index = (hashes >> np.uint64(tail_bits)).astype(np.intp)
+        tail = hashes & np.uint64((1 << tail_bits) - 1)
+        
+        # Position of the lowest set bit in the tail (tail_bits + 1 if none);
+        # frexp reads it exactly, as the isolated bit is a power of two
+        lowest_bit = tail & (~tail + np.uint64(1))
+        rank = np.where(tail == 0, tail_bits + 1, np.frexp(lowest_bit.astype(np.float64))[1])
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+    
+    def merge(self, other: 'HyperLogLog') -> None:
+        """Merge another counter of the same precision into this one"""
+        np.maximum(self.registers, other.registers, out=self.registers)
+    
+    def count(self) -> int:
+        """Estimated number of distinct values"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m) if m >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Small cardinalities: linear counting is more accurate
+            estimate = m * math.log(m / zeros)
+        
+        return int(round(estimate))
+
+
+class TDigest:
+    """
+    Merging t-digest for quantiles
+    
+    Values are kept as weighted centroids, small near the tails and larger
+    in the middle (k1 scale function). The rank error of a quantile is
+    about pi / (2 * compression) at the median and smaller towards the
+    tails. Digests merge by compressing their centroids together.
+    """
+    
+    def __init__(self, compression: float):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = math.inf
+        self.max = -math.inf
+    
+    @classmethod
+    def for_error(cls, error: float) -> 'TDigest':
+        """Digest whose median rank error stays within error"""
+        return cls(math.ceil(math.pi / (2 * error)))
+    
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of values"""
+        if len(values) == 0:
+            return
+        
+        values = np.sort(values.astype(np.float64))
+        self.min = min(self.min, float(values[0]))
+        self.max = max(self.max, float(values[-1]))
+        # Compress the batch on its own first, so only centroids are merged
+        self._absorb(*self._compress(values, np.ones(len(values))))
+    
+    def merge(self, other: 'TDigest') -> None:
+        """Merge another digest into this one"""
+        if len(other.means) == 0:
+            return
+        
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._absorb(other.means, other.weights)
+    
+    def quantile(self, q: float) -> float:
+        """Estimated q-quantile (NaN when empty)"""
+        if len(self.means) == 0:
+            return math.nan
+        
+        # Centroids sit at the middle of the ranks they cover
+        centers = np.cumsum(self.weights) - self.weights / 2
+        target = q * self.weights.sum()
+        
+        if target <= centers[0]:
+            return float(np.interp(target, [0, centers[0]], [self.min, self.means[0]]))
+        if target >= centers[-1]:
+            return float(np.interp(target, [centers[-1], self.weights.sum()], [self.means[-1], self.max]))
+        return float(np.interp(target, centers, self.means))
+    
+    def _absorb(self, means: np.ndarray, weights: np.ndarray) -> None:
+        """Merge centroids into the digest"""
+        means = np.concatenate([self.means, means])
+        weights = np.concatenate([self.weights, weights])
+        order = np.argsort(means, kind='mergesort')
+        self.means, self.weights = self._compress(means[order], weights[order])
+    
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Merge sorted neighbours whose middle ranks fall in the same unit of the k1 scale
+        
+        Returns:
+            Tuple of (centroid means, centroid weights)
+        """
+        mid_ranks = (np.cumsum(weights) - weights / 2) / weights.sum()
+        k = np.floor(self.compression / (2 * math.pi) * np.arcsin(2 * mid_ranks - 1))
+        starts = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+        
+        merged_weights = np.add.reduceat(weights, starts)
+        return np.add.reduceat(means * weights, starts) / merged_weights, merged_weights
+
+
+class ColumnSketch:
+    """
+    Mergeable statistics of one column, fed chunk by chunk
+    
+    Counts, min, max and sum are exact; distinct values use HyperLogLog
+    and the median a t-digest. to_profile() returns the keys of
+    ColumnProfiler.profile_column, with the approximate ones listed under
+    'approximate'.
+    """
+    
+    def __init__(self, error: float):
+        """
+        Initialize sketch
+        
+        Args:
+            error: Target relative error of distinct counts and median ranks
+        """
+        self.dtype: Optional[str] = None
+        self.numeric = False
+        self.rows = 0
+        self.null_count = 0
+        self.distinct = HyperLogLog.for_error(error)
+        self.digest = TDigest.for_error(error)
+        self.finite_count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.counts: Dict[str, int] = {}
+    
+    def update(self, series: pd.Series) -> pd.Series:
+        """
+        Add a chunk of the column
+        
+        Returns:
+            The chunk's non-null values
+        """
+        if self.dtype is None:
+            self.dtype = str(series.dtype)
+            self.numeric = pd.api.types.is_numeric_dtype(series)
+        
+        mask = series.isna().to_numpy()
+        non_null = series[~mask] if mask.any() else series
+        self.rows += len(series)
+        self.null_count += int(mask.sum())
+        self.distinct.update(_hash_values(non_null))
+        
+        if self.numeric and len(non_null):
+            values = non_null.to_numpy(dtype=getattr(series.dtype, 'numpy_dtype', None))
+            if values.dtype != object:
+                finite = np.isfinite(values)
+                self.finite_count += int(finite.sum())
+                self.total += float(values.sum(dtype=np.float64))
+                self.min = min(self.min, float(values.min()))
+                self.max = max(self.max, float(values.max()))
+                self.digest.update(values[finite])
+        
+        return non_null
+    
+    def add_counts(self, counts: Dict[str, int]) -> None:
+        """Add exact per-chunk counts (summed across chunks)"""
+        for key, count in counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+    
+    def merge(self, other: 'ColumnSketch') -> None:
+        """Merge the sketch of another chunk of the same column"""
+        if self.dtype is None:
+            self.dtype, self.numeric = other.dtype, other.numeric
+        
+        self.rows += other.rows
+        self.null_count += other.null_count
+        self.distinct.merge(other.distinct)
+        self.digest.merge(other.digest)
+        self.finite_count += other.finite_count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.add_counts(other.counts)
+    
+    def to_profile(self) -> Dict[str, Any]:
+        """Column profile from the sketch"""
+        non_null_count = self.rows - self.null_count
+        stats = {
+            'dtype': self.dtype,
+            'rows': self.rows,
+            'null_count': self.null_count,
+            'non_null_count': non_null_count,
+            'unique_count': min(self.distinct.count(), non_null_count),
+            'approximate': ['unique_count']
+        }
+        
+        if self.numeric and non_null_count and self.min <= self.max:
+            stats.update({
+                'min': self.min,
+                'max': self.max,
+                'mean': self.total / non_null_count,
+                'median': self.digest.quantile(0.5),
+                'finite_count': self.finite_count
+            })
+            stats['approximate'].append('median')
+        
+        stats.update(self.counts)
+        return stats
+
+
+def _hash_values(values: pd.Series) -> np.ndarray:
+    """uint64 hashes of non-null values (equal values hash equally)"""
+    if len(values) == 0:
+        return np.empty(0, dtype=np.uint64)
+    
+    array = values.to_numpy(dtype=getattr(values.dtype, 'numpy_dtype', None))
+    if array.dtype.kind == 'f':
+        # -0.0 and 0.0 are one distinct value
+        array = array + 0.0
+    return pd.util.hash_array(array)
+
@@ -1,16 +1,22 @@
-from app.services.data_pipeline import DataPipeline
+from app.services.data_pipeline import DataPipeline, IngestionLayer, LayerProfiler, StorageLayer, __version__ as PIPELINE_VERSION
 
 from app.utils.validators import DataValidator
 import logging
 logger = logging.getLogger(__name__)
 from app.utils.file_parsers import FileParser
+from app.utils.upload_storage import UploadStorage
+from app.services.pipeline_jobs import build_pipeline, pipeline_jobs
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status, UploadFile
-from typing import List, Optional
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Optional, Union
 import pandas as pd
 import os
+import shutil
 from datetime import datetime
 from uuid import UUID
+import uuid
 import json
 
 from app.models.data_source import DataSource
@@ -21,7 +27,7 @@ from app.config import settings
 class DataSourceService:
     """Service for handling data source operations."""
     
-    pipeline = DataPipeline(settings.STORAGE_PATH)
+    pipeline = build_pipeline()
     
     @staticmethod
     async def upload_file(
@@ -34,53 +40,148 @@ class DataSourceService:
         """
         Upload and process a data file (CSV, Excel, JSON, Parquet, etc.).
         
-        MODIFIED: Now processes through pipeline for enhanced quality
+        Waits for pipeline processing to finish before returning. The
+        pipeline itself runs in the background worker pool, so the event
+        loop is not blocked. Use submit_upload to return immediately.
         """
-        # Get file type
-        file_type = FileParser.get_file_type(file.filename)
+        job = await DataSourceService.submit_upload(db, user, file, name, sheet_name)
+        job = await pipeline_jobs.wait(job['job_id']) or job
         
-        if file_type not in FileParser.SUPPORTED_FORMATS:
+        data_source = DataSourceService.get_data_source(db, user, UUID(job['data_source_id']))
+        db.refresh(data_source)
+        
+        if data_source.status == 'error':
+            # Layer 1 could not read the file - reject the upload
+            DataSourceService.delete_data_source(db, user, data_source.id)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Unsupported file type. Supported: {', '.join(FileParser.SUPPORTED_FORMATS.keys())}"
+                detail=f"Error processing file: {job.get('error')}"
             )
         
-        # Read file content
-        try:
-            contents = await file.read()
-            
-            # Check file size
-            file_size = len(contents)
-            max_size = settings.MAX_FILE_SIZE_MB * 1024 * 1024
-            if file_size > max_size:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"File size exceeds maximum allowed size of {settings.MAX_FILE_SIZE_MB}MB"
-                )
-            
-            # Parse file with appropriate parser (KEEP: for initial validation)
-            df = FileParser.parse_file(file.filename, contents, sheet_name=sheet_name)
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error processing file {file.filename}: {str(e)}")
+        return data_source
+    
+    @staticmethod
+    async def submit_upload(
+        db: Session,
+        user: User,
+        file: UploadFile,
+        name: Optional[str] = None,
+        sheet_name: Optional[str] = None
+    ) -> dict:
+        """
+        Save an uploaded file and queue it for pipeline processing.
+        
+        The data source is created with status 'processing' and updated
+        by the background job when the pipeline finishes.
+        
+        Returns:
+            Pipeline job dict (poll with pipeline_jobs.get)
+        """
+        data_source = await DataSourceService._save_upload(db, user, file, name)
+        return DataSourceService._queue_processing(db, user, data_source, sheet_name)
+    
+    @staticmethod
+    async def submit_excel_sheets(
+        db: Session,
+        user: User,
+        file: UploadFile,
+        name: Optional[str] = None,
+        sheet_names: Optional[List[str]] = None
+    ) -> List[dict]:
+        """
+        Save an Excel workbook once and queue each sheet as its own data source.
+        
+        The sheets are processed in parallel by the pipeline job pool.
+        Each data source gets its own hard link to the saved workbook, so
+        they can be deleted independently.
+        
+        Args:
+            sheet_names: Sheets to ingest (default: all sheets)
+        
+        Returns:
+            List of pipeline job dicts, one per sheet
+        """
+        if FileParser.get_file_type(file.filename) not in ['.xlsx', '.xls']:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Error processing file: {str(e)}"
+                detail="File must be an Excel file (.xlsx or .xls)"
             )
         
-        # Validate structure (KEEP: for backward compatibility)
-        is_valid, issues = DataValidator.validate_csv_structure(df)
-        if not is_valid:
-            logger.warning(f"File validation issues for {file.filename}: {issues}")
+        data_source = await DataSourceService._save_upload(db, user, file, name)
+        base_name = data_source.name
+        
+        available = FileParser.get_excel_sheets(data_source.file_path)
+        requested = sheet_names or available
+        missing = [sheet for sheet in requested if sheet not in available]
+        if missing:
+            DataSourceService.delete_data_source(db, user, data_source.id)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Sheets not found: {', '.join(missing)}. Available: {', '.join(available)}"
+            )
+        
+        sources = [data_source] + [
+            DataSourceService._clone_upload(db, data_source)
+            for _ in requested[1:]
+        ]
         
-        # Extract basic metadata (KEEP: for fallback if pipeline fails)
-        row_count = len(df)
-        columns_info_basic = DataValidator.infer_column_types(df)
-        quality_report_basic = DataValidator.get_data_quality_report(df)
+        jobs = []
+        for sheet, sheet_source in zip(requested, sources):
+            sheet_source.name = f"{base_name} - {sheet}"
+            db.commit()
+            jobs.append(DataSourceService._queue_processing(db, user, sheet_source, sheet))
         
-        logger.info(f"Basic quality report for {file.filename}: {quality_report_basic}")
+        logger.info(f"📑 Queued {len(jobs)} sheets of {file.filename}")
+        return jobs
+    
+    @staticmethod
+    def _queue_processing(
+        db: Session,
+        user: User,
+        data_source: DataSource,
+        sheet_name: Optional[str] = None
+    ) -> dict:
+        """Process a saved upload: basic metadata, reuse of an identical upload, or a pipeline job."""
+        if not settings.USE_PIPELINE_BY_DEFAULT:
+            # Pipeline disabled, parse once for basic metadata
+            logger.info("Pipeline disabled, using basic metadata")
+            DataSourceService._apply_basic_metadata(db, user, data_source, sheet_name)
+            return pipeline_jobs.create_completed(data_source.id, user.id)
+        
+        # Pipeline takes a sheet index or name; first sheet unless one was picked
+        sheet = (sheet_name or 0) if data_source.type == 'excel' else 0
+        
+        duplicate = DataSourceService._find_processed_duplicate(db, data_source, sheet)
+        if duplicate is not None:
+            logger.info(f"♻️ Reusing pipeline results of {duplicate.id} for identical upload {data_source.name}")
+            DataSourceService._reuse_processing(db, data_source, duplicate)
+            return pipeline_jobs.create_completed(data_source.id, user.id)
+        
+        logger.info(f"🚀 Queueing pipeline for {data_source.name}")
+        return pipeline_jobs.submit(
+            data_source_id=data_source.id,
+            user_id=user.id,
+            file_path=data_source.file_path,
+            source_type=data_source.type,
+            sheet_name=sheet
+        )
+    
+    @staticmethod
+    async def _save_upload(
+        db: Session,
+        user: User,
+        file: UploadFile,
+        name: Optional[str] = None
+    ) -> DataSource:
+        """Stream an upload to disk and create its data source record (status 'processing')."""
+        # Get file type
+        file_type = FileParser.get_file_type(file.filename)
+        
+        if file_type not in FileParser.SUPPORTED_FORMATS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported file type. Supported: {', '.join(FileParser.SUPPORTED_FORMATS.keys())}"
+            )
         
         # Create storage directory
         upload_dir = os.path.join(settings.UPLOAD_DIR, str(user.id))
@@ -91,9 +192,32 @@ class DataSourceService:
         safe_filename = f"{timestamp}_{file.filename}"
         file_path = os.path.join(upload_dir, safe_filename)
         
-        # Save file to disk
-        with open(file_path, 'wb') as f:
-            f.write(contents)
+        # Stream file to disk in chunks (size limit and hash enforced as bytes arrive)
+        spool_info = await UploadStorage.spool_to_disk(
+            file,
+            file_path,
+            max_bytes=settings.MAX_FILE_SIZE_MB * 1024 * 1024,
+            chunk_size=settings.UPLOAD_CHUNK_SIZE_KB * 1024
+        )
+        
+        # Compressed uploads are kept as-is; the limit applies to the decompressed data
+        content_type = file_type
+        base_name = file.filename
+        if IngestionLayer.detect_compression(file_path):
+            try:
+                content_type = FileParser.get_compressed_content_type(file.filename, file_path)
+                await run_in_threadpool(
+                    UploadStorage.check_decompressed_size,
+                    file_path,
+                    max_bytes=settings.MAX_FILE_SIZE_MB * 1024 * 1024,
+                    chunk_size=settings.UPLOAD_CHUNK_SIZE_KB * 1024
+                )
+            except BaseException:
+                os.remove(file_path)
+                raise
+            
+            if file_type != '.zip':
+                base_name = base_name.rsplit('.', 1)[0]
         
         # Determine data source type from file extension
         type_mapping = {
@@ -101,119 +225,284 @@ class DataSourceService:
             '.xlsx': 'excel',
             '.xls': 'excel',
             '.json': 'json',
+            '.jsonl': 'json',
+            '.ndjson': 'json',
             '.parquet': 'parquet',
             '.txt': 'tsv',
             '.tsv': 'tsv'
         }
-        source_type = type_mapping.get(file_type, 'file')
-        
-        pipeline_report = None
-        quality_score = None
-        quality_level = None
-        cleaned_path = None
-        preview_path = None
-        column_mapping = None
-        column_stats = None
-        processing_duration = None
-        
-        if settings.USE_PIPELINE_BY_DEFAULT:
-            try:
-                logger.info(f"🚀 Running pipeline for {file.filename}")
-                
-                # Generate unique source ID
-                import uuid
-                source_id = str(uuid.uuid4())
-                
-                # Run full pipeline
-                pipeline_report = DataSourceService.pipeline.process(
-                    file_path=file_path,
-                    source_type=source_type,
-                    source_id=source_id,
-                    sheet_name=0
-                )
-                
-                if pipeline_report['success']:
-                    # Use enhanced metadata from pipeline
-                    row_count = pipeline_report['final_stats']['rows']
-                    quality_score = pipeline_report['final_stats']['quality_score']
-                    quality_level = pipeline_report['final_stats']['quality_level']
-                    processing_duration = pipeline_report['duration_seconds']
-                    
-                    # Extract paths
-                    layer7 = pipeline_report['layers']['layer7']
-                    cleaned_path = layer7['storage']['parquet_path']
-                    preview_path = layer7['storage']['preview_path']
-                    
-                    # Extract column mapping
-                    layer3 = pipeline_report['layers']['layer3']
-                    column_mapping = layer3['column_mapping']
-                    
-                    # Extract column stats
-                    column_stats = layer7['column_stats']
-                    
-                    # Extract enhanced columns_info
-                    columns_info = []
-                    layer4 = pipeline_report['layers']['layer4']
-                    for col, info in layer4['type_info'].items():
-                        columns_info.append({
-                            'name': col,
-                            'type': info['detected_type'],
-                            'original_dtype': info['original_dtype'],
-                            'final_dtype': info['final_dtype']
-                        })
-                    
-                    logger.info(f"✅ Pipeline complete: quality {quality_score}, duration {processing_duration}s")
-                    
-                else:
-                    # Pipeline failed, use basic metadata
-                    logger.warning(f"⚠️ Pipeline failed: {pipeline_report.get('error')}")
-                    columns_info = columns_info_basic
-                    pipeline_report = None
-                    
-            except Exception as e:
-                logger.error(f"❌ Pipeline error: {str(e)}", exc_info=True)
-                # Fallback to basic metadata
-                columns_info = columns_info_basic
-                pipeline_report = None
-        else:
-            # Pipeline disabled, use basic metadata
-            logger.info("Pipeline disabled, using basic metadata")
-            columns_info = columns_info_basic
+        source_type = type_mapping.get(content_type, 'file')
         
-        # Create database record (MODIFIED: added new fields)
-        data_source_name = name or file.filename.rsplit('.', 1)[0]
+        data_source_name = name or base_name.rsplit('.', 1)[0]
         
         new_data_source = DataSource(
-            id=source_id if pipeline_report else uuid.uuid4(),  # NEW: Use pipeline source_id if available
+            id=uuid.uuid4(),
             user_id=user.id,
             name=data_source_name,
             type=source_type,
-            status="connected",
+            status="processing",
             file_path=file_path,
-            row_count=row_count,
-            file_size=file_size,
-            columns_info=columns_info,
-            connection_info=quality_report_basic,  # Keep for backward compatibility
-            # NEW: Pipeline fields
-            processing_report=pipeline_report,
-            quality_score=quality_score,
-            quality_level=quality_level,
-            column_mapping=column_mapping,
-            column_stats=column_stats,
-            cleaned_path=cleaned_path,
-            preview_path=preview_path,
-            processing_duration_seconds=processing_duration,
-            last_processed_at=datetime.utcnow() if pipeline_report else None
+            file_size=spool_info['file_size'],
+            content_hash=spool_info['content_hash'],
+            columns_info=[]
         )
         
         db.add(new_data_source)
         db.commit()
         db.refresh(new_data_source)
         
-        logger.info(f"✅ Successfully uploaded {source_type} file: {data_source_name}")
+        logger.info(f"✅ Saved {source_type} upload: {data_source_name}")
         
         return new_data_source
     
+    @staticmethod
+    def _clone_upload(db: Session, data_source: DataSource) -> DataSource:
+        """Create another data source for the same saved file (hard link, copied if linking fails)."""
+        root, ext = os.path.splitext(data_source.file_path)
+        file_path = f"{root}_{uuid.uuid4().hex[:8]}{ext}"
+        
+        try:
+            os.link(data_source.file_path, file_path)
+        except OSError:
+            shutil.copyfile(data_source.file_path, file_path)
+        
+        clone = DataSource(
+            id=uuid.uuid4(),
+            user_id=data_source.user_id,
+            name=data_source.name,
+            type=data_source.type,
+            status="processing",
+            file_path=file_path,
+            file_size=data_source.file_size,
+            content_hash=data_source.content_hash,
+            columns_info=[]
+        )
+        
+        db.add(clone)
+        db.commit()
+        db.refresh(clone)
+        
+        return clone
+    
+    @staticmethod
+    def _apply_basic_metadata(
+        db: Session,
+        user: User,
+        data_source: DataSource,
+        sheet_name: Optional[str] = None
+    ) -> None:
+        """Parse a saved upload with FileParser and store basic metadata (pipeline disabled)."""
+        filename = os.path.basename(data_source.file_path)
+        
+        try:
+            df = FileParser.parse_file(filename, data_source.file_path, sheet_name=sheet_name)
+        except Exception as e:
+            logger.error(f"Error processing file {filename}: {str(e)}")
+            DataSourceService.delete_data_source(db, user, data_source.id)
+            if isinstance(e, HTTPException):
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Error processing file: {str(e)}"
+            )
+        
+        # Column statistics are computed once and shared by the three checks
+        profile = DataValidator.profile(df)
+        
+        is_valid, issues = DataValidator.validate_csv_structure(df, profile)
+        if not is_valid:
+            logger.warning(f"File validation issues for {filename}: {issues}")
+        
+        data_source.row_count = len(df)
+        data_source.columns_info = DataValidator.infer_column_types(df, profile)
+        data_source.connection_info = DataValidator.get_data_quality_report(df, profile)
+        data_source.status = 'connected'
+        
+        db.commit()
+        db.refresh(data_source)
+    
+    @staticmethod
+    def _find_processed_duplicate(
+        db: Session,
+        data_source: DataSource,
+        sheet_name: Union[int, str] = 0
+    ) -> Optional[DataSource]:
+        """
+        Find an earlier upload of byte-identical content (and, for Excel,
+        the same sheet) already processed by the current pipeline version.
+        
+        Returns:
+            The matching data source, or None
+        """
+        if not data_source.content_hash:
+            return None
+        
+        candidates = db.query(DataSource).filter(
+            DataSource.user_id == data_source.user_id,
+            DataSource.content_hash == data_source.content_hash,
+            DataSource.type == data_source.type,
+            DataSource.id != data_source.id,
+            DataSource.status == 'connected',
+            DataSource.cleaned_path.isnot(None)
+        ).order_by(DataSource.last_processed_at.desc()).all()
+        
+        for candidate in candidates:
+            report = candidate.processing_report or {}
+            if data_source.type == 'excel' and DataSourceService.get_sheet_name(candidate) != sheet_name:
+                continue
+            
+            if (
+                report.get('success')
+                and report.get('pipeline_version') == PIPELINE_VERSION
+                and os.path.exists(candidate.cleaned_path)
+                and candidate.preview_path
+                and os.path.exists(candidate.preview_path)
+            ):
+                return candidate
+        
+        return None
+    
+    @staticmethod
+    def _reuse_processing(db: Session, data_source: DataSource, duplicate: DataSource) -> None:
+        """Point a new upload at the processed outputs of an identical earlier upload."""
+        report = dict(duplicate.processing_report)
+        report['reused_from'] = str(duplicate.id)
+        
+        DataSourceService.apply_pipeline_report(data_source, report)
+        data_source.status = 'connected'
+        
+        db.commit()
+        db.refresh(data_source)
+    
+    @staticmethod
+    def _is_shared_file(db: Session, data_source: DataSource, path: str) -> bool:
+        """True if another data source reuses this processed file (deduplicated upload)."""
+        return db.query(DataSource).filter(
+            DataSource.id != data_source.id,
+            or_(DataSource.cleaned_path == path, DataSource.preview_path == path)
+        ).first() is not None
+    
+    @staticmethod
+    def finalize_upload(db: Session, data_source: DataSource, report: dict) -> None:
+        """
+        Store the outcome of an upload's pipeline run.
+        
+        - Success: full pipeline metadata, status 'connected'
+        - Failure after Layer 1: basic metadata from completed layers, status 'connected'
+        - Layer 1 failure (file unreadable): status 'error'
+        """
+        layers = report.get('layers', {})
+        
+        if 'layer1' in layers:
+            # Basic metadata comes from whichever layers completed
+            row_count, columns_info, quality_report_basic = DataSourceService._basic_metadata_from_report(report)
+            data_source.row_count = row_count
+            data_source.columns_info = columns_info
+            data_source.connection_info = quality_report_basic  # Keep for backward compatibility
+        
+        if report['success']:
+            DataSourceService.apply_pipeline_report(data_source, report)
+            data_source.status = 'connected'
+            logger.info(f"✅ Pipeline complete: quality {data_source.quality_score}, duration {data_source.processing_duration_seconds}s")
+        elif 'layer1' in layers:
+            # Pipeline failed after ingestion, keep basic metadata
+            logger.warning(f"⚠️ Pipeline failed: {report.get('error')}")
+            data_source.status = 'connected'
+        else:
+            logger.error(f"❌ Pipeline could not ingest {data_source.file_path}: {report.get('error')}")
+            data_source.status = 'error'
+        
+        db.commit()
+        db.refresh(data_source)
+    
+    @staticmethod
+    def apply_pipeline_report(data_source: DataSource, pipeline_report: dict) -> None:
+        """Copy the results of a successful pipeline run onto a data source."""
+        data_source.processing_report = pipeline_report
+        data_source.quality_score = pipeline_report['final_stats']['quality_score']
+        data_source.quality_level = pipeline_report['final_stats']['quality_level']
+        data_source.row_count = pipeline_report['final_stats']['rows']
+        data_source.processing_duration_seconds = pipeline_report['duration_seconds']
+        data_source.last_processed_at = datetime.utcnow()
+        
+        # Extract paths
+        layer7 = pipeline_report['layers']['layer7']
+        data_source.cleaned_path = layer7['storage']['parquet_path']
+        data_source.preview_path = layer7['storage']['preview_path']
+        
+        # Extract column mapping and stats
+        data_source.column_mapping = pipeline_report['layers']['layer3']['column_mapping']
+        data_source.column_stats = layer7['column_stats']
+        
+        # Extract enhanced columns_info
+        columns_info = []
+        layer4 = pipeline_report['layers']['layer4']
+        for col, info in layer4['type_info'].items():
+            columns_info.append({
+                'name': col,
+                'type': info['detected_type'],
+                'original_dtype': info['original_dtype'],
+                'final_dtype': info['final_dtype']
+            })
+        data_source.columns_info = columns_info
+    
+    @staticmethod
+    def _basic_metadata_from_report(report: dict) -> tuple:
+        """
+        Build basic metadata from the layers a pipeline run completed.
+        
+        Layer 1 always provides row/column counts and raw dtypes; Layer 6
+        and Layer 7 add quality and per-column stats when they ran.
+        
+        Returns:
+            Tuple of (row_count, columns_info, quality_report_basic)
+        """
+        layers = report.get('layers', {})
+        layer1 = layers['layer1']
+        column_stats = layers.get('layer7', {}).get('column_stats', {})
+        
+        columns_info = []
+        for col in layer1['columns']:
+            col_info = {
+                "name": str(col),
+                "type": layer1.get('dtypes', {}).get(str(col), 'object')
+            }
+            if col in column_stats:
+                col_info["null_count"] = column_stats[col]['null_count']
+                col_info["unique_count"] = column_stats[col]['unique_count']
+            columns_info.append(col_info)
+        
+        quality_report_basic = {
+            "total_rows": layer1['row_count'],
+            "total_columns": layer1['column_count']
+        }
+        if 'layer6' in layers:
+            dataset_stats = layers['layer6']['quality_report']['dataset_stats']
+            quality_report_basic.update({
+                "total_cells": dataset_stats['total_cells'],
+                "completeness_percentage": dataset_stats.get('completeness_percent', 0),
+                "null_cells": dataset_stats['missing_cells']
+            })
+        
+        return layer1['row_count'], columns_info, quality_report_basic
+    
+    @staticmethod
+    def get_sheet_name(data_source: DataSource) -> Union[int, str]:
+        """Excel sheet (index or name) the data source was processed from."""
+        report = data_source.processing_report or {}
+        layer1 = report.get('layers', {}).get('layer1', {})
+        
+        sheet_name = layer1.get('sheet_name')
+        return 0 if sheet_name is None else sheet_name
+    
+    @staticmethod
+    def _parse_options(data_source: DataSource) -> dict:
+        """Encoding and delimiter detected by pipeline Layer 1, for re-parsing the original file."""
+        report = data_source.processing_report or {}
+        layer1 = report.get('layers', {}).get('layer1', {})
+        
+        return {key: layer1[key] for key in ('encoding', 'delimiter') if layer1.get(key)}
+    
     @staticmethod
     def get_data_sources(
         db: Session,
@@ -250,6 +539,38 @@ class DataSourceService:
         
         return data_source
     
+    @staticmethod
+    def get_pipeline_performance(
+        db: Session,
+        user: User,
+        pipeline_version: Optional[str] = None
+    ) -> dict:
+        """
+        Aggregate per-layer pipeline timings across a user's data sources.
+        
+        Args:
+            pipeline_version: Only include reports from this pipeline version
+        
+        Returns:
+            LayerProfiler.aggregate() output plus the versions included
+        """
+        report = DataSource.processing_report
+        query = db.query(report['performance'], report['pipeline_version'].astext)\
+            .filter(
+                DataSource.user_id == user.id,
+                report['performance'].isnot(None)
+            )
+        
+        if pipeline_version:
+            query = query.filter(report['pipeline_version'].astext == pipeline_version)
+        
+        rows = query.all()
+        
+        aggregate = LayerProfiler.aggregate([performance for performance, _ in rows])
+        aggregate['pipeline_versions'] = sorted({version for _, version in rows if version})
+        
+        return aggregate
+    
     @staticmethod
     def delete_data_source(
         db: Session,
@@ -259,14 +580,29 @@ class DataSourceService:
         """Delete a data source."""
         data_source = DataSourceService.get_data_source(db, user, data_source_id)
         
-        if data_source.cleaned_path and os.path.exists(data_source.cleaned_path):
+        # Its pipeline run would write results for a deleted source
+        if data_source.status == 'processing':
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Data source is being processed; delete it when processing finishes"
+            )
+        
+        if (
+            data_source.cleaned_path
+            and os.path.exists(data_source.cleaned_path)
+            and not DataSourceService._is_shared_file(db, data_source, data_source.cleaned_path)
+        ):
             try:
                 os.remove(data_source.cleaned_path)
                 logger.info(f"Deleted cleaned file: {data_source.cleaned_path}")
             except Exception as e:
                 logger.warning(f"Could not delete cleaned file: {e}")
         
-        if data_source.preview_path and os.path.exists(data_source.preview_path):
+        if (
+            data_source.preview_path
+            and os.path.exists(data_source.preview_path)
+            and not DataSourceService._is_shared_file(db, data_source, data_source.preview_path)
+        ):
             try:
                 os.remove(data_source.preview_path)
                 logger.info(f"Deleted preview file: {data_source.preview_path}")
@@ -304,7 +640,7 @@ class DataSourceService:
         if data_source.preview_path and os.path.exists(data_source.preview_path):
             logger.info(f"📦 Using cached preview for {data_source_id}")
             try:
-                df = pd.read_parquet(data_source.preview_path)
+                df = StorageLayer.read(data_source.preview_path)
                 df = df.head(limit)
                 
                 # IMPORTANT: Replace NaN with None for JSON
@@ -333,15 +669,15 @@ class DataSourceService:
             )
         
         try:
-            # Read file based on type
-            with open(data_source.file_path, 'rb') as f:
-                content = f.read()
-            
             # Get original filename from path
             filename = os.path.basename(data_source.file_path)
             
-            # Parse with FileParser
-            df = FileParser.parse_file(filename, content)
+            # Parse with FileParser (reads directly from disk)
+            df = FileParser.parse_file(
+                filename,
+                data_source.file_path,
+                **DataSourceService._parse_options(data_source)
+            )
             
             # Limit rows
             df = df.head(limit)
@@ -392,7 +728,7 @@ class DataSourceService:
         if data_source.cleaned_path and os.path.exists(data_source.cleaned_path):
             logger.info(f" Loading cleaned data from Parquet: {data_source_id}")
             try:
-                df = pd.read_parquet(data_source.cleaned_path)
+                df = StorageLayer.read(data_source.cleaned_path)
                 logger.info(f" Loaded {len(df)} rows, {len(df.columns)} columns from Parquet")
                 return df
             except Exception as e:
@@ -408,11 +744,12 @@ class DataSourceService:
             )
         
         try:
-            with open(data_source.file_path, 'rb') as f:
-                content = f.read()
-            
             filename = os.path.basename(data_source.file_path)
-            df = FileParser.parse_file(filename, content)
+            df = FileParser.parse_file(
+                filename,
+                data_source.file_path,
+                **DataSourceService._parse_options(data_source)
+            )
             
             logger.info(f" Loaded {len(df)} rows from original file")
             return df
@@ -460,8 +797,8 @@ class DataSourceService:
             )
         
         try:
-            contents = await file.read()
-            sheets = FileParser.get_excel_sheets(contents)
+            # Workbook metadata only; read from the spooled upload, not into memory
+            sheets = FileParser.get_excel_sheets(file.file)
             return {
                 "filename": file.filename,
                 "sheets": sheets,
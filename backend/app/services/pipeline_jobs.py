@@ -0,0 +1,401 @@
+"""
+Background pipeline jobs.
+
+Uploads are saved in the request and then processed by the 7-layer
+pipeline in a bounded process pool. Job state lives in Redis so that
+worker processes can publish progress and any API worker can answer
+status requests.
+"""
+import asyncio
+import json
+import logging
+import multiprocessing
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterator, Optional, Union
+
+import redis
+
+from app.config import settings
+from app.services.data_pipeline import DataPipeline
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineJobStore:
+    """Redis-backed store for pipeline job state."""
+    
+    KEY_PREFIX = "pipeline_job"
+    
+    # Heartbeats of data sources being processed (by any process)
+    HEARTBEAT_PREFIX = "pipeline_heartbeat"
+    
+    def __init__(self):
+        """Initialize Redis connection for job state."""
+        self.redis_client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    
+    def _key(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{job_id}"
+    
+    def create(self, data_source_id: str, user_id: str) -> Dict[str, Any]:
+        """Create a queued job for a data source."""
+        now = datetime.utcnow().isoformat()
+        job = {
+            "job_id": str(uuid.uuid4()),
+            "data_source_id": str(data_source_id),
+            "user_id": str(user_id),
+            "status": "queued",
+            "current_layer": None,
+            "layers_completed": 0,
+            "progress": 0.0,
+            "error": None,
+            "created_at": now,
+            "updated_at": now
+        }
+        self._save(job)
+        return job
+    
+    def update(self, job_id: str, **fields) -> Optional[Dict[str, Any]]:
+        """Merge fields into an existing job."""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        
+        job.update(fields)
+        job["updated_at"] = datetime.utcnow().isoformat()
+        self._save(job)
+        return job
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get job state, or None if unknown or expired."""
+        raw = self.redis_client.get(self._key(job_id))
+        return json.loads(raw) if raw else None
+    
+    def iter_jobs(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over all jobs that have not expired."""
+        for key in self.redis_client.scan_iter(match=f"{self.KEY_PREFIX}:*", count=500):
+            raw = self.redis_client.get(key)
+            if raw:
+                yield json.loads(raw)
+    
+    def heartbeat(self, data_source_id: str) -> None:
+        """Record that a data source is still being processed; lapses after three missed heartbeats."""
+        self.redis_client.setex(
+            f"{self.HEARTBEAT_PREFIX}:{data_source_id}",
+            3 * settings.PIPELINE_HEARTBEAT_SECONDS,
+            datetime.utcnow().isoformat()
+        )
+    
+    def is_alive(self, data_source_id: str) -> bool:
+        """Whether some process has recently sent a heartbeat for a data source."""
+        return bool(self.redis_client.exists(f"{self.HEARTBEAT_PREFIX}:{data_source_id}"))
+    
+    def _save(self, job: Dict[str, Any]) -> None:
+        self.redis_client.setex(
+            self._key(job["job_id"]),
+            settings.PIPELINE_JOB_TTL_SECONDS,
+            json.dumps(job)
+        )
+
+
+def build_pipeline() -> DataPipeline:
+    """Pipeline configured from settings."""
+    return DataPipeline(
+        settings.STORAGE_PATH,
+        streaming=settings.PIPELINE_STREAMING_INGESTION,
+        chunk_rows=settings.PIPELINE_CHUNK_ROWS,
+        csv_engine=settings.CSV_PARSER_ENGINE,
+        json_max_depth=settings.JSON_FLATTEN_MAX_DEPTH,
+        column_workers=settings.PIPELINE_COLUMN_WORKERS,
+        parallel_min_columns=settings.PIPELINE_PARALLEL_MIN_COLUMNS,
+        sketch_min_rows=settings.PIPELINE_SKETCH_MIN_ROWS,
+        sketch_error=settings.PIPELINE_SKETCH_ERROR,
+        checkpoints=settings.PIPELINE_CHECKPOINTS,
+        checkpoint_max_bytes=settings.PIPELINE_CHECKPOINT_MAX_BYTES,
+        checkpoint_min_free_bytes=settings.PIPELINE_CHECKPOINT_MIN_FREE_BYTES,
+        arrow_dtypes=settings.PIPELINE_ARROW_DTYPES,
+        parquet_compression=settings.PARQUET_COMPRESSION,
+        parquet_compression_level=settings.PARQUET_COMPRESSION_LEVEL or None,
+        parquet_row_group_rows=settings.PARQUET_ROW_GROUP_ROWS,
+        parquet_downcast=settings.PARQUET_DOWNCAST,
+        parquet_measure_read=settings.PARQUET_MEASURE_READ,
+        sample_rows=settings.PIPELINE_SAMPLE_ROWS
+    )
+
+
+# Per-process state for pool workers
+_worker_pipeline: Optional[DataPipeline] = None
+_worker_store: Optional[PipelineJobStore] = None
+
+
+def run_pipeline_job(
+    job_id: str,
+    file_path: str,
+    source_type: str,
+    source_id: str,
+    sheet_name: Union[int, str] = 0
+) -> Dict[str, Any]:
+    """
+    Run the pipeline for one job. Executed inside a pool worker process.
+    
+    Returns:
+        Pipeline processing report
+    """
+    global _worker_pipeline, _worker_store
+    
+    if _worker_pipeline is None:
+        _worker_pipeline = build_pipeline()
+        _worker_store = PipelineJobStore()
+    
+    store = _worker_store
+    layer_count = len(DataPipeline.LAYER_NAMES)
+    
+    def on_progress(layer_number: int, layer_name: str) -> None:
+        store.update(
+            job_id,
+            status="processing",
+            current_layer=f"layer{layer_number}_{layer_name}",
+            layers_completed=layer_number - 1,
+            progress=round((layer_number - 1) / layer_count * 100, 1)
+        )
+    
+    return _worker_pipeline.process(
+        file_path=file_path,
+        source_type=source_type,
+        source_id=source_id,
+        sheet_name=sheet_name,
+        progress_callback=on_progress
+    )
+
+
+class PipelineJobManager:
+    """Runs pipeline jobs in a bounded process pool and records their outcome."""
+    
+    def __init__(self):
+        self.store = PipelineJobStore()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the pool on first use (spawned workers do not inherit the event loop)."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=settings.PIPELINE_MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+    
+    def submit(
+        self,
+        data_source_id: str,
+        user_id: str,
+        file_path: str,
+        source_type: str,
+        sheet_name: Union[int, str] = 0
+    ) -> Dict[str, Any]:
+        """
+        Queue a data source for pipeline processing.
+        
+        Must be called from a running event loop.
+        
+        Returns:
+            The created job
+        """
+        job = self.store.create(data_source_id, user_id)
+        
+        task = asyncio.create_task(
+            self._run(job["job_id"], str(data_source_id), file_path, source_type, sheet_name)
+        )
+        self._tasks[job["job_id"]] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job["job_id"], None))
+        
+        logger.info(f"Queued pipeline job {job['job_id']} for data source {data_source_id}")
+        return job
+    
+    def create_completed(self, data_source_id: str, user_id: str) -> Dict[str, Any]:
+        """Record a job for a data source that was processed without the pool."""
+        job = self.store.create(data_source_id, user_id)
+        return self.store.update(
+            job["job_id"],
+            status="completed",
+            layers_completed=len(DataPipeline.LAYER_NAMES),
+            progress=100.0
+        )
+    
+    async def wait(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Wait for a job started by this process to finish and return its final state."""
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.shield(task)
+        return self.store.get(job_id)
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get job state."""
+        return self.store.get(job_id)
+    
+    async def _run(
+        self,
+        job_id: str,
+        data_source_id: str,
+        file_path: str,
+        source_type: str,
+        sheet_name: Union[int, str]
+    ) -> None:
+        """Execute the pipeline off the event loop and store the result."""
+        # Imported here: data_service imports this module
+        from app.db.session import SessionLocal
+        from app.models.data_source import DataSource
+        from app.services.data_service import DataSourceService
+        
+        loop = asyncio.get_running_loop()
+        heartbeat = asyncio.create_task(self._heartbeat(data_source_id))
+        
+        try:
+            report = await loop.run_in_executor(
+                self._get_executor(),
+                run_pipeline_job,
+                job_id,
+                file_path,
+                source_type,
+                data_source_id,
+                sheet_name
+            )
+        except asyncio.CancelledError:
+            # Not an Exception: the pool or the event loop shut down mid-job
+            self._fail(job_id, data_source_id, "Processing was interrupted by a server shutdown")
+            raise
+        except Exception as e:
+            logger.error(f"Pipeline job {job_id} crashed: {str(e)}", exc_info=True)
+            report = {
+                'success': False,
+                'error': str(e),
+                'error_type': type(e).__name__,
+                'layers': {}
+            }
+        finally:
+            heartbeat.cancel()
+        
+        db = SessionLocal()
+        try:
+            data_source = db.query(DataSource).filter(DataSource.id == uuid.UUID(data_source_id)).first()
+            
+            if data_source is None:
+                final_status = None
+                report['error'] = "Data source was deleted during processing"
+            else:
+                DataSourceService.finalize_upload(db, data_source, report)
+                final_status = data_source.status
+        except Exception as e:
+            logger.error(f"Failed to store result of pipeline job {job_id}: {str(e)}", exc_info=True)
+            final_status = None
+            report['error'] = str(e)
+        finally:
+            db.close()
+        
+        if final_status == 'connected':
+            self.store.update(
+                job_id,
+                status="completed",
+                current_layer=None,
+                layers_completed=len(report.get('layers', {})),
+                progress=100.0,
+                error=report.get('error')
+            )
+        else:
+            self.store.update(job_id, status="failed", error=report.get('error'))
+    
+    async def _heartbeat(self, data_source_id: str) -> None:
+        """Send heartbeats for a data source until cancelled (see recover_stale)."""
+        while True:
+            try:
+                self.store.heartbeat(data_source_id)
+            except redis.RedisError as e:
+                logger.warning(f"Heartbeat for data source {data_source_id} failed: {str(e)}")
+            await asyncio.sleep(settings.PIPELINE_HEARTBEAT_SECONDS)
+    
+    def _fail(self, job_id: str, data_source_id: str, error: str) -> None:
+        """Mark a job failed and its data source 'error' if it is still processing."""
+        from app.db.session import SessionLocal
+        from app.models.data_source import DataSource
+        
+        job = self.store.get(job_id)
+        if job is not None and job["status"] == "failed":
+            return
+        
+        logger.warning(f"Pipeline job {job_id} failed: {error}")
+        
+        db = SessionLocal()
+        try:
+            data_source = db.query(DataSource).filter(DataSource.id == uuid.UUID(data_source_id)).first()
+            if data_source is not None and data_source.status == 'processing':
+                data_source.status = 'error'
+                db.commit()
+        except Exception as e:
+            logger.error(f"Failed to mark data source {data_source_id} as error: {str(e)}", exc_info=True)
+        finally:
+            db.close()
+        
+        self.store.update(job_id, status="failed", error=error)
+    
+    def recover_stale(self) -> int:
+        """
+        Fail jobs and data sources left 'processing' by an API process that stopped mid-job.
+        
+        Jobs only live in the process that queued them, so a crash or kill
+        leaves their data sources 'processing' for good. Whatever processes
+        a source (a job of any API worker, a bulk reprocessing run) keeps a
+        Redis heartbeat for it; a source left 'processing' whose heartbeat
+        has lapsed is marked 'error' (its file is kept, so it can be
+        reprocessed) and its unfinished jobs failed. Sources updated within
+        PIPELINE_STALE_AFTER_SECONDS are left alone too, as their job may
+        not have started yet. Called on startup.
+        
+        Returns:
+            Number of data sources marked 'error'
+        """
+        from app.db.session import SessionLocal
+        from app.models.data_source import DataSource
+        
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.PIPELINE_STALE_AFTER_SECONDS)
+        error = "Processing was interrupted by a server restart; reprocess the data source"
+        
+        db = SessionLocal()
+        try:
+            candidates = db.query(DataSource).filter(
+                DataSource.status == 'processing',
+                DataSource.updated_at < cutoff
+            ).all()
+            stale = [data_source for data_source in candidates if not self.store.is_alive(str(data_source.id))]
+            for data_source in stale:
+                data_source.status = 'error'
+            db.commit()
+            stale_ids = {str(data_source.id) for data_source in stale}
+        finally:
+            db.close()
+        
+        for job in self.store.iter_jobs():
+            if job["status"] not in ("queued", "processing") or self.store.is_alive(job["data_source_id"]):
+                continue
+            if job["data_source_id"] in stale_ids or datetime.fromisoformat(job["updated_at"]) < cutoff:
+                self.store.update(job["job_id"], status="failed", error=error)
+        
+        if stale_ids:
+            logger.warning(f"Marked {len(stale_ids)} data sources left processing as error")
+        return len(stale_ids)
+    
+    def shutdown(self) -> None:
+        """Stop the worker pool; jobs that have not finished are marked failed."""
+        for job_id, task in list(self._tasks.items()):
+            job = self.store.get(job_id)
+            if job is not None and not task.done():
+                self._fail(job_id, job["data_source_id"], "Processing was interrupted by a server shutdown")
+            task.cancel()
+        
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global job manager instance
+pipeline_jobs = PipelineJobManager()
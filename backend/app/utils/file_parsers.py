@@ -1,11 +1,24 @@
 import pandas as pd
+import pyarrow as pa
+import io
 import json
+import os
 import logging
-from typing import Dict, Any, BinaryIO, Optional
+import zipfile
+from xml.etree import ElementTree
+from typing import Dict, Any, BinaryIO, Optional, Union
 from fastapi import HTTPException, status
+from app.config import settings
+from app.services.data_pipeline import IngestionLayer
 
 logger = logging.getLogger(__name__)
 
+# Raw bytes, or a path to a file already on disk
+FileSource = Union[bytes, str, os.PathLike]
+
+# SpreadsheetML namespace of xl/workbook.xml
+XLSX_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+
 class FileParser:
     """Utility for parsing different file formats into pandas DataFrames."""
     
@@ -14,28 +27,129 @@ class FileParser:
         '.xlsx': 'Excel File (xlsx)',
         '.xls': 'Excel File (xls)',
         '.json': 'JSON File',
+        '.jsonl': 'JSON Lines File',
+        '.ndjson': 'JSON Lines File (newline-delimited)',
         '.parquet': 'Parquet File',
         '.txt': 'Text File (Tab-separated)',
-        '.tsv': 'Tab-Separated Values'
+        '.tsv': 'Tab-Separated Values',
+        '.gz': 'Gzip-compressed CSV/TSV/JSON',
+        '.zst': 'Zstandard-compressed CSV/TSV/JSON',
+        '.zip': 'Zip archive with a single CSV/TSV/JSON file'
     }
     
+    # Formats that may be uploaded inside a compressed file (decompressed as a stream)
+    COMPRESSIBLE_FORMATS = ['.csv', '.tsv', '.txt', '.json', '.jsonl', '.ndjson']
+    
     @staticmethod
     def get_file_type(filename: str) -> str:
         """Get file extension from filename."""
         return '.' + filename.split('.')[-1].lower() if '.' in filename else ''
     
     @staticmethod
-    def parse_csv(content: bytes, **kwargs) -> pd.DataFrame:
-        """Parse CSV file."""
+    def get_content_type(filename: str, content: Optional[FileSource] = None) -> str:
+        """
+        Get the extension of the data inside a compressed file.
+        
+        'sales.csv.gz' -> '.csv'. Zip archives are opened to find their
+        single member when content is given. Uncompressed files return
+        get_file_type(filename).
+        """
+        file_type = FileParser.get_file_type(filename)
+        
+        if file_type == '.zip' and content is not None:
+            source = pd.io.common.BytesIO(content) if isinstance(content, (bytes, bytearray)) else content
+            with zipfile.ZipFile(source) as archive:
+                return FileParser.get_file_type(IngestionLayer.zip_member(archive).filename)
+        
+        if file_type in ('.gz', '.zst'):
+            return FileParser.get_file_type(filename[:-len(file_type)])
+        
+        return file_type
+    
+    @staticmethod
+    def get_compressed_content_type(filename: str, content: FileSource) -> str:
+        """Get the content type of a compressed file, rejecting unsupported or invalid archives."""
+        try:
+            file_type = FileParser.get_content_type(filename, content)
+        except (zipfile.BadZipFile, ValueError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid compressed file: {str(e)}"
+            )
+        
+        if file_type not in FileParser.COMPRESSIBLE_FORMATS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported compressed file type: {file_type or 'unknown'}. Supported: {', '.join(FileParser.COMPRESSIBLE_FORMATS)}"
+            )
+        
+        return file_type
+    
+    @staticmethod
+    def _as_input(content: FileSource):
+        """Wrap raw bytes in a buffer; paths are passed through so pandas reads from disk."""
+        if isinstance(content, (bytes, bytearray)):
+            return pd.io.common.BytesIO(content)
+        if IngestionLayer.detect_compression(content):
+            # Decompressed as pandas reads
+            return IngestionLayer.open_input(content)
+        return content
+    
+    @staticmethod
+    def _parse_delimited_arrow(
+        content: FileSource,
+        encoding: Optional[str],
+        delimiter: str
+    ) -> Optional[pd.DataFrame]:
+        """Parse with the multithreaded Arrow engine; None means fall back to pandas."""
+        try:
+            source = content if isinstance(content, (bytes, bytearray)) else os.fspath(content)
+            return IngestionLayer.read_csv_arrow(source, encoding=encoding, delimiter=delimiter)
+        except (pa.ArrowInvalid, UnicodeDecodeError) as e:
+            logger.warning(f"Arrow CSV parser failed, falling back to pandas: {str(e)}")
+            return None
+    
+    @staticmethod
+    def parse_csv(
+        content: FileSource,
+        engine: Optional[str] = None,
+        encoding: Optional[str] = None,
+        delimiter: Optional[str] = None,
+        **kwargs
+    ) -> pd.DataFrame:
+        """
+        Parse CSV file.
+        
+        Args:
+            content: File content as bytes, or path to the file on disk
+            engine: 'pandas' or 'pyarrow' (default: settings.CSV_PARSER_ENGINE)
+            encoding: Known encoding, e.g. detected by pipeline Layer 1
+            delimiter: Known delimiter, e.g. detected by pipeline Layer 1
+            **kwargs: Extra pandas.read_csv options (pandas engine only)
+        """
+        engine = engine or settings.CSV_PARSER_ENGINE
+        
+        if engine == 'pyarrow':
+            df = FileParser._parse_delimited_arrow(content, encoding, delimiter or ',')
+            if df is not None:
+                logger.info(f"Successfully parsed CSV (pyarrow): {len(df)} rows, {len(df.columns)} columns")
+                return df
+        
+        if encoding:
+            kwargs['encoding'] = encoding
+        if delimiter:
+            kwargs['sep'] = delimiter
+        
         try:
             # Try with default encoding
-            df = pd.read_csv(pd.io.common.BytesIO(content), **kwargs)
+            df = pd.read_csv(FileParser._as_input(content), **kwargs)
             logger.info(f"Successfully parsed CSV: {len(df)} rows, {len(df.columns)} columns")
             return df
         except UnicodeDecodeError:
             # Try with different encoding
             try:
-                df = pd.read_csv(pd.io.common.BytesIO(content), encoding='latin1', **kwargs)
+                kwargs['encoding'] = 'latin1'
+                df = pd.read_csv(FileParser._as_input(content), **kwargs)
                 logger.info(f"Parsed CSV with latin1 encoding: {len(df)} rows")
                 return df
             except Exception as e:
@@ -45,15 +159,15 @@ class FileParser:
                 )
     
     @staticmethod
-    def parse_excel(content: bytes, sheet_name: Optional[str] = None) -> pd.DataFrame:
+    def parse_excel(content: FileSource, sheet_name: Optional[str] = None) -> pd.DataFrame:
         """Parse Excel file (.xlsx or .xls)."""
         try:
             # Read Excel file
             if sheet_name:
-                df = pd.read_excel(pd.io.common.BytesIO(content), sheet_name=sheet_name)
+                df = pd.read_excel(FileParser._as_input(content), sheet_name=sheet_name)
             else:
                 # Read first sheet by default
-                df = pd.read_excel(pd.io.common.BytesIO(content), sheet_name=0)
+                df = pd.read_excel(FileParser._as_input(content), sheet_name=0)
             
             logger.info(f"Successfully parsed Excel: {len(df)} rows, {len(df.columns)} columns")
             return df
@@ -64,17 +178,38 @@ class FileParser:
             )
     
     @staticmethod
-    def parse_json(content: bytes) -> pd.DataFrame:
-        """Parse JSON file."""
+    def parse_json(
+        content: FileSource,
+        max_depth: Optional[int] = None,
+        json_lines: Optional[bool] = None
+    ) -> pd.DataFrame:
+        """
+        Parse JSON file.
+        
+        Arrays of records and JSON Lines are parsed incrementally into Arrow
+        batches with nested objects flattened up to max_depth; a single
+        top-level object is loaded whole. json_lines marks .jsonl/.ndjson
+        content, whose single line is one record (None: from the path).
+        """
+        max_depth = max_depth or settings.JSON_FLATTEN_MAX_DEPTH
+        
         try:
-            # Try to load as JSON
-            json_data = json.loads(content.decode('utf-8'))
+            source = content if isinstance(content, (bytes, bytearray)) else os.fspath(content)
+            table = IngestionLayer.read_json_arrow(source, max_depth=max_depth, json_lines=json_lines)
+            if table is not None:
+                df = IngestionLayer._nulls_to_nan(table.to_pandas())
+                logger.info(f"Successfully parsed JSON records: {len(df)} rows, {len(df.columns)} columns")
+                return df
+            
+            # Single top-level object
+            if isinstance(content, (bytes, bytearray)):
+                json_data = json.loads(content.decode('utf-8'))
+            else:
+                with io.TextIOWrapper(IngestionLayer.open_input(content), encoding='utf-8') as f:
+                    json_data = json.load(f)
             
             # Convert to DataFrame
-            if isinstance(json_data, list):
-                # List of objects
-                df = pd.DataFrame(json_data)
-            elif isinstance(json_data, dict):
+            if isinstance(json_data, dict):
                 # Single object or nested structure
                 # Try to flatten if needed
                 if all(isinstance(v, (list, dict)) for v in json_data.values()):
@@ -100,10 +235,10 @@ class FileParser:
             )
     
     @staticmethod
-    def parse_parquet(content: bytes) -> pd.DataFrame:
+    def parse_parquet(content: FileSource) -> pd.DataFrame:
         """Parse Parquet file."""
         try:
-            df = pd.read_parquet(pd.io.common.BytesIO(content))
+            df = pd.read_parquet(FileParser._as_input(content))
             logger.info(f"Successfully parsed Parquet: {len(df)} rows, {len(df.columns)} columns")
             return df
         except Exception as e:
@@ -113,10 +248,22 @@ class FileParser:
             )
     
     @staticmethod
-    def parse_tsv(content: bytes) -> pd.DataFrame:
+    def parse_tsv(
+        content: FileSource,
+        engine: Optional[str] = None,
+        encoding: Optional[str] = None
+    ) -> pd.DataFrame:
         """Parse TSV (Tab-Separated Values) file."""
+        engine = engine or settings.CSV_PARSER_ENGINE
+        
+        if engine == 'pyarrow':
+            df = FileParser._parse_delimited_arrow(content, encoding, '\t')
+            if df is not None:
+                logger.info(f"Successfully parsed TSV (pyarrow): {len(df)} rows, {len(df.columns)} columns")
+                return df
+        
         try:
-            df = pd.read_csv(pd.io.common.BytesIO(content), sep='\t')
+            df = pd.read_csv(FileParser._as_input(content), sep='\t', encoding=encoding)
             logger.info(f"Successfully parsed TSV: {len(df)} rows, {len(df.columns)} columns")
             return df
         except Exception as e:
@@ -126,14 +273,16 @@ class FileParser:
             )
     
     @staticmethod
-    def parse_file(filename: str, content: bytes, **kwargs) -> pd.DataFrame:
+    def parse_file(filename: str, content: FileSource, **kwargs) -> pd.DataFrame:
         """
         Parse file based on extension.
         
         Args:
             filename: Name of the file
-            content: File content as bytes
-            **kwargs: Additional parameters (e.g., sheet_name for Excel)
+            content: File content as bytes, or path to the file on disk
+                     (.gz, .zst and .zip are decompressed while parsing)
+            **kwargs: Additional parameters (e.g., sheet_name for Excel;
+                      engine, encoding and delimiter for CSV/TSV)
             
         Returns:
             Parsed DataFrame
@@ -146,20 +295,38 @@ class FileParser:
                 detail=f"Unsupported file type: {file_type}. Supported: {', '.join(FileParser.SUPPORTED_FORMATS.keys())}"
             )
         
+        compression = IngestionLayer.COMPRESSIONS.get(file_type)
+        if compression:
+            file_type = FileParser.get_compressed_content_type(filename, content)
+            
+            if isinstance(content, (bytes, bytearray)):
+                # In-memory content is small enough to decompress up front
+                with IngestionLayer.open_input(content, compression) as f:
+                    content = f.read()
+        
         logger.info(f"Parsing file: {filename} (type: {file_type})")
         
         # Route to appropriate parser
         if file_type == '.csv':
-            return FileParser.parse_csv(content)
+            return FileParser.parse_csv(
+                content,
+                engine=kwargs.get('engine'),
+                encoding=kwargs.get('encoding'),
+                delimiter=kwargs.get('delimiter')
+            )
         elif file_type in ['.xlsx', '.xls']:
             sheet_name = kwargs.get('sheet_name')
             return FileParser.parse_excel(content, sheet_name)
-        elif file_type == '.json':
-            return FileParser.parse_json(content)
+        elif file_type in ['.json', '.jsonl', '.ndjson']:
+            return FileParser.parse_json(content, json_lines=file_type in IngestionLayer.JSON_LINES_SUFFIXES)
         elif file_type == '.parquet':
             return FileParser.parse_parquet(content)
         elif file_type in ['.txt', '.tsv']:
-            return FileParser.parse_tsv(content)
+            return FileParser.parse_tsv(
+                content,
+                engine=kwargs.get('engine'),
+                encoding=kwargs.get('encoding')
+            )
         else:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -167,11 +334,36 @@ class FileParser:
             )
     
     @staticmethod
-    def get_excel_sheets(content: bytes) -> list:
-        """Get list of sheet names from Excel file."""
+    def get_excel_sheets(content: Union[FileSource, BinaryIO]) -> list:
+        """
+        Get list of sheet names from Excel file.
+        
+        Only workbook metadata is read (xl/workbook.xml for .xlsx, the
+        on-demand sheet index for .xls); no cell data is loaded.
+        
+        Args:
+            content: File bytes, path on disk, or a seekable binary file object
+        """
         try:
-            excel_file = pd.ExcelFile(pd.io.common.BytesIO(content))
-            return excel_file.sheet_names
+            source = FileParser._as_input(content)
+            
+            if zipfile.is_zipfile(source):
+                with zipfile.ZipFile(source) as archive:
+                    with archive.open('xl/workbook.xml') as workbook_xml:
+                        root = ElementTree.parse(workbook_xml).getroot()
+                return [sheet.get('name') for sheet in root.iter(f"{{{XLSX_MAIN_NS}}}sheet")]
+            
+            # Legacy .xls
+            import xlrd
+            if isinstance(source, (str, os.PathLike)):
+                book = xlrd.open_workbook(os.fspath(source), on_demand=True)
+            else:
+                source.seek(0)
+                book = xlrd.open_workbook(file_contents=source.read(), on_demand=True)
+            try:
+                return book.sheet_names()
+            finally:
+                book.release_resources()
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -0,0 +1,121 @@
+import hashlib
+import logging
+import os
+import zipfile
+from typing import Dict, Any
+from fastapi import HTTPException, status, UploadFile
+from app.services.data_pipeline import IngestionLayer
+
+logger = logging.getLogger(__name__)
+
+class UploadStorage:
+    """Utility for writing uploaded files to disk without buffering them in memory."""
+
+    DEFAULT_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+    @staticmethod
+    async def spool_to_disk(
+        file: UploadFile,
+        dest_path: str,
+        max_bytes: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Stream an uploaded file to disk in fixed-size chunks.
+
+        The size limit is enforced and the SHA-256 content hash is computed
+        while the bytes arrive, so peak memory is one chunk regardless of
+        file size. A partially written file is removed on failure.
+
+        Args:
+            file: Incoming upload
+            dest_path: Destination path on disk
+            max_bytes: Maximum allowed file size in bytes
+            chunk_size: Number of bytes read per chunk
+
+        Returns:
+            Dictionary with file_size and content_hash
+
+        Raises:
+            HTTPException if the file exceeds max_bytes
+        """
+        hasher = hashlib.sha256()
+        file_size = 0
+
+        try:
+            with open(dest_path, 'wb') as f:
+                while True:
+                    chunk = await file.read(chunk_size)
+                    if not chunk:
+                        break
+
+                    file_size += len(chunk)
+                    if file_size > max_bytes:
+                        raise HTTPException(
+                            status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"File size exceeds maximum allowed size of {max_bytes // (1024 * 1024)}MB"
+                        )
+
+                    hasher.update(chunk)
+                    f.write(chunk)
+        except BaseException:
+            # Never leave a truncated upload behind
+            if os.path.exists(dest_path):
+                os.remove(dest_path)
+            raise
+
+        logger.info(f"Spooled upload to {dest_path}: {file_size:,} bytes")
+
+        return {
+            "file_size": file_size,
+            "content_hash": hasher.hexdigest()
+        }
+
+    @staticmethod
+    def check_decompressed_size(
+        file_path: str,
+        max_bytes: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> int:
+        """
+        Decompress a compressed upload as a stream and enforce the size limit.
+
+        Only the count of decompressed bytes is kept, and reading stops as
+        soon as the limit is passed, so a decompression bomb costs at most
+        max_bytes of work and one chunk of memory.
+
+        Args:
+            file_path: Path to a .gz, .zst or .zip upload
+            max_bytes: Maximum allowed decompressed size in bytes
+            chunk_size: Number of decompressed bytes read per chunk
+
+        Returns:
+            Decompressed size in bytes
+
+        Raises:
+            HTTPException if the decompressed data exceeds max_bytes or the file is corrupt
+        """
+        decompressed_size = 0
+
+        try:
+            with IngestionLayer.open_input(file_path) as f:
+                while True:
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        break
+
+                    decompressed_size += len(chunk)
+                    if decompressed_size > max_bytes:
+                        raise HTTPException(
+                            status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Decompressed file size exceeds maximum allowed size of {max_bytes // (1024 * 1024)}MB"
+                        )
+        except (OSError, EOFError, ValueError, zipfile.BadZipFile) as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid compressed file: {str(e)}"
+            )
+
+        logger.info(f"Checked compressed upload {file_path}: {decompressed_size:,} bytes decompressed")
+
+        return decompressed_size
@@ -1,19 +1,42 @@
 import pandas as pd
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional
 import logging
 from datetime import datetime
 import pandas as pd
 
+from app.services.data_pipeline import ColumnProfiler
+
 logger = logging.getLogger(__name__)
 
 class DataValidator:
     """Utility for validating uploaded data."""
     
+    # Sensor and survey exports legitimately run to thousands of columns;
+    # wider than this more likely means a delimiter or quoting problem
+    MAX_EXPECTED_COLUMNS = 10_000
+    
+    @staticmethod
+    def profile(df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        """
+        Compute column statistics once, to share between the checks below.
+        
+        Returns:
+            Dict of column name -> column profile
+        """
+        return ColumnProfiler().profile(df)
+    
     @staticmethod
-    def validate_csv_structure(df: pd.DataFrame) -> Tuple[bool, List[str]]:
+    def validate_csv_structure(
+        df: pd.DataFrame,
+        profile: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Tuple[bool, List[str]]:
         """
         Validate CSV file structure and data quality.
         
+        Args:
+            df: Parsed data
+            profile: Column profile from profile() (computed if not given)
+        
         Returns:
             Tuple of (is_valid, list_of_issues)
         """
@@ -34,21 +57,24 @@ class DataValidator:
         if duplicate_cols:
             issues.append(f"Duplicate column names found: {', '.join(duplicate_cols)}")
         
+        if profile is None:
+            profile = DataValidator.profile(df)
+        
         # Check for columns with all null values
-        all_null_cols = [col for col in df.columns if df[col].isnull().all()]
+        all_null_cols = [col for col in df.columns if profile[col]['non_null_count'] == 0]
         if all_null_cols:
             issues.append(f"Columns with all null values: {', '.join(all_null_cols)}")
         
         # Check data quality
         total_cells = df.shape[0] * df.shape[1]
-        null_cells = df.isnull().sum().sum()
+        null_cells = sum(profile[col]['null_count'] for col in df.columns)
         null_percentage = (null_cells / total_cells) * 100 if total_cells > 0 else 0
         
         if null_percentage > 50:
             issues.append(f"High percentage of missing data: {null_percentage:.1f}%")
         
         # Check for very wide DataFrames (potential parsing issues)
-        if df.shape[1] > 100:
+        if df.shape[1] > DataValidator.MAX_EXPECTED_COLUMNS:
             issues.append(f"Unusually high number of columns: {df.shape[1]}. Possible CSV parsing issue?")
         
         # Check for very narrow DataFrames
@@ -60,17 +86,29 @@ class DataValidator:
         return is_valid, issues
     
     @staticmethod
-    def infer_column_types(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def infer_column_types(
+        df: pd.DataFrame,
+        profile: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Infer and validate column data types with enhanced detection.
         
+        Args:
+            df: Parsed data
+            profile: Column profile from profile() (computed if not given)
+        
         Returns:
             List of column information with better type detection
         """
+        if profile is None:
+            profile = DataValidator.profile(df)
+        
         columns_info = []
         
         for col in df.columns:
-            dtype = str(df[col].dtype)
+            stats = profile[col]
+            dtype = stats['dtype']
+            unique_count = stats['unique_count']
             
             # Get sample values and convert to JSON-serializable format
             sample_values = df[col].dropna().head(3).tolist()
@@ -85,16 +123,16 @@ class DataValidator:
             col_info = {
                 "name": col,
                 "type": dtype,
-                "null_count": int(df[col].isnull().sum()),
-                "unique_count": int(df[col].nunique()),
+                "null_count": stats['null_count'],
+                "unique_count": unique_count,
                 "sample_values": sample_values  # Now JSON-serializable
             }
             
             # Try to detect if numeric column is actually categorical
             if pd.api.types.is_numeric_dtype(df[col]):
-                unique_ratio = df[col].nunique() / len(df[col]) if len(df[col]) > 0 else 0
+                unique_ratio = unique_count / stats['rows'] if stats['rows'] > 0 else 0
                 
-                if unique_ratio < 0.05 and df[col].nunique() < 20:
+                if unique_ratio < 0.05 and unique_count < 20:
                     col_info["suggested_type"] = "categorical"
                     # Convert categories dict values to JSON-serializable
                     categories = df[col].value_counts().head(10).to_dict()
@@ -102,9 +140,8 @@ class DataValidator:
                 else:
                     col_info["suggested_type"] = "numeric"
                     col_info["stats"] = {
-                        "min": float(df[col].min()) if not df[col].empty else None,
-                        "max": float(df[col].max()) if not df[col].empty else None,
-                        "mean": float(df[col].mean()) if not df[col].empty else None
+                        key: stats.get(key) if stats['rows'] > 0 else None
+                        for key in ("min", "max", "mean")
                     }
             
             # Try to detect datetime columns
@@ -115,9 +152,9 @@ class DataValidator:
                     col_info["suggested_type"] = "datetime"
                 except:
                     # Check if it's categorical
-                    unique_ratio = df[col].nunique() / len(df[col]) if len(df[col]) > 0 else 0
+                    unique_ratio = unique_count / stats['rows'] if stats['rows'] > 0 else 0
                     
-                    if unique_ratio < 0.1 or df[col].nunique() < 50:
+                    if unique_ratio < 0.1 or unique_count < 50:
                         col_info["suggested_type"] = "categorical"
                         # Convert to JSON-serializable
                         categories = df[col].value_counts().head(10).to_dict()
@@ -130,15 +167,25 @@ class DataValidator:
         return columns_info
     
     @staticmethod
-    def get_data_quality_report(df: pd.DataFrame) -> Dict[str, Any]:
+    def get_data_quality_report(
+        df: pd.DataFrame,
+        profile: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
         """
         Generate comprehensive data quality report.
         
+        Args:
+            df: Parsed data
+            profile: Column profile from profile() (computed if not given)
+        
         Returns:
             Dictionary with data quality metrics (all JSON-serializable)
         """
+        if profile is None:
+            profile = DataValidator.profile(df)
+        
         total_cells = df.shape[0] * df.shape[1]
-        null_cells = df.isnull().sum().sum()
+        null_cells = sum(profile[col]['null_count'] for col in df.columns)
         
         # Calculate completeness
         completeness = ((total_cells - null_cells) / total_cells * 100) if total_cells > 0 else 0
@@ -146,7 +193,7 @@ class DataValidator:
         # Find columns with missing data
         columns_with_nulls = []
         for col in df.columns:
-            null_count = df[col].isnull().sum()
+            null_count = profile[col]['null_count']
             if null_count > 0:
                 columns_with_nulls.append({
                     "column": str(col),  # Convert to string
@@ -0,0 +1,12 @@
+"""
+Benchmarks Package
+Performance measurements for the upload path and the data pipeline
+
+Run from the backend directory, e.g.:
+    python -m benchmarks.bench_upload --rows 200000
+
+The regression suite (benchmarks.suite) records a JSON baseline and
+compares later runs with it:
+    python -m benchmarks.suite run --scale medium --output baseline.json
+    python -m benchmarks.suite run --scale medium --output current.json --compare baseline.json
+"""
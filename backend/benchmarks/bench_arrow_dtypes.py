@@ -0,0 +1,67 @@
+"""
+Arrow dtypes benchmark
+Compares per-layer peak memory of object-dtype and Arrow-backed string columns
+
+Each run is a fresh process, as peak RSS (VmHWM, Linux only) only grows
+within a process. Pass --file to measure a real upload instead of the
+generated dirty CSV; string-heavy files with many distinct values show
+the largest saving.
+"""
+import argparse
+import multiprocessing
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from app.services.data_pipeline import DataPipeline
+from benchmarks.datagen import write_dirty_csv
+
+
+def run_pipeline(storage_path: str, file_path: str, csv_engine: str, arrow_dtypes: bool) -> dict:
+    """Process a CSV and return the report's performance section"""
+    pipeline = DataPipeline(storage_path, csv_engine=csv_engine, arrow_dtypes=arrow_dtypes, checkpoints=False)
+    report = pipeline.process(file_path, 'csv', 'bench_arrow')
+    if not report['success']:
+        raise RuntimeError(report.get('error'))
+    return report['performance']
+
+
+def measure(storage_path: str, file_path: str, csv_engine: str, arrow_dtypes: bool) -> dict:
+    """Run the pipeline in a fresh process"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(run_pipeline, storage_path, file_path, csv_engine, arrow_dtypes).result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--file', type=Path, help='CSV to process instead of generated data')
+    parser.add_argument('--engines', nargs='+', default=['pandas', 'pyarrow'])
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        file_path = args.file or write_dirty_csv(tmp_path / f"dirty_{args.rows}.csv", args.rows)
+        storage_path = str(tmp_path / 'storage')
+        
+        for engine in args.engines:
+            performances = {
+                mode: measure(storage_path, str(file_path), engine, mode == 'arrow')
+                for mode in ('object', 'arrow')
+            }
+            
+            print(f"\nengine={engine}")
+            print(f"{'layer':<24} {'object MB':>10} {'arrow MB':>10} {'saved':>8}")
+            for layer in performances['object']['layers']:
+                peaks = [performances[mode]['layers'].get(layer, {}).get('peak_rss_bytes') for mode in ('object', 'arrow')]
+                if None in peaks:
+                    continue
+                saved = (1 - peaks[1] / peaks[0]) * 100 if peaks[0] else 0
+                print(f"{layer:<24} {peaks[0] / 2**20:>10.1f} {peaks[1] / 2**20:>10.1f} {saved:>7.1f}%")
+            
+            seconds = [performances[mode]['total_wall_seconds'] for mode in ('object', 'arrow')]
+            print(f"{'total seconds':<24} {seconds[0]:>10.2f} {seconds[1]:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Column-parallel benchmark
+Times Layers 4-6 in-process and with column worker pools of growing size
+
+The dirty column set is repeated --width times to build wide frames.
+Reports are checked to be identical to the in-process run, so the
+timings compare equal work. Throughput should grow with the number of
+workers up to the core count.
+"""
+import argparse
+import os
+import time
+
+import pandas as pd
+
+from app.services.data_pipeline import (
+    ColumnExecutor,
+    ColumnNormalizationLayer,
+    DataCleaningLayer,
+    DataQualityLayer,
+    TypeDetectionLayer
+)
+from benchmarks.datagen import generate_dirty_frame
+
+
+def build_frame(rows: int, width: int) -> pd.DataFrame:
+    """Dirty frame with the base columns repeated `width` times, normalized as Layer 3 would"""
+    base = generate_dirty_frame(rows).astype(object)
+    frames = [base.add_suffix(f" {i}") if i else base for i in range(width)]
+    df, _ = ColumnNormalizationLayer().process(pd.concat(frames, axis=1))
+    return df
+
+
+def run_layers(df: pd.DataFrame, executor: ColumnExecutor = None) -> tuple:
+    """Run Layers 4-6 once; returns (seconds, quality report)"""
+    start = time.perf_counter()
+    
+    df, typing_report = TypeDetectionLayer(executor).process(df.copy())
+    df, cleaning_report = DataCleaningLayer(executor).process(df, typing_report['type_info'])
+    quality_report = DataQualityLayer(executor).process(
+        df,
+        typing_report['type_info'],
+        cleaning_report['cleaning_report']
+    )
+    
+    return time.perf_counter() - start, quality_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[20_000])
+    parser.add_argument('--width', type=int, nargs='+', default=[25], help='Column set repetitions')
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4, 8])
+    parser.add_argument('--repeat', type=int, default=3, help='Best of N runs')
+    args = parser.parse_args()
+    
+    print(f"cores: {os.cpu_count()}")
+    print(f"{'rows':>10} {'cols':>6} {'workers':>8} {'seconds':>9} {'rows/s':>12} {'speedup':>8}")
+    
+    for rows in args.rows:
+        for width in args.width:
+            df = build_frame(rows, width)
+            columns = len(df.columns)
+            
+            baseline, expected = min((run_layers(df) for _ in range(args.repeat)), key=lambda run: run[0])
+            print(f"{rows:>10,} {columns:>6} {'-':>8} {baseline:>9.3f} {rows / baseline:>12,.0f} {1:>7.2f}x")
+            
+            for workers in args.workers:
+                executor = ColumnExecutor(workers, min_columns=1)
+                try:
+                    # Warm-up run starts the worker processes
+                    run_layers(df, executor)
+                    timing, report = min((run_layers(df, executor) for _ in range(args.repeat)), key=lambda run: run[0])
+                finally:
+                    executor.shutdown()
+                
+                if report != expected:
+                    raise AssertionError(f"Report with {workers} workers differs from the in-process run")
+                
+                print(f"{rows:>10,} {columns:>6} {workers:>8} {timing:>9.3f} {rows / timing:>12,.0f} {baseline / timing:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Column profile benchmark
+Compares exact column profiling with sketch mode on growing row counts
+
+Layers 4-5 run first so the profiled frame is what Layers 6-7 see. Time
+and peak traced memory are measured in separate runs, as tracing slows
+NumPy allocation. The error columns give the worst relative error of
+the sketched distinct counts and the worst rank error of the sketched
+medians against the exact profile.
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from app.services.data_pipeline import (
+    ColumnNormalizationLayer,
+    ColumnProfiler,
+    DataCleaningLayer,
+    TypeDetectionLayer
+)
+from benchmarks.datagen import generate_dirty_frame
+
+
+def build_frame(rows: int) -> tuple:
+    """Cleaned dirty frame and its type info"""
+    df, _ = ColumnNormalizationLayer().process(generate_dirty_frame(rows))
+    df, typing_report = TypeDetectionLayer().process(df)
+    df, _ = DataCleaningLayer().process(df, typing_report['type_info'])
+    return df, typing_report['type_info']
+
+
+def measure(profiler: ColumnProfiler, df, type_info, repeat: int) -> tuple:
+    """Best time of N runs and peak traced memory; returns (seconds, bytes, profile)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        profile = profiler.profile(df, type_info)
+        timings.append(time.perf_counter() - start)
+    
+    tracemalloc.start()
+    profiler.profile(df, type_info)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    
+    return min(timings), peak, profile
+
+
+def sketch_errors(df, exact: dict, sketched: dict) -> tuple:
+    """Worst distinct-count relative error and median rank error"""
+    count_error = 0.0
+    rank_error = 0.0
+    
+    for col, stats in exact.items():
+        if stats['unique_count']:
+            count_error = max(count_error, abs(sketched[col]['unique_count'] / stats['unique_count'] - 1))
+        
+        if 'median' in sketched[col] and stats['non_null_count']:
+            # Tied values share the ranks between their first and last position
+            values = np.sort(df[col].dropna().to_numpy(dtype=float))
+            low = np.searchsorted(values, sketched[col]['median'], side='left') / len(values)
+            high = np.searchsorted(values, sketched[col]['median'], side='right') / len(values)
+            rank_error = max(rank_error, low - 0.5, 0.5 - high)
+    
+    return count_error, rank_error
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--error', type=float, default=0.01, help='Sketch target error')
+    parser.add_argument('--repeat', type=int, default=3, help='Best of N runs')
+    args = parser.parse_args()
+    
+    exact_profiler = ColumnProfiler()
+    sketch_profiler = ColumnProfiler(sketch_min_rows=1, sketch_error=args.error)
+    
+    print(f"{'rows':>10} {'mode':>7} {'seconds':>9} {'peak MB':>9} {'count err':>10} {'rank err':>9}")
+    
+    for rows in args.rows:
+        df, type_info = build_frame(rows)
+        
+        exact_time, exact_peak, exact = measure(exact_profiler, df, type_info, args.repeat)
+        print(f"{len(df):>10,} {'exact':>7} {exact_time:>9.3f} {exact_peak / 2**20:>9.1f} {'-':>10} {'-':>9}")
+        
+        sketch_time, sketch_peak, sketched = measure(sketch_profiler, df, type_info, args.repeat)
+        count_error, rank_error = sketch_errors(df, exact, sketched)
+        print(f"{len(df):>10,} {'sketch':>7} {sketch_time:>9.3f} {sketch_peak / 2**20:>9.1f} {count_error:>10.4f} {rank_error:>9.4f}")
+
+
+if __name__ == '__main__':
+    main()
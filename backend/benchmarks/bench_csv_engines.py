@@ -0,0 +1,91 @@
+"""
+CSV parser engine benchmark
+Compares the pandas C engine with the multithreaded pyarrow.csv engine
+
+Both FileParser.parse_csv and pipeline Layer 1 ingestion are timed on
+dirty CSVs. --width repeats the dirty column set to mimic wide exports.
+Pick CSV_PARSER_ENGINE per deployment from the results (the Arrow
+engine scales with the number of cores).
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from app.services.data_pipeline import IngestionLayer
+from app.utils.file_parsers import FileParser
+from benchmarks.datagen import generate_dirty_frame
+
+ENGINES = IngestionLayer.CSV_ENGINES
+
+
+def write_csv(path: Path, rows: int, width: int) -> int:
+    """Write a dirty CSV with the base columns repeated `width` times; returns the column count"""
+    base = generate_dirty_frame(rows)
+    frames = [base.add_suffix(f" {i}") if i else base for i in range(width)]
+    pd.concat(frames, axis=1).to_csv(path, index=False)
+    
+    with open(path, 'a') as f:
+        f.write('Total' + ',' * (len(base.columns) * width - 1) + '\n')
+    
+    return len(base.columns) * width
+
+
+def time_file_parser(file_path: Path, engine: str) -> float:
+    """Time FileParser.parse_csv"""
+    start = time.perf_counter()
+    FileParser.parse_csv(str(file_path), engine=engine)
+    return time.perf_counter() - start
+
+
+def time_ingestion(storage_path: Path, file_path: Path, engine: str) -> float:
+    """Time Layer 1 (detection, parse, raw Parquet copy)"""
+    layer = IngestionLayer(storage_path, csv_engine=engine)
+    start = time.perf_counter()
+    layer.process(str(file_path), 'csv')
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 500_000])
+    parser.add_argument('--width', type=int, nargs='+', default=[1, 10], help='Column set repetitions')
+    parser.add_argument('--repeat', type=int, default=3, help='Best of N runs')
+    args = parser.parse_args()
+    
+    print(f"cores: {os.cpu_count()}")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        storage_path = tmp_path / 'storage'
+        
+        header = f"{'rows':>10} {'cols':>6} {'stage':>12}"
+        header += ''.join(f" {engine + ' (s)':>14}" for engine in ENGINES)
+        print(header + f" {'speedup':>8}")
+        
+        for rows in args.rows:
+            for width in args.width:
+                file_path = tmp_path / f"dirty_{rows}_{width}.csv"
+                columns = write_csv(file_path, rows, width)
+                
+                stages = {
+                    'FileParser': lambda engine: time_file_parser(file_path, engine),
+                    'Layer 1': lambda engine: time_ingestion(storage_path, file_path, engine),
+                }
+                
+                for stage, run in stages.items():
+                    timings = [min(run(engine) for _ in range(args.repeat)) for engine in ENGINES]
+                    speedup = timings[0] / timings[1] if timings[1] > 0 else 0
+                    
+                    line = f"{rows:>10,} {columns:>6} {stage:>12}"
+                    line += ''.join(f" {timing:>14.3f}" for timing in timings)
+                    print(line + f" {speedup:>7.2f}x")
+                
+                file_path.unlink()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Upload path benchmark
+Compares the old double-parse upload flow with the single ingestion pass
+
+Old flow: FileParser.parse_file + DataValidator profiling, then
+DataPipeline.process reads the saved file again.
+New flow: DataPipeline.process is the only parse; basic metadata comes
+from its layer outputs.
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from app.services.data_pipeline import DataPipeline
+from app.utils.file_parsers import FileParser
+from app.utils.validators import DataValidator
+from benchmarks.datagen import write_dirty_csv
+
+
+def run_legacy(pipeline: DataPipeline, file_path: Path) -> float:
+    """Time the pre-parse + validator + pipeline flow"""
+    start = time.perf_counter()
+    
+    df = FileParser.parse_file(file_path.name, str(file_path))
+    DataValidator.validate_csv_structure(df)
+    DataValidator.infer_column_types(df)
+    DataValidator.get_data_quality_report(df)
+    pipeline.process(str(file_path), 'csv', 'bench_legacy')
+    
+    return time.perf_counter() - start
+
+
+def run_single_pass(pipeline: DataPipeline, file_path: Path) -> float:
+    """Time the single ingestion pass"""
+    start = time.perf_counter()
+    pipeline.process(str(file_path), 'csv', 'bench_single')
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3, help='Best of N runs')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        pipeline = DataPipeline(str(tmp_path / 'storage'))
+        
+        print(f"{'rows':>10} {'legacy (s)':>12} {'single (s)':>12} {'saved':>8}")
+        for rows in args.rows:
+            file_path = write_dirty_csv(tmp_path / f"dirty_{rows}.csv", rows)
+            
+            legacy = min(run_legacy(pipeline, file_path) for _ in range(args.repeat))
+            single = min(run_single_pass(pipeline, file_path) for _ in range(args.repeat))
+            saved = (1 - single / legacy) * 100 if legacy > 0 else 0
+            
+            print(f"{rows:>10,} {legacy:>12.3f} {single:>12.3f} {saved:>7.1f}%")
+
+
+if __name__ == '__main__':
+    main()
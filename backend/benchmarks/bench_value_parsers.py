@@ -0,0 +1,102 @@
+"""
+Value parser benchmark
+Compares per-cell series.apply() parsing with the vectorized Layer 4 parsers
+
+Dates are parsed in their inferred dominant format (inference included
+in the timing), with the rest falling back to per-value parsing. Each
+type is timed on dirty generated values (spacing, symbols, nulls and
+some unparseable cells). The memoized column runs the vectorized parser
+on the distinct values only; use --distinct to draw each column from a
+fixed number of distinct values. The outputs are checked to be identical
+before the timings are reported.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.data_pipeline import TypeDetectionLayer
+from app.services.data_pipeline.memoize import map_distinct
+
+
+def generate_values(kind: str, rows: int, seed: int = 42, distinct: int = 0) -> pd.Series:
+    """Dirty string values for one parser (drawn from `distinct` values if given)"""
+    if distinct:
+        values = generate_values(kind, distinct, seed).to_numpy()
+        return pd.Series(np.random.default_rng(seed).choice(values, rows), dtype=object)
+    
+    rng = np.random.default_rng(seed)
+    
+    if kind == 'boolean':
+        values = rng.choice(['yes', 'No', ' TRUE ', 'f', '1', '0', 'off', 'maybe', None], rows)
+    elif kind == 'currency':
+        values = [f"${x:,.2f}" for x in rng.uniform(-100, 50_000, rows)]
+        values = np.where(rng.random(rows) < 0.1, [f"{x:.2f} EUR" for x in rng.uniform(1, 500, rows)], values)
+        values = np.where(rng.random(rows) < 0.02, 'n/a', values).astype(object)
+    elif kind == 'percentage':
+        values = np.array([f"{x:.1f}%" for x in rng.uniform(0, 100, rows)], dtype=object)
+        values = np.where(rng.random(rows) < 0.2, [f"{x:.3f}" for x in rng.uniform(0, 1, rows)], values)
+    elif kind == 'date':
+        dates = pd.Series(pd.date_range('2020-01-01', periods=rows, freq='37min'))
+        values = dates.dt.strftime('%m/%d/%Y').to_numpy(dtype=object)
+        values = np.where(rng.random(rows) < 0.02, dates.dt.strftime('%Y-%m-%d').to_numpy(dtype=object), values)
+    else:
+        raise ValueError(f"Unknown parser: {kind}")
+    
+    series = pd.Series(values, dtype=object)
+    series[rng.random(rows) < 0.05] = np.nan
+    return series
+
+
+def best_of(run, repeat: int) -> tuple:
+    """Best time of N runs; returns (seconds, last result)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3, help='Best of N runs')
+    parser.add_argument('--distinct', type=int, default=0, help='Distinct values per column (default: all generated)')
+    args = parser.parse_args()
+    
+    layer = TypeDetectionLayer()
+    parsers = {
+        'boolean': (layer._parse_boolean, layer._parse_boolean_series),
+        'currency': (layer._parse_currency, layer._parse_currency_series),
+        'percentage': (layer._parse_percentage, layer._parse_percentage_series),
+        'date': (
+            layer._parse_date,
+            lambda series: layer._parse_date_series(
+                series,
+                layer._infer_date_format(layer._detection_sample(series))
+            )
+        ),
+    }
+    
+    print(f"{'rows':>10} {'type':>11} {'apply (s)':>10} {'vectorized (s)':>15} {'memoized (s)':>13} {'speedup':>8}")
+    
+    for rows in args.rows:
+        for kind, (scalar, vectorized) in parsers.items():
+            series = generate_values(kind, rows, distinct=args.distinct)
+            
+            apply_time, expected = best_of(lambda: series.apply(scalar), args.repeat)
+            vector_time, result = best_of(lambda: vectorized(series), args.repeat)
+            memo_time, memoized = best_of(lambda: map_distinct(series, vectorized), args.repeat)
+            
+            pd.testing.assert_series_equal(result, expected)
+            pd.testing.assert_series_equal(memoized, expected)
+            
+            best = min(vector_time, memo_time)
+            speedup = apply_time / best if best > 0 else 0
+            print(f"{rows:>10,} {kind:>11} {apply_time:>10.3f} {vector_time:>15.3f} {memo_time:>13.3f} {speedup:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Synthetic dirty-data generator
+Produces files that exercise every pipeline layer
+"""
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Optional, Sequence
+
+# Date layouts of the mixed-format date column (US, ISO, European, long)
+MIXED_DATE_FORMATS = ('%m/%d/%Y', '%Y-%m-%d', '%d.%m.%Y', '%b %d, %Y')
+
+# Spellings of missing values in exports from spreadsheets and databases
+NULL_TOKENS = (None, '', 'N/A', 'null', 'NaN', '-')
+
+
+def generate_dirty_frame(
+    rows: int,
+    seed: int = 42,
+    date_formats: Sequence[str] = ('%m/%d/%Y',),
+    null_tokens: Sequence[Optional[str]] = (None,)
+) -> pd.DataFrame:
+    """
+    Build a DataFrame with the kinds of problems real uploads have:
+    currency and percentage strings, mixed nulls, boolean flags,
+    duplicate IDs and untrimmed text.
+    
+    Args:
+        rows: Number of data rows
+        seed: Random seed (output is deterministic per seed)
+        date_formats: strftime formats of the order dates; with several,
+                      each row uses one at random (e.g. MIXED_DATE_FORMATS)
+        null_tokens: Spellings of the missing text values, mixed at random
+                     (e.g. NULL_TOKENS)
+    
+    Returns:
+        DataFrame of strings and numbers, as a CSV export would contain
+    """
+    rng = np.random.default_rng(seed)
+    
+    df = pd.DataFrame({
+        'Order ID': rng.integers(0, max(rows - rows // 50, 1), rows),
+        'Price ($)': [f"${x:,.2f}" for x in rng.uniform(1, 5000, rows)],
+        'Discount': [f"{x:.1f}%" for x in rng.uniform(0, 50, rows)],
+        'Active': rng.choice(['yes', 'no', None], rows),
+        'Order Date': pd.Series(
+            pd.date_range('2020-01-01', periods=rows, freq='min')
+        ).dt.strftime('%m/%d/%Y'),
+        'Customer Email': [f"user{i % 5000}@example.com" for i in range(rows)],
+        'Quantity': rng.integers(0, 100, rows).astype(float),
+        'Notes': rng.choice([' pending ', 'shipped', None, 'returned '], rows),
+    })
+    
+    # Sprinkle nulls into numeric data
+    df.loc[rng.choice(rows, rows // 20, replace=False), 'Quantity'] = np.nan
+    
+    # Optional messiness draws from its own generator, so the default
+    # frame stays the same for every seed
+    extra_rng = np.random.default_rng([seed, 1])
+    
+    if len(date_formats) > 1:
+        dates = pd.Series(pd.date_range('2020-01-01', periods=rows, freq='min'))
+        choice = extra_rng.integers(0, len(date_formats), rows)
+        formatted = np.empty(rows, dtype=object)
+        for i, date_format in enumerate(date_formats):
+            mask = choice == i
+            formatted[mask] = dates[mask].dt.strftime(date_format).to_numpy()
+        df['Order Date'] = formatted
+    
+    if list(null_tokens) != [None]:
+        for col in ['Active', 'Notes']:
+            missing = df[col].isna().to_numpy()
+            df.loc[missing, col] = extra_rng.choice(np.array(null_tokens, dtype=object), int(missing.sum()))
+    
+    return df
+
+
+def generate_wide_frame(rows: int, width: int, seed: int = 42, **options) -> pd.DataFrame:
+    """
+    Dirty frame with `width` copies of the columns, each drawn with its own seed
+    
+    Args:
+        rows: Number of data rows
+        width: Copies of the dirty column set (1: generate_dirty_frame itself)
+        seed: Random seed of the first copy
+        **options: date_formats / null_tokens, as for generate_dirty_frame
+    
+    Returns:
+        DataFrame of rows x (8 * width) columns
+    """
+    frames = [
+        generate_dirty_frame(rows, seed + i, **options).add_suffix(f" {i}" if i else '')
+        for i in range(width)
+    ]
+    return pd.concat(frames, axis=1) if width > 1 else frames[0]
+
+
+def write_dirty_csv(path: Path, rows: int, seed: int = 42, width: int = 1, **options) -> Path:
+    """Write a dirty CSV (width copies of the columns, see generate_wide_frame) with a summary footer row"""
+    df = generate_wide_frame(rows, width, seed, **options)
+    df.to_csv(path, index=False)
+    
+    with open(path, 'a') as f:
+        f.write('Total' + ',' * (len(df.columns) - 1) + '\n')
+    
+    return path
@@ -0,0 +1,311 @@
+"""
+Pipeline benchmark suite
+Runs the pipeline on generated dirty datasets and compares results with a baseline
+
+Each dataset is a dirty CSV (currency and percentage strings, mixed date
+formats, mixed null spellings, duplicate IDs, untrimmed text and a
+footer row) in a tall or a wide shape. Every run processes it through
+DataPipeline in a fresh process; the per-layer wall time, CPU time,
+throughput and peak RSS come from the run's performance report, and the
+cold read time of the stored Parquet from Layer 7 (parquet_measure_read,
+on unless overridden with --option).
+
+Usage, from the backend directory:
+    python -m benchmarks.suite run --scale small --output baseline.json
+    python -m benchmarks.suite run --scale small --output current.json --compare baseline.json
+    python -m benchmarks.suite compare baseline.json current.json
+
+compare exits with status 1 when a layer or a full run got slower, or
+used more memory, by more than the thresholds.
+"""
+import argparse
+import ast
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from app.services.data_pipeline import DataPipeline, LayerProfiler, __version__
+from benchmarks.datagen import MIXED_DATE_FORMATS, NULL_TOKENS, write_dirty_csv
+
+# Copies of the 8 dirty columns per shape
+SHAPES = {'tall': 1, 'wide': 25}
+
+# Data rows of each shape per scale
+SCALES = {
+    'small': {'tall': 20_000, 'wide': 2_000},
+    'medium': {'tall': 200_000, 'wide': 20_000},
+    'large': {'tall': 2_000_000, 'wide': 200_000}
+}
+
+# Pipeline options of every run, before --option overrides
+DEFAULT_OPTIONS = {'parquet_measure_read': True}
+
+# Regressions smaller than these are treated as noise
+MIN_SECONDS = 0.05
+MIN_BYTES = 16 * 2**20
+
+
+def run_pipeline(storage_path: str, file_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Process a CSV and return the report's performance section, with the cold read time"""
+    report = DataPipeline(storage_path, **options).process(file_path, 'csv', 'bench_suite')
+    if not report['success']:
+        raise RuntimeError(f"Pipeline failed on {file_path}: {report.get('error')}")
+    return {**report['performance'], 'read_seconds': report['layers']['layer7']['storage'].get('read_seconds')}
+
+
+def measure(storage_path: str, file_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the pipeline in a fresh process, so peak RSS is its own"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(run_pipeline, storage_path, file_path, options).result()
+
+
+def summarize(performances: List[Dict[str, Any]], rows: int) -> Dict[str, Any]:
+    """Median timings and peak memory of repeated runs of one dataset"""
+    aggregate = LayerProfiler.aggregate(performances)
+    total = float(np.median([p['total_wall_seconds'] for p in performances]))
+    peaks = [p['peak_rss_bytes'] for p in performances if p.get('peak_rss_bytes') is not None]
+    reads = [p['read_seconds'] for p in performances if p.get('read_seconds') is not None]
+    
+    return {
+        'runs': len(performances),
+        'total_wall_seconds': round(total, 4),
+        'read_seconds': round(float(np.median(reads)), 4) if reads else None,
+        'rows_per_second': round(rows / total) if total > 0 else None,
+        'peak_rss_bytes': max(peaks) if peaks else None,
+        'layers': {
+            key: {
+                'layer': stats['layer'],
+                'wall_seconds': stats['wall_seconds_p50'],
+                'cpu_seconds': stats['cpu_seconds_mean'],
+                'rows_per_second': stats['rows_per_second_p50'],
+                'peak_rss_bytes': stats['peak_rss_bytes_max']
+            }
+            for key, stats in aggregate['layers'].items()
+        }
+    }
+
+
+def environment(scale: str, repeat: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    """What the results depend on besides the code"""
+    return {
+        'created_at': datetime.utcnow().isoformat(),
+        'scale': scale,
+        'repeat': repeat,
+        'options': options,
+        'pipeline_version': __version__,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'pyarrow': pa.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def run_suite(scale: str, repeat: int, options: Dict[str, Any], shapes: List[str]) -> Dict[str, Any]:
+    """Generate every dataset of a scale and benchmark it"""
+    results = {'environment': environment(scale, repeat, options), 'datasets': {}}
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        
+        for shape in shapes:
+            rows = SCALES[scale][shape]
+            name = f"{shape}-{scale}"
+            file_path = write_dirty_csv(
+                tmp_path / f"{name}.csv",
+                rows,
+                width=SHAPES[shape],
+                date_formats=MIXED_DATE_FORMATS,
+                null_tokens=NULL_TOKENS
+            )
+            
+            performances = [
+                measure(str(tmp_path / 'storage'), str(file_path), options)
+                for _ in range(repeat)
+            ]
+            
+            results['datasets'][name] = {
+                'shape': shape,
+                'rows': rows,
+                'columns': 8 * SHAPES[shape],
+                'file_bytes': file_path.stat().st_size,
+                **summarize(performances, rows)
+            }
+            print_dataset(name, results['datasets'][name])
+    
+    return results
+
+
+def print_dataset(name: str, dataset: Dict[str, Any]) -> None:
+    """Print the timings of one dataset"""
+    print(f"\n{name}: {dataset['rows']:,} rows x {dataset['columns']} columns, {dataset['file_bytes'] / 2**20:.1f} MB")
+    print(f"{'layer':<22} {'seconds':>9} {'cpu s':>9} {'rows/s':>12} {'peak MB':>9}")
+    
+    for key, stats in dataset['layers'].items():
+        throughput = f"{stats['rows_per_second']:,}" if stats['rows_per_second'] is not None else '-'
+        print(
+            f"{key + ' ' + stats['layer']:<22} {stats['wall_seconds']:>9.3f} {stats['cpu_seconds']:>9.3f} "
+            f"{throughput:>12} {_megabytes(stats['peak_rss_bytes']):>9}"
+        )
+    
+    print(f"{'total':<22} {dataset['total_wall_seconds']:>9.3f} {'':>9} {dataset['rows_per_second'] or 0:>12,} {_megabytes(dataset['peak_rss_bytes']):>9}")
+    if dataset.get('read_seconds') is not None:
+        print(f"{'cold Parquet read':<22} {dataset['read_seconds']:>9.3f}")
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    time_threshold: float,
+    memory_threshold: float
+) -> List[str]:
+    """
+    Print the changes from a baseline and list the regressions
+    
+    A layer or full run regresses when its wall time or peak RSS grew by
+    more than the threshold (a fraction) and by more than the noise floor
+    (MIN_SECONDS, MIN_BYTES).
+    
+    Returns:
+        One message per regression
+    """
+    changed = [
+        key for key in ('python', 'pandas', 'pyarrow', 'numpy', 'machine', 'cpu_count', 'options')
+        if baseline['environment'].get(key) != current['environment'].get(key)
+    ]
+    if changed:
+        print(f"Warning: environment differs from the baseline in {', '.join(changed)}")
+    
+    regressions = []
+    
+    for name, new in current['datasets'].items():
+        old = baseline['datasets'].get(name)
+        if old is None:
+            print(f"\n{name}: not in the baseline")
+            continue
+        
+        print(f"\n{name}")
+        print(f"{'layer':<22} {'old s':>9} {'new s':>9} {'change':>8} {'old MB':>9} {'new MB':>9} {'change':>8}")
+        
+        entries = [(key, old['layers'].get(key), stats) for key, stats in new['layers'].items()]
+        entries.append(('total', {'wall_seconds': old['total_wall_seconds'], 'peak_rss_bytes': old['peak_rss_bytes']},
+                        {'wall_seconds': new['total_wall_seconds'], 'peak_rss_bytes': new['peak_rss_bytes']}))
+        
+        for key, old_stats, new_stats in entries:
+            if old_stats is None:
+                continue
+            
+            label = f"{key} {new_stats['layer']}" if 'layer' in new_stats else key
+            time_change = _change(old_stats['wall_seconds'], new_stats['wall_seconds'])
+            memory_change = _change(old_stats['peak_rss_bytes'], new_stats['peak_rss_bytes'])
+            flags = []
+            
+            if (time_change is not None and time_change > time_threshold
+                    and new_stats['wall_seconds'] - old_stats['wall_seconds'] > MIN_SECONDS):
+                flags.append('SLOWER')
+                regressions.append(f"{name} {label}: {time_change:+.1%} wall time")
+            
+            if (memory_change is not None and memory_change > memory_threshold
+                    and new_stats['peak_rss_bytes'] - old_stats['peak_rss_bytes'] > MIN_BYTES):
+                flags.append('MEMORY')
+                regressions.append(f"{name} {label}: {memory_change:+.1%} peak RSS")
+            
+            print(
+                f"{label:<22} {old_stats['wall_seconds']:>9.3f} {new_stats['wall_seconds']:>9.3f} {_percent(time_change):>8} "
+                f"{_megabytes(old_stats['peak_rss_bytes']):>9} {_megabytes(new_stats['peak_rss_bytes']):>9} "
+                f"{_percent(memory_change):>8} {' '.join(flags)}"
+            )
+    
+    return regressions
+
+
+def _change(old: Optional[float], new: Optional[float]) -> Optional[float]:
+    """Relative change, None when either side is missing"""
+    if old is None or new is None or old <= 0:
+        return None
+    return new / old - 1
+
+
+def _percent(change: Optional[float]) -> str:
+    return f"{change:+.1%}" if change is not None else '-'
+
+
+def _megabytes(value: Optional[int]) -> str:
+    return f"{value / 2**20:.1f}" if value is not None else '-'
+
+
+def _parse_option(text: str) -> tuple:
+    """key=value pipeline option; the value is a Python literal or a string"""
+    key, _, value = text.partition('=')
+    try:
+        return key, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return key, value
+
+
+def report_regressions(regressions: List[str]) -> int:
+    """Print regressions; returns the process exit status"""
+    if regressions:
+        print(f"\n{len(regressions)} regression(s):")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    
+    print("\nNo regressions")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    run_parser = commands.add_parser('run', help='Benchmark the generated datasets')
+    run_parser.add_argument('--scale', choices=list(SCALES), default='small')
+    run_parser.add_argument('--shapes', nargs='+', choices=list(SHAPES), default=list(SHAPES))
+    run_parser.add_argument('--repeat', type=int, default=3, help='Runs per dataset (medians are kept)')
+    run_parser.add_argument('--option', action='append', default=[], metavar='KEY=VALUE',
+                            help='DataPipeline option, e.g. csv_engine=pyarrow (repeatable)')
+    run_parser.add_argument('--output', type=Path, required=True, help='JSON results file')
+    run_parser.add_argument('--compare', type=Path, metavar='BASELINE', help='Compare with a baseline afterwards')
+    
+    for command_parser in (run_parser, commands.add_parser('compare', help='Compare two results files')):
+        command_parser.add_argument('--time-threshold', type=float, default=0.10, help='Allowed wall time growth (fraction)')
+        command_parser.add_argument('--memory-threshold', type=float, default=0.10, help='Allowed peak RSS growth (fraction)')
+    
+    compare_parser = commands.choices['compare']
+    compare_parser.add_argument('baseline', type=Path)
+    compare_parser.add_argument('current', type=Path)
+    
+    args = parser.parse_args()
+    
+    if args.command == 'run':
+        options = {**DEFAULT_OPTIONS, **dict(_parse_option(text) for text in args.option)}
+        results = run_suite(args.scale, args.repeat, options, args.shapes)
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.output}")
+        
+        if args.compare is None:
+            return 0
+        baseline = json.loads(args.compare.read_text())
+        current = results
+    else:
+        baseline = json.loads(args.baseline.read_text())
+        current = json.loads(args.current.read_text())
+    
+    return report_regressions(compare(baseline, current, args.time_threshold, args.memory_threshold))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,4 @@
+"""
+pytest configuration: puts the backend directory on sys.path, so `pytest`
+run from here imports `app` and `benchmarks` like the application does.
+"""
@@ -0,0 +1,95 @@
+"""
+Layer 1 ingestion: JSON Lines files are read as records, however many lines
+they have, and concurrent runs on the same bytes store one intact raw copy
+"""
+import gzip
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from app.services.data_pipeline import IngestionLayer
+
+
+@pytest.mark.parametrize('suffix', ['.jsonl', '.ndjson'])
+@pytest.mark.parametrize('ending', ['', '\n', '\r\n\n'])
+def test_single_record_json_lines(tmp_path, suffix, ending):
+    file_path = tmp_path / f"orders{suffix}"
+    file_path.write_text('{"order_id": 1, "customer": "alice", "total": 9.5}' + ending)
+    
+    df, metadata = IngestionLayer(storage_path=tmp_path / 'storage').process(str(file_path), 'json')
+    
+    assert df.to_dict('records') == [{'order_id': 1, 'customer': 'alice', 'total': 9.5}]
+    assert metadata['row_count'] == 1
+
+
+def test_single_nested_record_json_lines(tmp_path):
+    file_path = tmp_path / 'events.jsonl'
+    file_path.write_text('{"id": 7, "user": {"name": "bob", "plan": {"tier": "pro"}}, "tags": ["a", "b"]}\n')
+    
+    df, _ = IngestionLayer(storage_path=tmp_path / 'storage').process(str(file_path), 'json')
+    
+    assert df.to_dict('records') == [{'id': 7, 'user.name': 'bob', 'user.plan.tier': 'pro', 'tags': '["a", "b"]'}]
+
+
+def test_single_record_compressed_json_lines(tmp_path):
+    line = b'{"order_id": 1, "total": 9.5}'
+    gz_path = tmp_path / 'orders.jsonl.gz'
+    gz_path.write_bytes(gzip.compress(line))
+    zip_path = tmp_path / 'orders.zip'
+    with zipfile.ZipFile(zip_path, 'w') as archive:
+        archive.writestr('export/orders.ndjson', line)
+    
+    for path in (gz_path, zip_path):
+        assert IngestionLayer.is_json_lines_file(path)
+        table = IngestionLayer.read_json_arrow(str(path))
+        assert table.to_pylist() == [{'order_id': 1, 'total': 9.5}]
+
+
+def test_single_record_json_lines_bytes():
+    line = b'{"order_id": 1, "total": 9.5}\n'
+    
+    assert IngestionLayer.read_json_arrow(line) is None
+    assert IngestionLayer.read_json_arrow(line, json_lines=True).to_pylist() == [{'order_id': 1, 'total': 9.5}]
+
+
+def test_single_line_json_document_is_still_an_object(tmp_path):
+    # One line of .json is a whole document: an object of columns, not one record
+    file_path = tmp_path / 'columns.json'
+    file_path.write_text('{"order_id": [1, 2], "total": [9.5, 3.0]}\n')
+    
+    assert IngestionLayer.read_json_arrow(str(file_path)) is None
+    
+    df, _ = IngestionLayer(storage_path=tmp_path / 'storage').process(str(file_path), 'json')
+    pd.testing.assert_frame_equal(df, pd.DataFrame({'order_id': [1, 2], 'total': [9.5, 3.0]}))
+
+
+def test_concurrent_raw_copies_of_the_same_bytes(tmp_path):
+    df = pd.DataFrame({'order_id': range(50_000), 'customer': ['alice', 'bob'] * 25_000})
+    layer = IngestionLayer(storage_path=tmp_path)
+    
+    with ThreadPoolExecutor(8) as pool:
+        paths = list(pool.map(lambda _: layer._store_raw(df, 'samehash'), range(8)))
+    
+    assert len(set(paths)) == 1
+    pd.testing.assert_frame_equal(pd.read_parquet(paths[0]), df)
+    assert [path.name for path in (tmp_path / 'raw').iterdir()] == ['samehash_raw.parquet']
+
+
+def test_streamed_raw_copy_leaves_no_temporary_file(tmp_path):
+    file_path = tmp_path / 'orders.csv'
+    file_path.write_text('order_id,customer\n1,alice\n2,bob\n')
+    layer = IngestionLayer(storage_path=tmp_path / 'storage')
+    
+    metadata = layer.process_stream(str(file_path), 'csv')
+    
+    assert [path.name for path in (tmp_path / 'storage' / 'raw').iterdir()] == [f"{metadata['fingerprint']}_raw.parquet"]
+    assert pd.read_parquet(metadata['raw_path']).to_dict('list') == {'order_id': ['1', '2'], 'customer': ['alice', 'bob']}
+
+
+def test_tmp_paths_are_unique(tmp_path):
+    raw_path = tmp_path / 'hash_raw.parquet'
+    
+    assert IngestionLayer._tmp_path(raw_path) != IngestionLayer._tmp_path(raw_path)
+    assert IngestionLayer._tmp_path(raw_path).parent == tmp_path
@@ -0,0 +1,84 @@
+"""
+Layer 2 structural validation: batch and streamed ingestion decide alike
+"""
+import pandas as pd
+import pytest
+
+from app.services.data_pipeline import DataPipeline, StructuralValidationLayer
+from benchmarks.datagen import MIXED_DATE_FORMATS, NULL_TOKENS, write_dirty_csv
+
+
+def process(tmp_path, file_path, streaming: bool, chunk_rows: int = 1000):
+    """Run the pipeline; returns the report and the stored frame"""
+    pipeline = DataPipeline(
+        str(tmp_path / 'storage'),
+        streaming=streaming,
+        chunk_rows=chunk_rows,
+        checkpoints=False,
+        parquet_measure_read=False
+    )
+    report = pipeline.process(str(file_path), 'csv', f"source_{streaming}_{chunk_rows}")
+    assert report['success'], report.get('error')
+    return report, pd.read_parquet(report['layers']['layer7']['storage']['parquet_path'])
+
+
+@pytest.mark.parametrize('rows,chunk_rows', [(5000, 1000), (5000, 777), (300, 1000)])
+def test_streaming_matches_batch_on_dirty_csv(tmp_path, rows, chunk_rows):
+    # Dirty data with a 'Total' footer, which makes read_csv type ID columns as text
+    file_path = write_dirty_csv(
+        tmp_path / 'dirty.csv',
+        rows,
+        date_formats=MIXED_DATE_FORMATS,
+        null_tokens=NULL_TOKENS
+    )
+    
+    batch_report, batch_frame = process(tmp_path, file_path, streaming=False)
+    stream_report, stream_frame = process(tmp_path, file_path, streaming=True, chunk_rows=chunk_rows)
+    
+    assert stream_report['layers']['layer2']['issues'] == batch_report['layers']['layer2']['issues']
+    assert stream_report['layers']['layer2']['stats'] == batch_report['layers']['layer2']['stats']
+    assert stream_report['layers']['layer3']['column_mapping'] == batch_report['layers']['layer3']['column_mapping']
+    pd.testing.assert_frame_equal(stream_frame, batch_frame)
+
+
+def test_numeric_text_footer_does_not_make_first_row_a_header(tmp_path):
+    file_path = tmp_path / 'orders.csv'
+    file_path.write_text(
+        "order_id,quantity,customer,region\n"
+        "437,3,Alice,North\n"
+        "438,5,Bob,South\n"
+        "Total,8,,\n"
+    )
+    
+    batch_report, batch_frame = process(tmp_path, file_path, streaming=False)
+    stream_report, stream_frame = process(tmp_path, file_path, streaming=True)
+    
+    for report, frame in ((batch_report, batch_frame), (stream_report, stream_frame)):
+        assert "Multi-header rows detected and merged" not in report['layers']['layer2']['issues']
+        assert list(frame.columns) == ['order_id', 'quantity', 'customer', 'region']
+        assert len(frame) == 2
+
+
+def test_second_header_row_is_merged_in_both_paths(tmp_path):
+    file_path = tmp_path / 'units.csv'
+    file_path.write_text(
+        "weight,price,height,name\n"
+        "kg,USD,cm,text\n"
+        "1.5,10,170,Alice\n"
+        "2.5,20,180,Bob\n"
+    )
+    
+    batch_report, batch_frame = process(tmp_path, file_path, streaming=False)
+    stream_report, stream_frame = process(tmp_path, file_path, streaming=True)
+    
+    assert "Multi-header rows detected and merged" in batch_report['layers']['layer2']['issues']
+    assert list(stream_frame.columns) == list(batch_frame.columns)
+    assert len(stream_frame) == len(batch_frame) == 2
+
+
+@pytest.mark.parametrize('value,expected', [
+    ('437', True), ('-1.5', True), ('1e3', True), (' 12 ', True),
+    ('1_000', False), ('$170.36', False), ('25%', False), ('Total', False)
+])
+def test_is_number(value, expected):
+    assert StructuralValidationLayer._is_number(value) is expected
@@ -0,0 +1,91 @@
+"""
+Layer 4 value parsers: the vectorized parsers match series.apply() of the scalar ones
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.data_pipeline import TypeDetectionLayer
+from app.services.data_pipeline.memoize import map_distinct
+
+layer = TypeDetectionLayer()
+
+PARSERS = {
+    'boolean': (layer._parse_boolean, layer._parse_boolean_series),
+    'currency': (layer._parse_currency, layer._parse_currency_series),
+    'percentage': (layer._parse_percentage, layer._parse_percentage_series)
+}
+
+# Edge cases every parser must treat like its scalar reference
+COMMON_VALUES = [
+    None, np.nan, pd.NA, '', '   ', 'nan', 'NaN', 'inf', '-Infinity', 'n/a',
+    '1_000', '1e3', '.5', '5.', '+7', '--1', '0x10',
+    ' 42 ', '\t1\n',
+    '١٢٣', '１２３', '४२', '٣٫٥', '12٣'
+]
+
+VALUES = {
+    'boolean': COMMON_VALUES + [
+        'yes', 'No', ' TRUE ', 'f', '1', '0', '1.0', '0.0', 'off', 'Enabled', 'maybe',
+        'ＴＲＵＥ', 'İ', 'Ẏ', True, False, 1, 0, 1.0
+    ],
+    'currency': COMMON_VALUES + [
+        '$1,234.56', '(100)', '-$5', '$-5', '€ 3,5', '3,5 €', '£0.99', '12 USD', 'EUR12',
+        'usd 12', '$ $', '1,2,3', '¥100', 12, 3.5, -0.0
+    ],
+    'percentage': COMMON_VALUES + [
+        '45%', ' 45 % ', '%45', '4%5', '0.5', '1', '1.5', '-0.2', '%', '100%%', '(10%)',
+        0.25, 45, 1, -3
+    ]
+}
+
+
+def object_series(values) -> pd.Series:
+    return pd.Series(values, dtype=object)
+
+
+@pytest.mark.parametrize('kind', sorted(PARSERS))
+def test_vectorized_matches_apply_on_edge_cases(kind):
+    scalar, vectorized = PARSERS[kind]
+    series = object_series(VALUES[kind])
+    
+    pd.testing.assert_series_equal(vectorized(series), series.apply(scalar))
+
+
+@pytest.mark.parametrize('kind', sorted(PARSERS))
+@pytest.mark.parametrize('value', sorted({str(v) for values in VALUES.values() for v in values}))
+def test_vectorized_matches_apply_per_value(kind, value):
+    # One value per column catches result dtype differences too (bool, object, float)
+    scalar, vectorized = PARSERS[kind]
+    for series in (object_series([value]), object_series([value, None])):
+        pd.testing.assert_series_equal(vectorized(series), series.apply(scalar))
+
+
+@pytest.mark.parametrize('kind', sorted(PARSERS))
+def test_vectorized_matches_apply_on_other_dtypes(kind):
+    scalar, vectorized = PARSERS[kind]
+    strings = [v for v in VALUES[kind] if isinstance(v, str)]
+    
+    cases = [
+        object_series([]),
+        object_series([None, None]),
+        pd.Series(strings, dtype='string[pyarrow]'),
+        pd.Series(strings, dtype='category'),
+        pd.Series([0.0, 0.25, 1.0, 45.0, np.nan]),
+        pd.Series([0, 1, 45], dtype='int64'),
+        pd.Series([True, False, None], dtype='boolean'),
+        pd.Series(strings, dtype=object, index=range(100, 100 + len(strings)), name='column')
+    ]
+    
+    for series in cases:
+        pd.testing.assert_series_equal(vectorized(series), series.apply(scalar))
+
+
+@pytest.mark.parametrize('kind', sorted(PARSERS))
+def test_memoized_matches_apply(kind):
+    # Long low-cardinality columns go through map_distinct in _cast_column
+    scalar, vectorized = PARSERS[kind]
+    rng = np.random.default_rng(7)
+    series = object_series(rng.choice(np.array(VALUES[kind], dtype=object), 20_000))
+    
+    pd.testing.assert_series_equal(map_distinct(series, vectorized), series.apply(scalar))
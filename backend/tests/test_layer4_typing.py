@@ -0,0 +1,35 @@
+"""
+Layer 4 typing: columns with a native type from the source keep their values
+"""
+import numpy as np
+import pandas as pd
+
+from app.services.data_pipeline import TypeDetectionLayer
+
+layer = TypeDetectionLayer()
+
+INT64_MAX = np.iinfo(np.int64).max
+
+
+def test_unsigned_values_above_int64_stay_unsigned():
+    values = [2**64 - 1, INT64_MAX + 1, 5, None]
+    df = pd.DataFrame({'amount': pd.array(values, dtype='UInt64')})
+    
+    typed, _ = layer.process(df, typed_columns=['amount'])
+    
+    assert typed['amount'].dtype == 'UInt64'
+    assert typed['amount'].tolist() == [2**64 - 1, INT64_MAX + 1, 5, pd.NA]
+
+
+def test_unsigned_values_within_int64_become_int64():
+    df = pd.DataFrame({
+        'nullable': pd.array([INT64_MAX, 0, None], dtype='UInt64'),
+        'numpy': np.array([1, 2, 3], dtype=np.uint64),
+        'empty': pd.array([None, None, None], dtype='UInt64')
+    })
+    
+    typed, _ = layer.process(df, typed_columns=list(df.columns))
+    
+    assert (typed.dtypes == 'Int64').all()
+    assert typed['nullable'].tolist() == [INT64_MAX, 0, pd.NA]
+    assert typed['numpy'].tolist() == [1, 2, 3]
@@ -0,0 +1,179 @@
+"""
+Layer 5 cleaning: numeric imputation of nullable integer columns, and the
+float block and segmented deduplication against the per-column path
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.data_pipeline import DataCleaningLayer
+
+
+def int_series(values) -> pd.Series:
+    return pd.Series(pd.array(values, dtype='Int64'), name='quantity')
+
+
+def test_int64_mean_is_rounded():
+    # Mean 5.5 with many distinct values and no skew: fillna(5.5) raised on Int64
+    series = int_series(list(range(1, 11)) + [None, None])
+    
+    filled, method = DataCleaningLayer()._handle_numeric_missing(series, series)
+    
+    assert method == 'mean'
+    assert filled.dtype == pd.Int64Dtype()
+    assert filled.isna().sum() == 0
+    assert filled.iloc[-1] == round(5.5)
+
+
+def test_int64_fractional_median_is_rounded():
+    # Skewed, even count: median 10.5 (the old fallback raised again on it)
+    series = int_series([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 100, 1000, None])
+    
+    filled, method = DataCleaningLayer()._handle_numeric_missing(series, series)
+    
+    assert method == 'median'
+    assert filled.dtype == pd.Int64Dtype()
+    assert filled.iloc[-1] == round(np.median([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 100, 1000]))
+
+
+def test_float_mean_is_not_rounded():
+    series = pd.Series([float(v) for v in range(1, 11)] + [None])
+    
+    filled, method = DataCleaningLayer()._handle_numeric_missing(series, series)
+    
+    assert method == 'mean'
+    assert filled.iloc[-1] == 5.5
+
+
+@pytest.mark.parametrize('values', [
+    list(range(1, 11)) + [None, None],
+    [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 100, 1000, None],
+    [2**60, 2**60 + 3, 5, 7, 11, 13, 17, 19, 23, 29, None]
+])
+def test_process_imputes_int64_columns(values):
+    # Block path for Int64 within 2**53, per-column path beyond it
+    df = pd.DataFrame({'quantity': pd.array(values, dtype='Int64')})
+    
+    cleaned, report = DataCleaningLayer().process(df, {'quantity': {'detected_type': 'integer'}})
+    
+    assert cleaned['quantity'].dtype == pd.Int64Dtype()
+    assert cleaned['quantity'].isna().sum() == 0
+    assert report['cleaning_report']['quantity']['imputed_nulls'] == values.count(None)
+    
+    expected, _ = DataCleaningLayer()._clean_column(df['quantity'], 'integer')
+    pd.testing.assert_series_equal(cleaned['quantity'], expected)
+
+
+def numeric_frame(seed: int, rows: int = 2000) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    
+    def with_nulls(values, share=0.1):
+        return pd.Series(values).mask(rng.random(rows) < share)
+    
+    normal = rng.normal(50, 10, rows)
+    normal[rng.integers(0, rows, 20)] = 1e6
+    stock = rng.integers(1000, 1100, rows)
+    stock[rng.integers(0, rows, 20)] = 1
+    
+    df = pd.DataFrame({
+        'normal': with_nulls(normal),
+        'skewed': with_nulls(rng.lognormal(0, 1.5, rows)),
+        'few_values': with_nulls(rng.choice([1.5, 2.5, 7.0], rows)),
+        'complete': rng.normal(0, 1, rows),
+        'empty': np.full(rows, np.nan),
+        'sparse': [1.0, 2.0, 50.0] + [np.nan] * (rows - 3),
+        'quantity': with_nulls(rng.integers(0, 100, rows)).astype('Int64'),
+        'clicks': with_nulls(rng.geometric(0.01, rows) * 3).astype('Int64'),
+        'rating': with_nulls(rng.integers(1, 6, rows)).astype('Int64'),
+        'stock': with_nulls(stock).astype('Int64'),
+        'units': pd.array(rng.integers(0, 1000, rows), dtype='Int64')
+    })
+    df.index = pd.RangeIndex(rows) * 3 + 7
+    return df
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+@pytest.mark.parametrize('sample_rows', [0, 500])
+def test_clean_numeric_matches_clean_column(seed, sample_rows):
+    layer = DataCleaningLayer(sample_rows=sample_rows)
+    frame = numeric_frame(seed)
+    
+    results = layer._clean_numeric(frame)
+    
+    assert list(results) == list(frame.columns)
+    for col in frame.columns:
+        col_type = 'integer' if isinstance(frame[col].dtype, pd.Int64Dtype) else 'float'
+        expected, expected_report = layer._clean_column(frame[col], col_type, sample_rows)
+        series, report = results[col]
+        
+        pd.testing.assert_series_equal(series, expected, check_exact=col_type == 'integer', rtol=1e-12)
+        assert report == expected_report, col
+
+
+def reference_process(layer: DataCleaningLayer, df: pd.DataFrame, type_info: dict):
+    """The per-column path: clean each column in order, dropping duplicates of ID-like ones"""
+    df = df.copy()
+    cleaning_report = {}
+    
+    for col in df.columns:
+        df[col], report = layer._clean_column(df[col], type_info[col]['detected_type'], layer.sample_rows)
+        if layer._is_id_column(col):
+            before_count = len(df)
+            df = df.drop_duplicates(subset=[col], keep='first')
+            report['duplicates_removed'] = before_count - len(df)
+        cleaning_report[col] = report
+    
+    return df, cleaning_report
+
+
+def id_frame(seed: int, rows: int = 3000) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    
+    def with_nulls(values, share=0.05):
+        return pd.Series(values).mask(rng.random(rows) < share)
+    
+    df = pd.DataFrame({
+        'amount': with_nulls(rng.normal(100, 20, rows)),
+        'order_id': with_nulls(rng.integers(0, rows * 4, rows)).astype('Int64'),
+        'customer': with_nulls(rng.choice([' alice', 'bob ', 'carol', ' dave '], rows)).astype(object),
+        'quantity': with_nulls(rng.integers(1, 50, rows)).astype('Int64'),
+        'customer_key': with_nulls(rng.choice([f'C{i:03d} ' for i in range(rows * 2)], rows)).astype(object),
+        'settled': with_nulls(rng.random(rows) < 0.7).astype(object),
+        'discount': with_nulls(rng.lognormal(0, 1, rows)),
+        'sku_code': with_nulls(rng.integers(0, rows, rows).astype(np.float64)),
+        'note': with_nulls(rng.choice(['ok', '  late', 'nan', 'x  '], rows)).astype(object)
+    })
+    df.index = rng.permutation(rows) + 1000
+    return df
+
+
+ID_TYPES = {
+    'amount': 'float', 'order_id': 'integer', 'customer': 'string', 'quantity': 'integer',
+    'customer_key': 'string', 'settled': 'boolean', 'discount': 'currency', 'sku_code': 'float', 'note': 'string'
+}
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+@pytest.mark.parametrize('sample_rows', [0, 700])
+def test_process_matches_per_column_dedup(seed, sample_rows):
+    layer = DataCleaningLayer(sample_rows=sample_rows)
+    df = id_frame(seed)
+    type_info = {col: {'detected_type': col_type} for col, col_type in ID_TYPES.items()}
+    
+    expected, expected_report = reference_process(layer, df, type_info)
+    cleaned, result = layer.process(df, type_info)
+    
+    assert all(expected_report[col]['duplicates_removed'] > 0 for col in ['order_id', 'customer_key', 'sku_code'])
+    pd.testing.assert_frame_equal(cleaned, expected, rtol=1e-12)
+    assert result['cleaning_report'] == expected_report
+
+
+def test_process_dedup_without_duplicates_keeps_frame():
+    layer = DataCleaningLayer()
+    df = pd.DataFrame({'user_id': [3, 1, 2], 'score': [0.5, np.nan, 1.5]}, index=[10, 20, 30])
+    type_info = {'user_id': {'detected_type': 'integer'}, 'score': {'detected_type': 'float'}}
+    
+    cleaned, result = layer.process(df, type_info)
+    
+    pd.testing.assert_frame_equal(cleaned, reference_process(layer, df, type_info)[0])
+    assert result['cleaning_report']['user_id']['duplicates_removed'] == 0
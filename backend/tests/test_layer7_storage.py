@@ -0,0 +1,81 @@
+"""
+Layer 7 storage: downcast dtypes hold every value exactly, and reads
+widen them back to the cleaned dtypes
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.data_pipeline import DataPipeline, StorageLayer
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_sample_mode_downcast_keeps_every_value(tmp_path, seed):
+    # The sampled max often misses values above 32767, which would wrap in int16
+    values = np.random.default_rng(seed).integers(0, 32800, 20_000)
+    file_path = tmp_path / 'readings.csv'
+    pd.DataFrame({'reading': values}).to_csv(file_path, index=False)
+    
+    pipeline = DataPipeline(str(tmp_path / 'storage'), sample_rows=1000, parquet_downcast=True, parquet_measure_read=False)
+    report = pipeline.process(str(file_path), 'csv', f"readings_{seed}")
+    assert report['success'], report.get('error')
+    
+    stored = pd.read_parquet(report['layers']['layer7']['storage']['parquet_path'])['reading']
+    assert stored.dtype == pd.Int32Dtype()
+    np.testing.assert_array_equal(stored.to_numpy(dtype=np.int64), values)
+    
+    read = StorageLayer.read(report['layers']['layer7']['storage']['parquet_path'])['reading']
+    assert read.dtype == pd.Int64Dtype()
+
+
+@pytest.mark.parametrize('dtype', ['int64', 'Int64'])
+def test_approximate_bounds_are_not_trusted(tmp_path, dtype):
+    df = pd.DataFrame({'value': pd.array([0, 100, 40_000], dtype=dtype)})
+    profile = {'value': {'min': 0, 'max': 100, 'approximate': ['min', 'max', 'mean']}}
+    
+    downcasts = StorageLayer(tmp_path, downcast=True)._downcast_dtypes(df, profile)
+    
+    assert downcasts['value'] in (np.int32, pd.Int32Dtype())
+
+
+def test_exact_bounds_are_used_as_profiled(tmp_path):
+    df = pd.DataFrame({'value': np.array([0, 100, 120], dtype='int64')})
+    profile = {'value': {'min': 0, 'max': 120}}
+    
+    assert StorageLayer(tmp_path, downcast=True)._downcast_dtypes(df, profile) == {'value': np.int8}
+
+
+def test_all_null_sampled_column_is_left_alone(tmp_path):
+    df = pd.DataFrame({'value': pd.array([None, None], dtype='Int64')})
+    profile = {'value': {'min': None, 'max': None, 'approximate': ['min', 'max']}}
+    
+    assert StorageLayer(tmp_path, downcast=True)._downcast_dtypes(df, profile) == {}
+
+
+def test_read_widens_downcast_columns(tmp_path):
+    df = pd.DataFrame({
+        'quantity': np.array([100, 120, 5], dtype='int64'),
+        'order_id': pd.array([1, 2000, None], dtype='Int64'),
+        'price': np.array([0.5, 1.25, 2.0]),
+        'name': ['a', 'b', 'c']
+    })
+    layer = StorageLayer(tmp_path, downcast=True)
+    
+    storage = layer.process(df, 'orders', {})['storage']
+    
+    assert set(storage['downcast_columns']) == {'quantity', 'order_id', 'price'}
+    assert pd.read_parquet(storage['parquet_path'])['quantity'].dtype == np.int8
+    for path in (storage['parquet_path'], storage['preview_path']):
+        read = StorageLayer.read(path)
+        pd.testing.assert_frame_equal(read, df)
+        assert (read['quantity'] * 2).tolist() == [200, 240, 10]
+    
+    pd.testing.assert_frame_equal(StorageLayer.read(storage['parquet_path'], columns=['order_id']), df[['order_id']])
+
+
+def test_read_without_downcast_matches_read_parquet(tmp_path):
+    df = pd.DataFrame({'value': [1, 2, 3], 'name': ['a', None, 'c']})
+    
+    storage = StorageLayer(tmp_path).process(df, 'plain', {})['storage']
+    
+    pd.testing.assert_frame_equal(StorageLayer.read(storage['parquet_path']), pd.read_parquet(storage['parquet_path']))
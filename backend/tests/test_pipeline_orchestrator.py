@@ -0,0 +1,52 @@
+"""
+Pipeline orchestrator: streamed ingestion types columns on rows from the whole file
+"""
+import pandas as pd
+import pytest
+
+from app.services.data_pipeline import DataPipeline
+
+
+def process(tmp_path, file_path, streaming: bool, chunk_rows: int = 1000):
+    """Run the pipeline; returns the report and the stored frame"""
+    pipeline = DataPipeline(str(tmp_path / 'storage'), streaming=streaming, chunk_rows=chunk_rows)
+    report = pipeline.process(str(file_path), 'csv', f"source_{streaming}")
+    assert report['success'], report.get('error')
+    return report, pd.read_parquet(report['layers']['layer7']['storage']['parquet_path'])
+
+
+def write_late_dirty_csv(file_path, rows: int = 5000, clean_rows: int = 4000):
+    """'amount' holds whole numbers for clean_rows rows, then decimals"""
+    lines = ['order_id,amount,signup']
+    for i in range(rows):
+        amount = str(i % 97) if i < clean_rows else f"{i % 97}.25"
+        signup = f"2024-01-{i % 28 + 1:02d}"
+        lines.append(f"{i},{amount},{signup}")
+    file_path.write_text('\n'.join(lines) + '\n')
+    return file_path
+
+
+@pytest.mark.parametrize('detection_rows', [DataPipeline.STREAM_DETECTION_ROWS, 1000])
+def test_streaming_types_columns_dirty_after_the_first_chunk(tmp_path, monkeypatch, detection_rows):
+    monkeypatch.setattr(DataPipeline, 'STREAM_DETECTION_ROWS', detection_rows)
+    file_path = write_late_dirty_csv(tmp_path / 'orders.csv')
+    
+    batch_report, batch_frame = process(tmp_path, file_path, streaming=False)
+    stream_report, stream_frame = process(tmp_path, file_path, streaming=True)
+    
+    batch_types = {col: info['detected_type'] for col, info in batch_report['layers']['layer4']['type_info'].items()}
+    stream_types = {col: info['detected_type'] for col, info in stream_report['layers']['layer4']['type_info'].items()}
+    assert stream_types == batch_types
+    assert stream_types['amount'] == 'float'
+    assert stream_report['layers']['layer4']['type_info']['amount']['failed_conversions'] == 0
+    pd.testing.assert_frame_equal(stream_frame, batch_frame)
+
+
+def test_streaming_counts_rows_once(tmp_path):
+    file_path = write_late_dirty_csv(tmp_path / 'orders.csv', rows=3000)
+    
+    report, _ = process(tmp_path, file_path, streaming=True)
+    
+    layers = report['performance']['layers']
+    for key in ('layer2', 'layer3', 'layer4'):
+        assert layers[key]['rows_out'] == 3000, key
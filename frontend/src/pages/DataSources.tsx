@@ -632,7 +632,7 @@ const UploadModal = ({
                   onChange={(e) =>
                     e.target.files && handleFileChange(e.target.files[0])
                   }
-                  accept=".csv,.xlsx,.xls,.json,.parquet,.tsv,.txt"
+                  accept=".csv,.xlsx,.xls,.json,.jsonl,.ndjson,.parquet,.tsv,.txt,.gz,.zst,.zip"
                   className="hidden"
                   id="file-upload"
                 />
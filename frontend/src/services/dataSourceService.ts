@@ -11,23 +11,64 @@ import {
   QualityReport,       // NEW
   CleaningReport,      // NEW
   ReprocessResponse,   // NEW
+  PipelineJob,
+  PipelinePerformanceSummary,
 } from '../types/dataSource';
 
+const JOB_POLL_INTERVAL_MS = 1000;
+
 export class DataSourceService {
   /**
    * Upload a file (CSV, Excel, JSON, Parquet, TSV)
+   * and wait for background processing to finish
    */
   static async uploadFile(
     file: File,
     name?: string,
-    sheetName?: string
+    sheetName?: string,
+    onProgress?: (job: PipelineJob) => void
   ): Promise<DataSource> {
     const formData = new FormData();
     formData.append('file', file);
     if (name) formData.append('name', name);
     if (sheetName) formData.append('sheet_name', sheetName);
 
-    const response = await apiClient.post<DataSource>('/data-sources/upload', formData, {
+    const response = await apiClient.post<PipelineJob>('/data-sources/upload', formData, {
+      headers: {
+        'Content-Type': 'multipart/form-data',
+      },
+    });
+
+    let job = response.data;
+    while (job.status === 'queued' || job.status === 'processing') {
+      onProgress?.(job);
+      await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+      job = await DataSourceService.getUploadJob(job.job_id);
+    }
+
+    if (job.status === 'failed' || !job.data_source) {
+      // Same shape as an HTTP error so callers can read err.response.data.detail
+      throw { response: { data: { detail: job.error || 'Processing failed' } } };
+    }
+
+    return job.data_source;
+  }
+
+  /**
+   * Upload an Excel workbook and import several sheets as separate
+   * data sources (processed in parallel). Returns one job per sheet.
+   */
+  static async uploadExcelSheets(
+    file: File,
+    sheetNames?: string[],
+    name?: string
+  ): Promise<PipelineJob[]> {
+    const formData = new FormData();
+    formData.append('file', file);
+    if (name) formData.append('name', name);
+    if (sheetNames && sheetNames.length > 0) formData.append('sheet_names', sheetNames.join(','));
+
+    const response = await apiClient.post<PipelineJob[]>('/data-sources/upload/sheets', formData, {
       headers: {
         'Content-Type': 'multipart/form-data',
       },
@@ -36,6 +77,14 @@ export class DataSourceService {
     return response.data;
   }
 
+  /**
+   * Get status of a background upload job
+   */
+  static async getUploadJob(jobId: string): Promise<PipelineJob> {
+    const response = await apiClient.get<PipelineJob>(`/data-sources/jobs/${jobId}`);
+    return response.data;
+  }
+
   /**
    * Get Excel sheet names before uploading
    */
@@ -135,6 +184,19 @@ export class DataSourceService {
     return response.data;
   }
 
+  /**
+   * Get per-layer pipeline timings aggregated across all data sources
+   */
+  static async getPipelinePerformance(pipelineVersion?: string): Promise<PipelinePerformanceSummary> {
+    const response = await apiClient.get<PipelinePerformanceSummary>(
+      '/data-sources/pipeline/performance',
+      {
+        params: pipelineVersion ? { pipeline_version: pipelineVersion } : undefined,
+      }
+    );
+    return response.data;
+  }
+
   /**
    * Reprocess data source through pipeline
    */
@@ -115,8 +115,15 @@ export interface QualityReport {
     missing_cells: number;
     complete_cells: number;
     completeness_percent?: number;
+    approximate?: string[];
   };
+  approximate?: string[];  // ['overall_score'] when any column metric is estimated
+  sampling?: {
+    sample_rows: number;
+    layers: string[];
+  } | null;
   processing_duration?: number | null;
+  performance?: PipelinePerformance | null;
   last_processed?: string | null;
 }
 
@@ -128,6 +135,7 @@ export interface ColumnQuality {
   quality_score: number;
   quality_level: 'excellent' | 'good' | 'fair' | 'poor' | 'critical';
   issues: string[];
+  approximate?: string[];  // Metrics estimated from sketches or row samples on very large data
 }
 
 // NEW: Cleaning Report Types
@@ -143,6 +151,7 @@ export interface CleaningReport {
     final_dtype?: string;
     success_rate: number;
     sample_values?: string[];
+    date_format?: string | null;
   }>;
   data_cleaning: Record<string, {
     original_nulls: number;
@@ -151,6 +160,7 @@ export interface CleaningReport {
     imputation_method: string;
     outliers_handled: number;
     duplicates_removed: number;
+    approximate?: string[];
   }>;
   summary: {
     original_rows?: number;
@@ -164,7 +174,68 @@ export interface CleaningReport {
     original_size_bytes: number;
     cleaned_size_bytes: number;
     compression_ratio_percent: number;
+    compression?: string | null;
+    row_groups?: number | null;
+    read_seconds?: number | null;
   };
+  performance?: PipelinePerformance | null;
+}
+
+// Per-layer timings of one pipeline run
+export interface LayerPerformance {
+  layer: string;
+  wall_seconds: number;
+  cpu_seconds: number;
+  rows_in: number;
+  columns_in: number;
+  rows_out: number;
+  columns_out: number;
+  rows_per_second: number | null;
+  peak_rss_bytes: number | null;
+}
+
+export interface PipelinePerformance {
+  layers: Record<string, LayerPerformance>;
+  total_wall_seconds: number;
+  total_cpu_seconds: number;
+  slowest_layer: string | null;
+  peak_rss_bytes: number | null;
+}
+
+// Per-layer timings aggregated across data sources
+export interface PipelinePerformanceSummary {
+  sources: number;
+  total_wall_seconds_mean: number | null;
+  total_wall_seconds_p95: number | null;
+  layers: Record<string, {
+    layer: string;
+    runs: number;
+    wall_seconds_mean: number;
+    wall_seconds_p50: number;
+    wall_seconds_p95: number;
+    wall_seconds_max: number;
+    cpu_seconds_mean: number;
+    rows_per_second_p50: number | null;
+    peak_rss_bytes_p50: number | null;
+    peak_rss_bytes_max: number | null;
+    slowest_count: number;
+  }>;
+  slowest_layer: string | null;
+  pipeline_versions: string[];
+}
+
+// Background pipeline job (returned by upload, polled until finished)
+export interface PipelineJob {
+  job_id: string;
+  data_source_id: string;
+  status: 'queued' | 'processing' | 'completed' | 'failed';
+  current_layer: string | null;
+  layers_completed: number;
+  progress: number;
+  error: string | null;
+  created_at: string;
+  updated_at: string;
+  data_source?: DataSource | null;
 }
 
 // NEW: Reprocess Response